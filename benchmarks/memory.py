@@ -0,0 +1,69 @@
+#!/usr/bin/python
+"""Measure the memory used per expression node.
+
+Builds a set of random, machine-generated formulas and reports the average
+number of bytes per node for expression trees and for their flat encoding.
+
+Usage: memory.py [number of formulas] [nodes per formula]
+
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    os.pardir))
+
+from expression import binaryop
+from expression import flat
+from expression.constant import Constant
+from expression.variable import Variable
+
+OPERATORS = (binaryop.SumOp, binaryop.DifferenceOp, binaryop.ProductOp,
+    binaryop.QuotientOp, binaryop.PowerOp)
+
+def random_tree(nodes, rng):
+    """Return a random tree with about the given number of nodes."""
+    if nodes < 3:
+        if rng.random() < 0.5:
+            return Variable('x')
+        return Constant(rng.randint(0, 1000) / 8.0)
+    left = rng.randint(1, nodes - 2)
+    return rng.choice(OPERATORS)(random_tree(left, rng),
+        random_tree(nodes - 1 - left, rng))
+
+def tree_bytes(tree):
+    """Return the number of bytes used by the nodes of tree.
+
+    Values and names are not counted, as they are shared with the source
+    they came from.
+
+    """
+    total = 0
+    for node in tree.postorder():
+        total += sys.getsizeof(node)
+        if hasattr(node, '__dict__'):
+            total += sys.getsizeof(node.__dict__)
+    return total
+
+def flat_bytes(encoded):
+    """Return the number of bytes used by a flat encoding, names excluded."""
+    return sum(sys.getsizeof(buf) for buf in (encoded, encoded.opcodes,
+        encoded.first, encoded.second, encoded.constants, encoded.names))
+
+def main(formulas=1000, nodes=200):
+    """Build the formulas, and print the memory used per node."""
+    rng = random.Random(1)
+    trees = [random_tree(nodes, rng) for i in range(formulas)]
+    count = sum(sum(1 for node in tree.postorder()) for tree in trees)
+    tree_total = sum(tree_bytes(tree) for tree in trees)
+    print("{0} formulas, {1} nodes".format(formulas, count))
+    print("tree: {0:8.1f} bytes per node".format(float(tree_total) / count))
+    encoded = [flat.FlatExpression(tree) for tree in trees]
+    flat_total = sum(flat_bytes(e) for e in encoded)
+    print("flat: {0:8.1f} bytes per node ({1:.1f}x smaller)".format(
+        float(flat_total) / count, float(tree_total) / flat_total))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
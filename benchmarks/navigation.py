@@ -0,0 +1,71 @@
+#!/usr/bin/python
+"""Measure the time per frame of panning and zooming a heavy function.
+
+A sequence of viewports is sampled as if the plot were panned to the right
+one step per frame, then zoomed in and out again.  Every frame is sampled
+once from scratch with Sampler.sample, and once with a TileCache.  The mean
+and worst time per frame of both are printed, with the hit rate of the
+cache.  A frame at 60 frames per second takes 16.7 ms.
+
+Usage: navigation.py [frames] [formula]
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    os.pardir))
+
+from parser import human
+from graph import sampler
+from graph import tiles
+from graph.viewport import Viewport
+
+# A function with many operators, so that evaluating it is expensive.
+FORMULA = " + ".join("(x - {0})^3/({1} + x^2)".format(i, i + 1)
+    for i in range(40))
+
+def viewports(frames):
+    """Return the viewports of the frames: a pan, a zoom in and a zoom out."""
+    views = [Viewport(-10 + 0.1 * i, 10 + 0.1 * i, -10, 10)
+        for i in range(frames)]
+    centre = 0.1 * frames
+    for i in range(frames):
+        half = 10 * 0.97 ** i
+        views.append(Viewport(centre - half, centre + half, -10, 10))
+    return views + views[-1:frames - 1:-1]
+
+def measure(sample, views):
+    """Return the mean and largest time of sample(view) over views, in ms."""
+    times = []
+    for view in views:
+        start = time.time()
+        sample(view)
+        times.append((time.time() - start) * 1000)
+    return sum(times) / len(times), max(times)
+
+def main(frames=60, formula=FORMULA):
+    """Print the time per frame with and without the cache."""
+    tree = human.Parser().parse(formula)
+    views = viewports(frames)
+    uniform = sampler.Sampler(tree)
+    cache = tiles.TileCache()
+    cached = sampler.Sampler(tree)
+    print("{0:>8} {1:>10} {2:>10} {3:>12}".format("sampler", "mean ms",
+        "worst ms", "evaluations"))
+    mean, worst = measure(uniform.sample, views)
+    print("{0:>8} {1:10.2f} {2:10.2f} {3:12d}".format("uniform", mean, worst,
+        uniform.evaluations))
+    mean, worst = measure(lambda view: cache.sample(cached, view), views)
+    print("{0:>8} {1:10.2f} {2:10.2f} {3:12d}".format("tiles", mean, worst,
+        cached.evaluations))
+    print("Hit rate {0:.1%}, {1} of {2} missing tiles half reused.".format(
+        cache.hit_rate(), cache.reused, cache.misses))
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    if arguments:
+        arguments[0] = int(arguments[0])
+    main(*arguments)
@@ -0,0 +1,56 @@
+#!/usr/bin/python
+"""Measure the cost of overlaying many functions.
+
+A family of functions with common subexpressions is sampled over one
+viewport from an empty cache, once function by function, each with its own
+Sampler and TileCache, and once together with a SamplerGroup.  The time
+to compile and to sample the functions is printed for both.
+
+Usage: overlay.py [functions]
+
+"""
+
+import os
+import sys
+import time
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    os.pardir))
+
+from parser import human
+from graph import sampler
+from graph import group
+from graph import tiles
+from graph.viewport import Viewport
+
+# The functions overlaid, which share x^2 and x^3.
+FORMULA = "x^3/({0} + x^2) - {0} * x^2"
+
+def timed(function, *arguments):
+    """Return the result of function(*arguments), and its time in ms."""
+    start = time.time()
+    result = function(*arguments)
+    return result, (time.time() - start) * 1000
+
+def main(functions=20):
+    """Print the times of sampling functions apart and together."""
+    parser = human.Parser()
+    trees = [parser.parse(FORMULA.format(i + 1)) for i in range(functions)]
+    viewport = Viewport(-10, 10, -10, 10)
+    print("{0:>8} {1:>10} {2:>10}".format("plot", "compile ms", "sample ms"))
+    samplers, compiling = timed(lambda: [sampler.Sampler(tree) for tree in
+        trees])
+    curves, sampling = timed(lambda: [tiles.TileCache().sample(member,
+        viewport) for member in samplers])
+    print("{0:>8} {1:10.2f} {2:10.2f}".format("apart", compiling, sampling))
+    # The fused function is compiled when the group is first evaluated.
+    samplers, compiling = timed(group.SamplerGroup.from_trees, trees)
+    fused, fusing = timed(samplers.evaluate, numpy.zeros(1))
+    curves, sampling = timed(tiles.TileCache().sample_group, samplers,
+        viewport)
+    print("{0:>8} {1:10.2f} {2:10.2f}".format("together", compiling + fusing,
+        sampling))
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,68 @@
+#!/usr/bin/python
+"""Measure the throughput of the parser backends.
+
+Builds a set of random, machine-generated formula strings and reports how
+many strings and tokens per second each backend of human.Parser parses.
+Simplification is disabled.  The backend alone is measured, and the whole
+human.Parser.parse, which also shares repeated subtrees of every tree.
+
+Usage: parsers.py [number of formulas] [operators per formula]
+
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    os.pardir))
+
+from parser import human
+
+BACKENDS = ('ply', 'pratt')
+
+def random_formula(operators, rng):
+    """Return a random formula string with the given number of operators."""
+    if operators == 0:
+        if rng.random() < 0.5:
+            return rng.choice(('x', 'y'))
+        return str(rng.randint(0, 1000) / 8.0)
+    left = rng.randint(0, operators - 1)
+    formula = "{0} {1} {2}".format(random_formula(left, rng),
+        rng.choice('+-*/^'), random_formula(operators - 1 - left, rng))
+    if rng.random() < 0.3:
+        return "(" + formula + ")"
+    if rng.random() < 0.1:
+        return "-" + formula
+    return formula
+
+def main(formulas=1000, operators=20):
+    """Build the formulas, and print the throughput of every backend."""
+    rng = random.Random(1)
+    strings = [random_formula(operators, rng) for i in range(formulas)]
+    lexer = human.Tokenizer()
+    tokens = 0
+    for string in strings:
+        lexer.input(string)
+        tokens += sum(1 for token in iter(lexer.token, None))
+    print("{0} formulas, {1} tokens".format(formulas, tokens))
+    for measured in ('backend', 'parse'):
+        rates = {}
+        for backend in BACKENDS:
+            parser = human.Parser(simplify=False, backend=backend)
+            if measured == 'backend':
+                run = lambda: [parser.parser.parse(string, lexer=parser.lexer)
+                    for string in strings]
+            else:
+                run = lambda: [parser.parse(string) for string in strings]
+            seconds = min(timeit.repeat(run, repeat=5, number=1))
+            rates[backend] = formulas / seconds
+            print("{0:>7} {1:>5}: {2:9.0f} formulas/s {3:10.0f} tokens/s"
+                .format(measured, backend, formulas / seconds,
+                tokens / seconds))
+        print("{0:>7} pratt is {1:.1f}x faster".format(measured,
+            rates['pratt'] / rates['ply']))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,65 @@
+#!/usr/bin/python
+"""Measure how soon a heavy function is first shown when streamed.
+
+A heavy function is plotted from an empty cache, once with Pipeline.run,
+which returns only the full curve, and once with Pipeline.stream.  The time
+until the first curve (after parsing) is printed for both, with the time until the full
+curve and the number of evaluations.  A frame at 60 frames per second takes
+16.7 ms.
+
+Usage: progressive.py [terms]
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    os.pardir))
+
+from parser import cache
+from graph import pipeline
+from graph.viewport import Viewport
+
+# Pixels across the plot.
+WIDTH = 800
+
+def formula(terms):
+    """Return a formula of terms rational functions, expensive to evaluate."""
+    return " + ".join("(x - {0})^3/({1} + x^2)".format(i, i + 1)
+        for i in range(terms))
+
+def measure(plot, parser, functions, viewport):
+    """Return the ms until the first and the last curve, and evaluations."""
+    plot_pipeline = pipeline.Pipeline(parser)
+    start = time.time()
+    first = None
+    for curves in plot(plot_pipeline, functions, viewport):
+        if first is None:
+            first = (time.time() - start) * 1000
+    last = (time.time() - start) * 1000
+    return first, last, plot_pipeline._samplers.samplers[0].evaluations
+
+def main(terms=400):
+    """Print the latency of the full and the streamed curve."""
+    functions = [formula(terms)]
+    viewport = Viewport(-10, 10, -10, 10)
+    # Parsing takes as long either way, so it is not measured.
+    parser = cache.ParseCache()
+    parser.parse(functions[0])
+    print("{0:>8} {1:>10} {2:>10} {3:>12}".format("plot", "first ms",
+        "full ms", "evaluations"))
+    first, last, evaluations = measure(lambda plot_pipeline, *args:
+        [plot_pipeline.run(plot_pipeline.request(), *args, width=WIDTH)],
+        parser, functions, viewport)
+    print("{0:>8} {1:10.2f} {2:10.2f} {3:12d}".format("run", first, last,
+        evaluations))
+    first, last, evaluations = measure(lambda plot_pipeline, *args:
+        plot_pipeline.stream(plot_pipeline.request(), *args, width=WIDTH),
+        parser, functions, viewport)
+    print("{0:>8} {1:10.2f} {2:10.2f} {3:12d}".format("stream", first, last,
+        evaluations))
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
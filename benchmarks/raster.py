@@ -0,0 +1,95 @@
+#!/usr/bin/python
+"""Measure the cost of drawing long curves without Qt.
+
+A curve of many vertices is drawn into a 640 x 480 raster.Raster,
+antialiased, for a range of vertex counts: a smooth one, and a dense one
+whose lines cover most of the image.  Where PyQt4 is installed, the same
+curve is drawn as an antialiased polyline onto an offscreen QImage for
+comparison.  Then a family of short curves is drawn one by one and in one
+batched pass.
+
+Usage: raster.py [curves]
+
+"""
+
+import os
+import sys
+import time
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    os.pardir))
+
+from graph import raster
+from graph import sampler
+from graph.viewport import Viewport
+
+try:
+    from PyQt4 import QtCore, QtGui
+except ImportError:
+    QtGui = None
+
+WIDTH = 640
+HEIGHT = 480
+
+# Vertex counts of the long curves.
+VERTICES = [10000, 100000, 1000000]
+
+def timed(function, *arguments):
+    """Return the result of function(*arguments), and its time in ms."""
+    start = time.time()
+    result = function(*arguments)
+    return result, (time.time() - start) * 1000
+
+def curve(vertices, frequency, shift=0):
+    """Return a sampler.Curve of a sine of frequency, of vertices points."""
+    x = numpy.linspace(-10, 10, vertices)
+    return sampler.Curve(x, 8 * numpy.sin(frequency * x) + shift)
+
+def draw_numpy(curves, viewport):
+    """Draw curves into a raster.Raster in one pass."""
+    image = raster.Raster(WIDTH, HEIGHT)
+    image.draw_curves(curves, viewport, raster.CURVES * len(curves))
+
+def draw_qt(curves, viewport):
+    """Draw curves onto a QImage with an antialiased QPainter."""
+    image = QtGui.QImage(WIDTH, HEIGHT,
+        QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtGui.qRgb(255, 255, 255))
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    for one in curves:
+        columns, rows = raster.to_pixels(one.x, one.y, viewport, WIDTH,
+            HEIGHT)
+        painter.drawPolyline(QtGui.QPolygonF([QtCore.QPointF(x + 0.5,
+            y + 0.5) for x, y in zip(columns, rows)]))
+    painter.end()
+
+def main(curves=20):
+    """Print the times of drawing long curves, and short ones in batch."""
+    viewport = Viewport(-10, 10, -10, 10)
+    if QtGui is not None:
+        application = QtGui.QApplication([])
+    print("{0:>8} {1:>10} {2:>10} {3:>10}".format("curve", "vertices",
+        "numpy ms", "qt ms"))
+    for name, frequency in (("smooth", 1), ("dense", 50)):
+        for vertices in VERTICES:
+            long_curve = [curve(vertices, frequency)]
+            drawn, numpy_time = timed(draw_numpy, long_curve, viewport)
+            if QtGui is None:
+                qt_time = "-"
+            else:
+                drawn, qt_time = timed(draw_qt, long_curve, viewport)
+                qt_time = "{0:.1f}".format(qt_time)
+            print("{0:>8} {1:>10} {2:10.1f} {3:>10}".format(name, vertices,
+                numpy_time, qt_time))
+    short = [curve(500, 1, i - curves / 2) for i in range(curves)]
+    image = raster.Raster(WIDTH, HEIGHT)
+    drawn, apart = timed(lambda: [image.draw_curve(one, viewport, (0, 0, 0))
+        for one in short])
+    drawn, together = timed(draw_numpy, short, viewport)
+    print("{0} curves of 500 vertices: {1:.1f} ms apart, {2:.1f} ms in one "
+        "pass".format(curves, apart, together))
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,145 @@
+#!/usr/bin/python
+"""Compare adaptive and uniform sampling at the same quality.
+
+For every function, the adaptive sampler is run first, and the error of its
+curve is measured: the largest distance in pixels between the drawn lines
+and the function, over a grid much finer than a pixel, with both clipped to
+just outside the plot.  Then the smallest uniform grid with at most the same
+error is searched for.  The evaluations of the adaptive sampler are compared
+with those of that grid, and with those of the default uniform grid of
+sampler.SAMPLES points.
+
+Then the adaptive sampler is run with and without interval bounds, in
+viewports that leave most of a steep function outside, and both its
+evaluations and its time (the best of REPEATS runs) are compared.
+
+Usage: sampling.py [width] [height]
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    os.pardir))
+
+import numpy
+from parser import human
+from graph import adaptive
+from graph import sampler
+from graph.viewport import Viewport
+
+FUNCTIONS = ("x^2/4", "x^50", "1/x", "1/(x - 0.3) + x", "x^0.5 * 3",
+    "(x^3 - 4*x)/(x^2 - 2)", "2^x - 5")
+
+# Functions and tight viewports (x_min, x_max, y_min, y_max) for comparing
+# sampling with and without interval bounds.
+TIGHT = (("x^50", (-2, 2, 0, 1)), ("2^x", (-10, 10, 0, 1)),
+    ("x^3 - 4*x", (-10, 10, -1, 1)), ("x^0.5 * 3", (-10, 10, -10, 10)))
+
+# Points per pixel of the grid the error is measured on.
+FINE = 16
+
+# Runs of each sampler in a tight viewport; the fastest is reported.
+REPEATS = 20
+
+def timed_sample(tree, viewport, width, height, intervals):
+    """Return an adaptive sampler of tree after sampling it with intervals,
+    and the shortest time of REPEATS runs in ms."""
+    best = float('inf')
+    for i in range(REPEATS):
+        member = adaptive.AdaptiveSampler(tree, budget=1 << 20)
+        start = time.time()
+        member.sample(viewport, width, height, intervals=intervals)
+        best = min(best, time.time() - start)
+    return member, best * 1000
+
+def error(curve, tree, viewport, width, height):
+    """Return the largest error of curve in pixels.
+
+    The error is the vertical distance between the drawn lines and the
+    function, divided by the length of the function per pixel of x, so that
+    it approximates the distance in pixels from the lines to the function
+    even where the function is steep.  Where the function is visible but
+    no lines are drawn for more than a pixel, the error is infinite.
+
+    """
+    fine = sampler.Sampler(tree)
+    x = numpy.linspace(viewport.x_min, viewport.x_max, width * FINE + 1)
+    exact = fine.evaluate(x)
+    drawn = numpy.full(len(x), numpy.nan)
+    covered = numpy.zeros(len(x), dtype=bool)
+    pixel = viewport.width() / width
+    for start, stop in curve.segments():
+        inside = (x >= curve.x[start]) & (x <= curve.x[stop - 1])
+        drawn[inside] = numpy.interp(x[inside], curve.x[start:stop],
+            curve.y[start:stop])
+        covered |= ((x >= curve.x[start] - pixel) &
+            (x <= curve.x[stop - 1] + pixel))
+    margin = viewport.height() * 0.01
+    low, high = viewport.y_min - margin, viewport.y_max + margin
+    scale = height / viewport.height()
+    with numpy.errstate(invalid='ignore'):
+        visible = (exact >= low) & (exact <= high)
+    if (visible & ~covered).any():
+        return numpy.inf
+    both = ~numpy.isnan(exact) & ~numpy.isnan(drawn)
+    exact = numpy.clip(exact[both], low, high) * scale
+    drawn = numpy.clip(drawn[both], low, high) * scale
+    slope = numpy.gradient(exact, 1.0 / FINE)
+    return (numpy.abs(exact - drawn) / numpy.sqrt(1 + slope ** 2)).max()
+
+def main(width=800, height=600):
+    """Print the evaluations of both samplers for every function."""
+    viewport = Viewport(-10, 10, -10, 10)
+    parser = human.Parser()
+    print("{0:>24} {1:>9} {2:>7} {3:>9} {4:>6} {5:>8}".format("function",
+        "adaptive", "error", "uniform", "ratio", "default"))
+    for function in FUNCTIONS:
+        tree = parser.parse(function)
+        adaptive_sampler = adaptive.AdaptiveSampler(tree, budget=1 << 20)
+        curve = adaptive_sampler.sample(viewport, width, height)
+        target = max(error(curve, tree, viewport, width, height),
+            adaptive.TOLERANCE)
+        samples = 2
+        while True:
+            uniform = sampler.Sampler(tree, budget=1 << 24)
+            uniform_curve = uniform.sample(viewport, samples)
+            if error(uniform_curve, tree, viewport, width, height) <= target:
+                break
+            samples *= 2
+            if samples > 1 << 19:
+                break
+        low, high = samples // 2, samples
+        while high - low > max(1, low // 50):
+            middle = (low + high) // 2
+            uniform = sampler.Sampler(tree, budget=1 << 24)
+            if error(uniform.sample(viewport, middle), tree, viewport, width,
+                    height) <= target:
+                high = middle
+            else:
+                low = middle
+        uniform = sampler.Sampler(tree, budget=1 << 24)
+        uniform.sample(viewport, high)
+        print("{0:>24} {1:9d} {2:7.2f} {3:9d} {4:6.1f} {5:8.1f}".format(
+            function, adaptive_sampler.evaluations, target,
+            uniform.evaluations,
+            float(uniform.evaluations) / adaptive_sampler.evaluations,
+            float(sampler.SAMPLES) / adaptive_sampler.evaluations))
+    print("")
+    print("{0:>24} {1:>9} {2:>9} {3:>10} {4:>10} {5:>12}".format(
+        "function", "bounded", "unbounded", "enclosures", "bounded ms",
+        "unbounded ms"))
+    for function, ranges in TIGHT:
+        tree = parser.parse(function)
+        bounded, bounded_time = timed_sample(tree, Viewport(*ranges), width,
+            height, True)
+        unbounded, unbounded_time = timed_sample(tree, Viewport(*ranges),
+            width, height, False)
+        print("{0:>24} {1:9d} {2:9d} {3:10d} {4:10.2f} {5:12.2f}".format(
+            function, bounded.evaluations, unbounded.evaluations,
+            bounded.enclosures, bounded_time, unbounded_time))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
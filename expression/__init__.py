@@ -3,11 +3,24 @@
 Classes:
 Expression  Represent a full expression
 BinaryOp    Represent a binary operator
+UnaryOp     Represent a unary operator, such as a logarithm
 Constant    Represent an integer or real constant
 Variable    Represent a variable in an expression
 
+Modules:
+arrayops    NumPy operations for evaluating arrays of samples
+codegen     Compile expression trees into Python functions
+optimizer   Simplify expression trees
+interning   Share repeated subtrees between and within expression trees
+flat        Compact, array-backed encoding of expression trees
+postfix     Non-recursive stack machine for evaluating expression trees
+interval    Interval arithmetic for bounding expressions over ranges
+calculus    Symbolic differentiation of expression trees
+
 """
 
 # Expression is not in __all__, as it should not be used externally.
-__all__ = ['constant', 'variable', 'binaryop']
+__all__ = ['constant', 'variable', 'binaryop', 'unaryop', 'arrayops',
+    'codegen', 'optimizer', 'interning', 'flat', 'postfix', 'interval',
+    'calculus']
 
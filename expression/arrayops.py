@@ -0,0 +1,57 @@
+"""Provide NumPy operations used to evaluate whole arrays of samples.
+
+The operators of Python raise exceptions for some operands (division by
+zero, a negative number to a fractional power), which would abort a whole
+batch.  The functions here return NaN for such samples instead, and never
+warn about them.
+
+NumPy is only imported when one of the functions is first called, so that
+parsing and scalar evaluation do not pay for importing it.
+
+Functions:
+asarray  Return a variable value as a float array.
+divide   Return the quotient of two arrays.
+power    Return the first array to the power of the second.
+log      Return the natural logarithm of an array.
+
+"""
+
+def asarray(value):
+    """Return value as a float array, without copying if possible."""
+    import numpy
+    return numpy.asarray(value, dtype=float)
+
+def divide(first, second):
+    """Return first / second, with NaN wherever second is zero."""
+    import numpy
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        result = numpy.true_divide(first, second)
+    return numpy.where(second == 0, numpy.nan, result)
+
+def power(first, second):
+    """Return first ** second, with NaN where the power is undefined.
+
+    The power is undefined for zero to a negative power and for negative
+    numbers to a fractional power, and wherever first or second is NaN
+    (numpy.power gives 1 for 1 ** nan and nan ** 0).
+
+    """
+    import numpy
+    with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        result = numpy.power(first, second)
+        undefined = (((first == 0) & (second < 0)) | numpy.isnan(first) |
+            numpy.isnan(second))
+    return numpy.where(undefined, numpy.nan, result)
+
+def log(value):
+    """Return the natural logarithm of value, NaN where it is not positive.
+
+    The logarithm of zero would be minus infinity, but is undefined like
+    division by zero.
+
+    """
+    import numpy
+    value = numpy.asarray(value, dtype=float)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        result = numpy.log(value)
+    return numpy.where(value > 0, result, numpy.nan)
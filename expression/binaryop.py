@@ -11,6 +11,9 @@ PowerOp       Class for power expressions
 """
 
 import expression
+import arrayops
+import interval
+from constant import Constant
 
 class BinaryOp(expression.Expression):
     """Represent an expression with a binary operator.
@@ -18,13 +21,38 @@ class BinaryOp(expression.Expression):
     The two operands are contained within this expression.  This is a base
     class: evaluate(self, variables) should be overloaded.
 
+    Instances only have slots for their operands and hash, so that large
+    numbers of them can be kept in memory.  The operator symbol is a class
+    attribute, set by every subclass.
+
     Methods:
-        __init__(self, first, operator, second)
+        __init__(self, first, second)
             Initialise the attributes.
 
         evaluate(self, variables) [inherited]
             Evaluate this expression.
 
+        operands(self)
+            Return the first and second subexpressions.
+
+        label(self)
+            Return the operator symbol.
+
+        evaluate_array(self, variables) [inherited]
+            Evaluate this expression for arrays of values.
+
+        evaluate_interval(self, bounds) [inherited]
+            Return bounds on the values of this expression over ranges.
+
+        enclose(self, intervals, bounds) [inherited]
+            Return bounds on this node from those on its operands.
+
+        source(self, operands, array=False) [inherited]
+            Return a Python expression computing this expression.
+
+        differentiate(self, variable, derivatives) [inherited]
+            Return the derivative of this expression.
+
         __str__(self)
             Return a human-readable string representing this expression.
             
@@ -33,24 +61,35 @@ class BinaryOp(expression.Expression):
 
     Attributes:
         _first     The expression to the left of the operator.
-        _operator  A string representation of the operator.
+        _operator  A string representation of the operator (class attribute).
         _second    The expression to teh right of the operator.
+        _hash      The structural hash of the expression.
 
     """
-    def __init__(self, first, operator, second):
+    __slots__ = ('_first', '_second')
+    _operator = None
+
+    def __init__(self, first, second):
         """Initialise the attributes.
 
-        Set the first and second subexpressions, and set the operator symbol.
+        Set the first and second subexpressions.
 
         Parameters:
         first     first subexpression
-        operator  string representation of the operator to use
         second    second subexpression
 
         """
         self._first = first
         self._second = second
-        self._operator = operator
+        self._hash = hash((type(self), first._hash, second._hash))
+
+    def operands(self):
+        """Return a tuple of the first and second subexpressions."""
+        return (self._first, self._second)
+
+    def label(self):
+        """Return the string representation of the operator."""
+        return self._operator
 
     def __str__(self):
         """Return a human-readable string representation of this expression.
@@ -79,23 +118,49 @@ class SumOp(BinaryOp):
     Important differences:
 
     Methods:
-        __init__(self, first, second)
-            Initialise the attributes; the operator is not necessary.
-
         evaluate(self, variables)
             Return the sum of first and second.
 
+        evaluate_array(self, variables)
+            Return the sum of first and second for arrays of values.
+
+        enclose(self, intervals, bounds)
+            Return bounds on the sum from those on first and second.
+
+        source(self, operands, array=False)
+            Return a Python expression computing the sum.
+
+        differentiate(self, variable, derivatives)
+            Return the sum of the derivatives.
+
     """
-    def __init__(self, first, second):
-        """Initialise the attributes."""
-        # Putting spaces around the + for readability.
-        BinaryOp.__init__(self, first, " + ", second)
+    __slots__ = ()
+    # Putting spaces around the + for readability.
+    _operator = " + "
 
     def evaluate(self, variables):
         """Return the sum of first and second."""
         return (self._first.evaluate(variables) +
         self._second.evaluate(variables))
 
+    def evaluate_array(self, variables):
+        """Return the sum of first and second for arrays of values."""
+        return (self._first.evaluate_array(variables) +
+        self._second.evaluate_array(variables))
+
+    def enclose(self, intervals, bounds):
+        """Return bounds on the sum from those on first and second."""
+        return interval.add(*intervals)
+
+    def source(self, operands, array=False):
+        """Return a Python expression computing the sum."""
+        return "{0} + {1}".format(*operands)
+
+    def differentiate(self, variable, derivatives):
+        """Return the sum of the derivatives of first and second."""
+        import calculus
+        return calculus.add(*derivatives)
+
     def __repr__(self):
         return "SumOp({0!r}, {1!r})".format(self._first, self._second)
 
@@ -108,23 +173,49 @@ class DifferenceOp(BinaryOp):
     Important differences:
 
     Methods:
-        __init__(self, first, second)
-            Initialise the attributes; the operator is not necessary.
-
         evaluate(self, variables)
             Return the difference of first and second.
 
+        evaluate_array(self, variables)
+            Return the difference of first and second for arrays of values.
+
+        enclose(self, intervals, bounds)
+            Return bounds on the difference from those on first and second.
+
+        source(self, operands, array=False)
+            Return a Python expression computing the difference.
+
+        differentiate(self, variable, derivatives)
+            Return the difference of the derivatives.
+
     """
-    def __init__(self, first, second):
-        """Initialise the attributes."""
-        # Putting spaces around the - for readability.
-        BinaryOp.__init__(self, first, " - ", second)
+    __slots__ = ()
+    # Putting spaces around the - for readability.
+    _operator = " - "
 
     def evaluate(self, variables):
         """Return the difference of first and second."""
         return (self._first.evaluate(variables) -
         self._second.evaluate(variables))
 
+    def evaluate_array(self, variables):
+        """Return the difference of first and second for arrays of values."""
+        return (self._first.evaluate_array(variables) -
+        self._second.evaluate_array(variables))
+
+    def enclose(self, intervals, bounds):
+        """Return bounds on the difference from those on first and second."""
+        return interval.subtract(*intervals)
+
+    def source(self, operands, array=False):
+        """Return a Python expression computing the difference."""
+        return "{0} - {1}".format(*operands)
+
+    def differentiate(self, variable, derivatives):
+        """Return the difference of the derivatives of first and second."""
+        import calculus
+        return calculus.subtract(*derivatives)
+
     def __repr__(self):
         return "DifferenceOp({0!r}, {1!r})".format(self._first, self._second)
 
@@ -137,22 +228,50 @@ class ProductOp(BinaryOp):
     Important differences:
 
     Methods:
-        __init__(self, first, second)
-            Initialise the attributes; the operator is not necessary.
-
         evaluate(self, variables)
             Return the product of first and second.
 
+        evaluate_array(self, variables)
+            Return the product of first and second for arrays of values.
+
+        enclose(self, intervals, bounds)
+            Return bounds on the product from those on first and second.
+
+        source(self, operands, array=False)
+            Return a Python expression computing the product.
+
+        differentiate(self, variable, derivatives)
+            Return the derivative by the product rule.
+
     """
-    def __init__(self, first, second):
-        """Initialise the attributes."""
-        BinaryOp.__init__(self, first, "*", second)
+    __slots__ = ()
+    _operator = "*"
 
     def evaluate(self, variables):
         """Return the product of first and second."""
         return (self._first.evaluate(variables) *
         self._second.evaluate(variables))
 
+    def evaluate_array(self, variables):
+        """Return the product of first and second for arrays of values."""
+        return (self._first.evaluate_array(variables) *
+        self._second.evaluate_array(variables))
+
+    def enclose(self, intervals, bounds):
+        """Return bounds on the product from those on first and second."""
+        return interval.multiply(*intervals)
+
+    def source(self, operands, array=False):
+        """Return a Python expression computing the product."""
+        return "{0} * {1}".format(*operands)
+
+    def differentiate(self, variable, derivatives):
+        """Return the derivative by the product rule: f'g + fg'."""
+        import calculus
+        return calculus.add(
+            calculus.multiply(derivatives[0], self._second),
+            calculus.multiply(self._first, derivatives[1]))
+
     def __repr__(self):
         return "ProductOp({0!r}, {1!r})".format(self._first, self._second)
 
@@ -165,22 +284,63 @@ class QuotientOp(BinaryOp):
     Important differences:
 
     Methods:
-        __init__(self, first, second)
-            Initialise the attributes; the operator is not necessary.
-
         evaluate(self, variables)
             Return the quotient of first and second.
 
+        evaluate_array(self, variables)
+            Return the quotient of first and second for arrays of values.
+
+        enclose(self, intervals, bounds)
+            Return bounds on the quotient from those on first and second.
+
+        source(self, operands, array=False)
+            Return a Python expression computing the quotient.
+
+        differentiate(self, variable, derivatives)
+            Return the derivative by the quotient rule.
+
     """
-    def __init__(self, first, second):
-        """Initialise the attributes."""
-        BinaryOp.__init__(self, first, "/", second)
+    __slots__ = ()
+    _operator = "/"
 
     def evaluate(self, variables):
         """Return the product of first and second."""
         return (self._first.evaluate(variables) /
         self._second.evaluate(variables))
 
+    def evaluate_array(self, variables):
+        """Return the quotient of first and second for arrays of values.
+
+        Samples where the quotient is undefined are NaN.
+
+        """
+        return arrayops.divide(self._first.evaluate_array(variables),
+        self._second.evaluate_array(variables))
+
+    def enclose(self, intervals, bounds):
+        """Return bounds on the quotient from those on first and second.
+
+        Quotients for values of second that are zero are left out.
+
+        """
+        return interval.divide(*intervals)
+
+    def source(self, operands, array=False):
+        """Return a Python expression computing the quotient."""
+        if array:
+            return "divide({0}, {1})".format(*operands)
+        return "{0} / {1}".format(*operands)
+
+    def differentiate(self, variable, derivatives):
+        """Return the derivative by the quotient rule: (f'g - fg') / g^2."""
+        import calculus
+        if calculus.is_zero(derivatives[1]):
+            return calculus.divide(derivatives[0], self._second)
+        return calculus.divide(calculus.subtract(
+            calculus.multiply(derivatives[0], self._second),
+            calculus.multiply(self._first, derivatives[1])),
+            calculus.power(self._second, Constant(2)))
+
     def __repr__(self):
         return "QuotientOp({0!r}, {1!r})".format(self._first, self._second)
 
@@ -193,22 +353,72 @@ class PowerOp(BinaryOp):
     Important differences:
 
     Methods:
-        __init__(self, first, second)
-            Initialise the attributes; the operator is not necessary.
-
         evaluate(self, variables)
             Return the first to the power of the second.
 
+        evaluate_array(self, variables)
+            Return the power of first and second for arrays of values.
+
+        enclose(self, intervals, bounds)
+            Return bounds on the power from those on first and second.
+
+        source(self, operands, array=False)
+            Return a Python expression computing the power.
+
+        differentiate(self, variable, derivatives)
+            Return the derivative of the power.
+
     """
-    def __init__(self, first, second):
-        """Initialise the attributes."""
-        BinaryOp.__init__(self, first, "^", second)
+    __slots__ = ()
+    _operator = "^"
 
     def evaluate(self, variables):
         """Return the first to the power of the second."""
         return (self._first.evaluate(variables) **
         self._second.evaluate(variables))
 
+    def evaluate_array(self, variables):
+        """Return the power of first and second for arrays of values.
+
+        Samples where the power is undefined are NaN.
+
+        """
+        return arrayops.power(self._first.evaluate_array(variables),
+        self._second.evaluate_array(variables))
+
+    def enclose(self, intervals, bounds):
+        """Return bounds on the power from those on first and second.
+
+        Powers are left out where they are undefined (see interval.power).
+
+        """
+        return interval.power(*intervals)
+
+    def source(self, operands, array=False):
+        """Return a Python expression computing the power."""
+        if array:
+            return "power({0}, {1})".format(*operands)
+        return "{0} ** {1}".format(*operands)
+
+    def differentiate(self, variable, derivatives):
+        """Return the derivative of the power.
+
+        If the exponent g does not depend on variable, this is g f^(g-1) f'.
+        Otherwise it is f^g (g' ln(f) + g f' / f), which is only defined
+        where f is positive.
+
+        """
+        import calculus
+        if calculus.is_zero(derivatives[1]):
+            return calculus.multiply(calculus.multiply(self._second,
+                calculus.power(self._first,
+                calculus.subtract(self._second, Constant(1)))),
+                derivatives[0])
+        return calculus.multiply(self, calculus.add(
+            calculus.multiply(derivatives[1], calculus.log(self._first)),
+            calculus.divide(calculus.multiply(self._second, derivatives[0]),
+            self._first)))
+
     def __repr__(self):
         return "PowerOp({0!r}, {1!r})".format(self._first, self._second)
 
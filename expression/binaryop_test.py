@@ -11,8 +11,11 @@ PowerOp
 """
 
 import nose
+from nose import tools
+import numpy
 import binaryop
 from constant import Constant
+from variable import Variable
 
 class Test_BinaryOp(object):
     """Test the BinaryOp class.
@@ -28,6 +31,61 @@ class Test_BinaryOp(object):
     def test_repr(self):
         pass
 
+class Test_EvaluateArray(object):
+    """Test evaluating binary operators for arrays of values.
+
+    Ensure the following works as expected:
+        Results match evaluate for every sample
+        Undefined samples become NaN instead of raising
+
+    """
+    def test_matches_evaluate(self):
+        # Ensure that every sample matches the scalar result.
+        x = Variable('x')
+        values = (
+            binaryop.SumOp(x, Constant(2)),
+            binaryop.DifferenceOp(Constant(0), x),
+            binaryop.ProductOp(x, x),
+            binaryop.QuotientOp(x, Constant(4)),
+            binaryop.PowerOp(x, Constant(3)),
+        )
+        samples = numpy.linspace(-3, 3, 13)
+        def run_logic(tree):
+            """Compare evaluate_array with evaluate for every sample."""
+            result = tree.evaluate_array({'x': samples})
+            for sample, value in zip(samples, result):
+                tools.eq_(value, tree.evaluate({'x': sample}))
+            compiled = tree.compile(array=True)({'x': samples})
+            tools.ok_(numpy.array_equal(compiled, result))
+
+        for tree in values:
+            yield run_logic, tree
+
+    def test_undefined_is_nan(self):
+        # Ensure that undefined samples do not abort the whole batch.
+        x = Variable('x')
+        values = (
+            (binaryop.QuotientOp(Constant(1), x), [-1.0, 0.0, 2.0],
+                [-1.0, numpy.nan, 0.5]),
+            (binaryop.PowerOp(x, Constant(0.5)), [-4.0, 0.0, 4.0],
+                [numpy.nan, 0.0, 2.0]),
+            (binaryop.PowerOp(x, Constant(-1)), [-2.0, 0.0, 2.0],
+                [-0.5, numpy.nan, 0.5]),
+            (binaryop.PowerOp(binaryop.QuotientOp(Constant(1), x),
+                Constant(0)), [-1.0, 0.0, 2.0], [1.0, numpy.nan, 1.0]),
+            (binaryop.PowerOp(Constant(1), binaryop.PowerOp(x,
+                Constant(1.5))), [-1.0, 0.0, 4.0], [numpy.nan, 1.0, 1.0]),
+        )
+        def run_logic(tree, samples, expected):
+            """Compare the result with the expected values, NaN included."""
+            for function in (tree.evaluate_array,
+                    tree.compile(array=True)):
+                result = function({'x': numpy.array(samples)})
+                numpy.testing.assert_array_equal(result, expected)
+
+        for tree, samples, expected in values:
+            yield run_logic, tree, samples, expected
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,139 @@
+"""Differentiate expression trees symbolically.
+
+The derivative of a tree is a new tree, built from the derivative of every
+node (see Expression.differentiate) and sharing the unchanged subtrees of
+the original.  It is used to find roots and extrema with Newton's method,
+and wherever the slope or curvature of a function is needed.
+
+Derivatives are only meaningful where the function is defined.  While they
+are built, they are simplified with rules that hold wherever the operands
+are defined (0 * f and f - f become 0, f / f becomes 1), so that they stay
+small.  The result is then simplified further with optimizer.simplify.
+
+Like the other walks over trees, differentiation does not recurse, and
+shared subtrees are differentiated only once.
+
+Functions:
+derivative           Return the derivative of a tree.
+derivatives          Return a tree and its derivatives up to an order.
+compile_derivatives  Return a function evaluating a tree and its derivatives.
+is_zero              Return whether a tree is the constant 0.
+add, subtract, multiply, divide, power, log
+                     Return a new tree, simplified where an operand is 0 or 1.
+
+"""
+
+import codegen
+import optimizer
+from binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp, PowerOp
+from unaryop import LogarithmOp
+from constant import Constant
+
+def derivative(tree, variable):
+    """Return the simplified derivative of tree with respect to variable.
+
+    The tree is not modified.
+
+    """
+    results = {}
+    for node in tree.postorder():
+        operands = [results[id(operand)] for operand in node.operands()]
+        results[id(node)] = node.differentiate(variable, operands)
+    return optimizer.simplify(results[id(tree)])[0]
+
+def derivatives(tree, variable, order=1):
+    """Return a list of tree and its derivatives up to order."""
+    trees = [tree]
+    for i in range(order):
+        trees.append(derivative(trees[-1], variable))
+    return trees
+
+def compile_derivatives(tree, variable, order=1, array=False):
+    """Return a function that evaluates tree and its derivatives at once.
+
+    The function takes a variables dictionary like Expression.evaluate (or
+    Expression.evaluate_array if array is true), and returns a tuple of the
+    value of tree and of its derivatives up to order.  The derivatives share
+    most of their subtrees with tree, and those are computed only once (see
+    codegen.compile_trees).
+
+    """
+    return codegen.compile_trees(derivatives(tree, variable, order), array)
+
+def is_zero(tree):
+    """Return whether tree is the constant 0."""
+    return isinstance(tree, Constant) and tree.label() == 0
+
+def _is_one(tree):
+    """Return whether tree is the constant 1."""
+    return isinstance(tree, Constant) and tree.label() == 1
+
+def _is_integer(tree):
+    """Return whether tree is a constant integer."""
+    return isinstance(tree, Constant) and tree.label() % 1 == 0
+
+def _node(cls, *operands):
+    """Return cls(*operands), folded into a constant if possible."""
+    node = cls(*operands)
+    if all(isinstance(operand, Constant) for operand in operands):
+        try:
+            return Constant(node.evaluate({}))
+        except (ArithmeticError, ValueError, TypeError):
+            pass
+    return node
+
+def add(first, second):
+    """Return a tree for first + second."""
+    if is_zero(first):
+        return second
+    if is_zero(second):
+        return first
+    return _node(SumOp, first, second)
+
+def subtract(first, second):
+    """Return a tree for first - second."""
+    if is_zero(second):
+        return first
+    if first == second:
+        return Constant(0)
+    return _node(DifferenceOp, first, second)
+
+def multiply(first, second):
+    """Return a tree for first * second."""
+    if is_zero(first) or is_zero(second):
+        return Constant(0)
+    if _is_one(first):
+        return second
+    if _is_one(second):
+        return first
+    # The optimizer merges negations written as 0 - f.
+    if isinstance(first, Constant) and first.label() == -1:
+        return subtract(Constant(0), second)
+    return _node(ProductOp, first, second)
+
+def divide(first, second):
+    """Return a tree for first / second."""
+    if is_zero(first):
+        return Constant(0)
+    if _is_one(second):
+        return first
+    if first == second:
+        return Constant(1)
+    return _node(QuotientOp, first, second)
+
+def power(first, second):
+    """Return a tree for first ^ second."""
+    if is_zero(second):
+        return Constant(1)
+    if _is_one(second):
+        return first
+    # (f^a)^n = f^(a n) for integers n.
+    if isinstance(first, PowerOp) and _is_integer(second):
+        base, exponent = first.operands()
+        if isinstance(exponent, Constant):
+            return power(base, _node(ProductOp, exponent, second))
+    return _node(PowerOp, first, second)
+
+def log(first):
+    """Return a tree for the natural logarithm of first."""
+    return _node(LogarithmOp, first)
@@ -0,0 +1,104 @@
+"""Tests the functions in calculus.py.
+
+Test classes:
+Test_Derivative
+
+"""
+
+import nose
+from nose import tools
+import numpy
+import calculus
+import codegen
+from binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp, PowerOp
+from unaryop import LogarithmOp
+from constant import Constant
+from variable import Variable
+
+x = Variable('x')
+
+class Test_Derivative(object):
+    """Test differentiating expression trees.
+
+    Ensure the following works as expected:
+        Derivatives match central differences
+        Derivatives of leaves and simple powers are simplified
+        Other variables are constants
+        Very deep trees can be differentiated
+        Trees and their derivatives are compiled into one function
+
+    """
+    def test_numeric(self):
+        # Ensure that derivatives match the slope between close points.
+        values = (
+            SumOp(ProductOp(Constant(3), PowerOp(x, Constant(3))), x),
+            DifferenceOp(Constant(1), QuotientOp(Constant(2), x)),
+            QuotientOp(x, SumOp(ProductOp(x, x), Constant(1))),
+            PowerOp(x, Constant(0.5)),
+            PowerOp(Constant(2), x),
+            PowerOp(x, x),
+            PowerOp(SumOp(x, Constant(1)), ProductOp(x, Constant(0.5))),
+            LogarithmOp(ProductOp(x, x)),
+        )
+        samples = numpy.linspace(0.25, 3, 12)
+        step = 1e-6
+        def numeric_logic(tree):
+            """Compare the derivative with a central difference."""
+            function = tree.compile(array=True)
+            slope = (function({'x': samples + step}) -
+                function({'x': samples - step})) / (2 * step)
+            exact = tree.derivative('x').evaluate_array({'x': samples})
+            numpy.testing.assert_allclose(exact, slope, rtol=1e-6, atol=1e-8)
+
+        for tree in values:
+            yield numeric_logic, tree
+
+    def test_simplified(self):
+        # Ensure that derivatives are not cluttered with zeros and ones.
+        def simplified_logic(tree, expected):
+            """Compare the derivative of tree with expected."""
+            tools.eq_(tree.derivative('x'), expected)
+
+        for tree, expected in (
+                (Constant(5), Constant(0)),
+                (x, Constant(1)),
+                (Variable('y'), Constant(0)),
+                (SumOp(x, Constant(5)), Constant(1)),
+                (ProductOp(Constant(3), x), Constant(3)),
+                (PowerOp(x, Constant(2)), ProductOp(Constant(2), x)),
+                (ProductOp(x, Variable('y')), Variable('y')),
+                (QuotientOp(x, Variable('y')),
+                    QuotientOp(Constant(1), Variable('y'))),
+                (LogarithmOp(x), QuotientOp(Constant(1), x))):
+            yield simplified_logic, tree, expected
+        # Unary minus is written as 0 - x.
+        tools.eq_(QuotientOp(Constant(1), x).derivative('x'),
+            QuotientOp(Constant(-1), PowerOp(x, Constant(2))))
+
+    def test_deep_tree(self):
+        # Ensure that differentiating does not recurse.
+        tree = x
+        for i in range(10000):
+            tree = SumOp(tree, ProductOp(Constant(i), x))
+        derivative = tree.derivative('x')
+        tools.eq_(derivative.compile()({'x': 1.0}), 1 + 9999 * 10000 / 2)
+
+    def test_compile_derivatives(self):
+        # Ensure that a tree and its derivatives are computed in one pass.
+        tree = PowerOp(SumOp(PowerOp(x, Constant(2)), Constant(1)),
+            Constant(-3))
+        function = calculus.compile_derivatives(tree, 'x', 2, array=True)
+        samples = numpy.linspace(-2, 2, 9)
+        values = function({'x': samples})
+        tools.eq_(len(values), 3)
+        trees = calculus.derivatives(tree, 'x', 2)
+        for value, expected in zip(values, trees):
+            numpy.testing.assert_array_equal(value,
+                expected.evaluate_array({'x': samples}))
+        # Subtrees shared with the function are only computed once.
+        separate = sum(len(codegen.generate_source(expected).splitlines())
+            for expected in trees)
+        tools.ok_(len(function.source.splitlines()) < separate - 3)
+
+if __name__ == '__main__':
+    nose.main()
@@ -0,0 +1,103 @@
+"""Compile expression trees into Python functions.
+
+Evaluating a tree with Expression.evaluate makes a method call and a
+dictionary lookup for every node, every time.  The functions here walk the
+tree once and generate straight-line Python code, one assignment per node,
+which is then compiled with the builtin compile().  As the generated code is
+flat, arbitrarily deep trees can be compiled without hitting the recursion
+limit or the nesting limits of the Python parser.
+
+Functions:
+generate_source  Return the source code of the function for trees.
+compile_tree     Return a function that evaluates a tree.
+compile_trees    Return a function that evaluates several trees at once.
+
+"""
+
+import math
+import re
+import expression
+import arrayops
+
+# Name of the generated function in the generated source.
+FUNCTION_NAME = "_compiled_expression"
+
+_atomic = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*|[0-9][0-9.e+-]*)$")
+
+def _atom(source):
+    """Return source, parenthesised unless it is a name or unsigned number."""
+    if _atomic.match(source):
+        return source
+    return "(" + source + ")"
+
+def generate_source(trees, array=False):
+    """Return the source of a function that evaluates trees.
+
+    trees is either a single tree, in which case the function returns its
+    value, or a sequence of trees, in which case it returns a tuple with the
+    value of each.  The function takes a single parameter, variables, which
+    is used exactly like the parameter of Expression.evaluate, or of
+    Expression.evaluate_array if array is true.
+
+    Leaves that do not depend on variables (constants) are inlined; every
+    other node is assigned to its own local variable.  Equal subtrees, within
+    one tree or across trees, are computed only once.
+
+    """
+    single = isinstance(trees, expression.Expression)
+    if single:
+        trees = [trees]
+    lines = ["def {0}(variables):".format(FUNCTION_NAME)]
+    names = {}
+    for tree in trees:
+        for node in tree.postorder():
+            if node in names:
+                continue
+            operands = node.operands()
+            source = node.source([names[op] for op in operands], array)
+            if not operands and "variables[" not in source:
+                names[node] = _atom(source)
+                continue
+            name = "t{0}".format(len(lines) - 1)
+            lines.append("    {0} = {1}".format(name, source))
+            names[node] = name
+    results = [names[tree] for tree in trees]
+    if array:
+        # Constant trees would otherwise return a plain float.
+        results = ["asarray({0})".format(result) for result in results]
+    if single:
+        lines.append("    return {0}".format(results[0]))
+    else:
+        lines.append("    return ({0},)".format(", ".join(results)))
+    return "\n".join(lines) + "\n"
+
+def compile_tree(tree, array=False):
+    """Return a function that evaluates tree.
+
+    The function behaves exactly like tree.evaluate (or tree.evaluate_array
+    if array is true), including the exceptions it raises, but does not walk
+    the tree.  Its source is available as its source attribute.
+
+    """
+    return _compile(tree, array)
+
+def compile_trees(trees, array=False):
+    """Return a function that evaluates all of trees at once.
+
+    The function returns a tuple with one value per tree.  Subtrees that the
+    trees have in common are computed once for all of them.
+
+    """
+    return _compile(list(trees), array)
+
+def _compile(trees, array):
+    """Generate, compile and return the function for trees."""
+    source = generate_source(trees, array)
+    namespace = dict((name, getattr(arrayops, name))
+        for name in ('asarray', 'divide', 'power', 'log'))
+    namespace['math'] = math
+    exec(compile(source, "<expression {0}>".format(id(trees)), "exec"),
+        namespace)
+    function = namespace[FUNCTION_NAME]
+    function.source = source
+    return function
@@ -0,0 +1,84 @@
+"""Tests the functions in codegen.py.
+
+Test classes:
+Test_Compile
+
+"""
+
+import nose
+from nose import tools
+import codegen
+import binaryop
+from constant import Constant
+from variable import Variable
+
+class Test_Compile(object):
+    """Test compiling expression trees.
+
+    Ensure the following works as expected:
+        Compiled trees give the same results as evaluate
+        Compiled trees raise the same exceptions as evaluate
+        Very deep trees can be compiled
+        Equal subtrees are computed once
+
+    """
+    def test_same_result(self):
+        # Ensure that compiling does not change the result.
+        x = Variable('x')
+        values = (
+            Constant(3.5),
+            x,
+            binaryop.SumOp(x, Constant(2)),
+            binaryop.DifferenceOp(Constant(0), x),
+            binaryop.ProductOp(x, binaryop.SumOp(x, Constant(1))),
+            binaryop.QuotientOp(Constant(1), binaryop.PowerOp(x, Constant(3))),
+            binaryop.PowerOp(Constant(2), binaryop.DifferenceOp(Constant(0),
+                x)),
+            binaryop.ProductOp(Constant(-2), binaryop.PowerOp(x, x)),
+        )
+        def run_logic(tree, x_value):
+            """Compare evaluate with the compiled function at x_value."""
+            variables = {'x': x_value}
+            tools.eq_(tree.compile()(variables), tree.evaluate(variables))
+
+        for tree in values:
+            for x_value in (0.5, 1.0, 2.0, 7.25):
+                yield run_logic, tree, x_value
+
+    def test_same_error(self):
+        # Ensure that errors are not swallowed.
+        tree = binaryop.QuotientOp(Constant(1), Variable('x'))
+        tools.assert_raises(ZeroDivisionError, tree.compile(), {'x': 0.0})
+        tools.assert_raises(KeyError, tree.compile(), {'y': 1.0})
+
+    def test_deep_tree(self):
+        # Ensure that very deep trees do not overflow any stack.
+        tree = Variable('x')
+        for i in range(20000):
+            tree = binaryop.SumOp(tree, Constant(1))
+        tools.eq_(tree.compile()({'x': 0.0}), 20000.0)
+
+    def test_common_subexpressions(self):
+        # Ensure that equal subtrees are computed only once.
+        x = Variable('x')
+        def common():
+            return binaryop.SumOp(binaryop.PowerOp(x, Constant(2)),
+                Constant(1))
+        tree = binaryop.QuotientOp(common(),
+            binaryop.PowerOp(common(), Constant(3)))
+        function = tree.compile()
+        tools.eq_(function.source.count("**"), 2)
+        tools.eq_(function.source.count("+"), 1)
+        tools.eq_(function({'x': 2.0}), tree.evaluate({'x': 2.0}))
+
+    def test_compile_trees(self):
+        # Ensure that several trees can be compiled into one function.
+        x = Variable('x')
+        square = binaryop.PowerOp(x, Constant(2))
+        trees = (square, binaryop.SumOp(square, Constant(1)), Constant(5))
+        function = codegen.compile_trees(trees)
+        tools.eq_(function.source.count("**"), 1)
+        tools.eq_(function({'x': 3.0}), (9.0, 10.0, 5.0))
+
+if __name__ == '__main__':
+    nose.main()
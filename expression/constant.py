@@ -6,6 +6,8 @@ Constant        Class for constants
 """
 
 import expression
+import arrayops
+import interval
 
 class Constant(expression.Expression):
     """Represent a constant expression.
@@ -20,6 +22,24 @@ class Constant(expression.Expression):
         evaluate(self) 
             Evaluate this expression.
 
+        operands(self)
+            Return an empty tuple; constants have no subexpressions.
+
+        evaluate_array(self, variables)
+            Evaluate this expression for arrays of values.
+
+        enclose(self, intervals, bounds)
+            Return the value as an interval.
+
+        label(self)
+            Return the value of the constant.
+
+        source(self, operands, array=False)
+            Return a Python literal for the constant.
+
+        differentiate(self, variable, derivatives)
+            Return the constant 0.
+
         __str__(self)
             Return a human-readable string representing this expression.
             
@@ -28,16 +48,47 @@ class Constant(expression.Expression):
 
     Attributes:
         _value  The value of the constant.
+        _hash   The structural hash of the constant.
 
     """
+    __slots__ = ('_value',)
+
     def __init__(self, value):
         """Initialise the attributes."""
         self._value = float(value)
+        self._hash = hash((Constant, self._value))
 
     def evaluate(self, variables):
         """Return the value of the constant."""
         return self._value
 
+    def evaluate_array(self, variables):
+        """Return the value of the constant as a 0-dimensional array."""
+        return arrayops.asarray(self._value)
+
+    def enclose(self, intervals, bounds):
+        """Return the interval of only the value of the constant."""
+        return interval.interval(self._value)
+
+    def operands(self):
+        """Return an empty tuple, as a constant has no subexpressions."""
+        return ()
+
+    def label(self):
+        """Return the value of the constant."""
+        return self._value
+
+    def source(self, operands, array=False):
+        """Return a Python expression for the value of the constant."""
+        if self._value - self._value == 0:
+            return repr(self._value)
+        # inf and nan have no literal, so spell them out.
+        return "float('{0!r}')".format(self._value)
+
+    def differentiate(self, variable, derivatives):
+        """Return 0, as a constant does not change."""
+        return Constant(0)
+
     def __str__(self):
         """Return a human-readable string representing of this expression.
 
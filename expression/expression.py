@@ -7,12 +7,59 @@ class Expression(object):
 
     This class represents an interface that classes that can represent a full
     mathematical expression (such as BinaryOp, Variable and Constant) should
-    follow.  By default, all methods except __repr__ raise a
-    NotImplementedError exception, and must therefore be overriden in any subclasses.
+    follow.  By default, all methods except __repr__, postorder, compile,
+    derivative and the comparison methods raise a NotImplementedError
+    exception, and must therefore be overriden in any subclasses.
+
+    Expressions compare and hash by structure: two trees are equal if they
+    consist of the same nodes with the same labels, even if they are
+    different objects.  Subclasses must set the _hash attribute when they are
+    initialised, from their label and the hashes of their operands, so that
+    hashing never needs to walk the tree.
+
+    Expressions use __slots__ instead of a per-instance __dict__, as
+    thousands of trees may be kept in memory at once.  Subclasses must declare
+    __slots__ as well.  For a yet more compact encoding, see the flat module.
 
     Methods:
         evaluate(self, variables)
-            Evaluate the expression and return the result.  
+            Evaluate the expression and return the result.
+
+        evaluate_array(self, variables)
+            Evaluate the expression for whole arrays of variable values.
+
+        evaluate_interval(self, bounds)
+            Return bounds on the values of the expression over ranges.
+
+        enclose(self, intervals, bounds)
+            Return bounds on this node from those on its operands.
+
+        operands(self)
+            Return a tuple of the direct subexpressions.
+
+        label(self)
+            Return what distinguishes this node apart from its operands.
+
+        source(self, operands, array=False)
+            Return a Python expression computing this node.
+
+        postorder(self)
+            Iterate over all distinct subexpressions, operands first.
+
+        compile(self, array=False)
+            Return a function equivalent to evaluate or evaluate_array.
+
+        differentiate(self, variable, derivatives)
+            Return the derivative of this node from those of its operands.
+
+        derivative(self, variable)
+            Return the derivative of the expression.
+
+        __eq__(self, other), __ne__(self, other), __hash__(self)
+            Compare expressions by structure.
+
+        __reduce__(self)
+            Support pickling and copying.
 
         __str__(self)
             Return a human-readable representation of the expression.
@@ -20,7 +67,12 @@ class Expression(object):
         __repr__(self)
             Return a more detailed representation of the expression.
 
+    Attributes:
+        _hash  The structural hash of this expression.
+
     """
+    __slots__ = ('_hash',)
+
     def evaluate(self, variables):
         """Evaluate the expression and return the result as a float.
 
@@ -30,6 +82,178 @@ class Expression(object):
         """
         raise NotImplementedError()
 
+    def evaluate_array(self, variables):
+        """Evaluate the expression for arrays of values, returning an array.
+
+        Every operator is applied once to whole NumPy arrays, so this is much
+        faster than calling evaluate for every sample.  Samples for which the
+        expression is undefined (such as a division by zero) are NaN in the
+        result; no exceptions are raised for them.  The result broadcasts
+        against the variable values: a tree without variables returns a
+        single NumPy value.
+
+        Parameters:
+        variables   A dictionary of variable names and array-like values.
+
+        """
+        raise NotImplementedError()
+
+    def evaluate_interval(self, bounds):
+        """Return an interval containing all values of the expression.
+
+        The result is a pair (lo, hi) as in the interval module: every value
+        evaluate_array could return for variable values within bounds (that
+        is not NaN) lies between lo and hi.  lo and hi are NaN where the
+        expression is undefined for all of those values.
+
+        Parameters:
+        bounds      A dictionary of variable names and (lo, hi) pairs of
+                    array-like values.  Arrays give several ranges at once.
+
+        Every node is enclosed once, operands first (see enclose), so this
+        does not recurse and is safe to use on arbitrarily deep trees.
+
+        """
+        intervals = {}
+        for node in self.postorder():
+            operands = [intervals[id(operand)] for operand in node.operands()]
+            intervals[id(node)] = node.enclose(operands, bounds)
+        return intervals[id(self)]
+
+    def enclose(self, intervals, bounds):
+        """Return an interval containing all values of this node.
+
+        Parameters:
+        intervals   A sequence of the intervals of the operands, one for
+                    every element of operands().
+        bounds      The bounds of the variables, as for evaluate_interval.
+
+        The result is built with the functions of the interval module.
+        evaluate_interval calls this for every node.
+
+        """
+        raise NotImplementedError()
+
+    def operands(self):
+        """Return a tuple of the direct subexpressions of this expression."""
+        raise NotImplementedError()
+
+    def label(self):
+        """Return the data that distinguishes this node from others.
+
+        Together with the type of the node and its operands, this identifies
+        the expression; for example, the value of a constant.
+
+        """
+        raise NotImplementedError()
+
+    def source(self, operands, array=False):
+        """Return a Python expression that computes this node.
+
+        Parameters:
+        operands    A sequence of Python expressions (as strings), one for
+                    every element of operands(), holding their values.
+        array       If true, compute what evaluate_array would compute.  The
+                    names from the arrayops module may be used; otherwise,
+                    the math module may be used.
+
+        The result is used by the codegen module to build compiled functions.
+
+        """
+        raise NotImplementedError()
+
+    def postorder(self):
+        """Iterate over all subexpressions, yielding operands before parents.
+
+        A node object that occurs several times (because it is shared) is only
+        yielded once.  This does not recurse, so it is safe to use on
+        arbitrarily deep trees.
+
+        """
+        seen = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+            elif id(node) not in seen:
+                seen.add(id(node))
+                stack.append((node, True))
+                for operand in reversed(node.operands()):
+                    stack.append((operand, False))
+
+    def compile(self, array=False):
+        """Return a function that evaluates this expression.
+
+        The returned function takes the same variables dictionary as evaluate
+        and returns the same result, but the tree is only walked once, when
+        compiling.  Use this whenever an expression is evaluated repeatedly.
+        If array is true, the function behaves like evaluate_array instead.
+
+        """
+        import codegen
+        return codegen.compile_tree(self, array)
+
+    def differentiate(self, variable, derivatives):
+        """Return the derivative of this node with respect to variable.
+
+        Parameters:
+        variable     The name of the variable.
+        derivatives  A sequence of the derivatives of the operands, one for
+                     every element of operands().
+
+        The result is built with the functions of the calculus module, which
+        calls this for every node.
+
+        """
+        raise NotImplementedError()
+
+    def derivative(self, variable):
+        """Return the simplified derivative with respect to variable.
+
+        See calculus.derivative.
+
+        """
+        import calculus
+        return calculus.derivative(self, variable)
+
+    def __eq__(self, other):
+        """Return whether other is an expression with the same structure."""
+        pairs = [(self, other)]
+        while pairs:
+            first, second = pairs.pop()
+            if first is second:
+                continue
+            if (type(first) is not type(second) or
+                    first._hash != second._hash or
+                    first.label() != second.label()):
+                return False
+            pairs.extend(zip(first.operands(), second.operands()))
+        return True
+
+    def __ne__(self, other):
+        """Return whether other differs in structure from this expression."""
+        return not self == other
+
+    def __hash__(self):
+        """Return the structural hash of the expression."""
+        return self._hash
+
+    def __reduce__(self):
+        """Return how to rebuild this expression, for pickle and copy.
+
+        Slotted objects cannot be pickled by default with every protocol.
+        Leaves are rebuilt from their label.  Other expressions are pickled
+        as a flat.FlatExpression, so that pickling does not recurse once per
+        level of the tree.
+
+        """
+        operands = self.operands()
+        if operands:
+            import flat
+            return (flat.to_tree, (flat.FlatExpression(self),))
+        return (type(self), (self.label(),))
+
     def __str__(self):
         """Return a human-readable representation of the expression."""
         raise NotImplementedError()
@@ -41,4 +265,3 @@ class Expression(object):
         instance of the expression, but this is not necessary.
         """
         return "Expression()"
-
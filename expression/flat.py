@@ -0,0 +1,138 @@
+"""Provide a compact, array-backed encoding of expression trees.
+
+Even with __slots__, every node of a tree is a separate Python object with
+references to its operands.  A FlatExpression instead stores a whole tree in
+a few typed arrays: one opcode and two operand indices per node, a pool of
+constant values and a list of variable names.  Nodes are stored in postorder,
+so the operands of a node always come before it and the last node is the
+root.  Shared subtrees are stored once, and converting back to a tree
+restores the sharing.
+
+Classes:
+FlatExpression  Array-backed encoding of an expression tree
+
+Functions:
+to_tree         Return the tree a FlatExpression encodes.
+
+"""
+
+from array import array
+from binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp, PowerOp
+from unaryop import LogarithmOp
+from constant import Constant
+from variable import Variable
+
+# Opcodes, in order: the opcode of a class is its index in this tuple.  New
+# classes are added at the end, so that existing opcodes keep their meaning.
+CLASSES = (Constant, Variable, SumOp, DifferenceOp, ProductOp, QuotientOp,
+    PowerOp, LogarithmOp)
+OPCODES = dict((cls, code) for code, cls in enumerate(CLASSES))
+CONSTANT = OPCODES[Constant]
+VARIABLE = OPCODES[Variable]
+
+class FlatExpression(object):
+    """Array-backed encoding of an expression tree.
+
+    For a constant node, first is an index into constants, and for a variable
+    node, first is an index into names.  For other nodes, first and second are
+    the indices of their operands; second is -1 for nodes with one operand.
+
+    Methods:
+        __init__(self, tree)
+            Encode a tree.
+
+        to_tree(self)
+            Return the encoded tree.
+
+        nbytes(self)
+            Return the size of the buffers in bytes.
+
+        __len__(self)
+            Return the number of encoded nodes.
+
+        __getstate__(self), __setstate__(self, state)
+            Support pickling.
+
+    Attributes:
+        opcodes    array of the opcode of every node
+        first      array of the first operand index of every node
+        second     array of the second operand index of every node
+        constants  array of the values of the constants
+        names      list of the names of the variables
+
+    """
+    __slots__ = ('opcodes', 'first', 'second', 'constants', 'names')
+
+    def __init__(self, tree):
+        """Encode tree into the arrays.
+
+        Equal subtrees are only encoded once.
+
+        """
+        self.opcodes = array('B')
+        self.first = array('i')
+        self.second = array('i')
+        self.constants = array('d')
+        self.names = []
+        indices = {}
+        leaves = {}
+        for node in tree.postorder():
+            if node in indices:
+                continue
+            opcode = OPCODES[type(node)]
+            operands = [indices[op] for op in node.operands()]
+            if opcode in (CONSTANT, VARIABLE):
+                pool = self.constants if opcode == CONSTANT else self.names
+                key = (opcode, node.label())
+                if key not in leaves:
+                    leaves[key] = len(pool)
+                    pool.append(node.label())
+                operands = [leaves[key]]
+            operands += [-1] * (2 - len(operands))
+            indices[node] = len(self.opcodes)
+            self.opcodes.append(opcode)
+            self.first.append(operands[0])
+            self.second.append(operands[1])
+
+    def to_tree(self):
+        """Return an expression tree equal to the encoded tree."""
+        nodes = []
+        for opcode, first, second in zip(self.opcodes, self.first,
+                self.second):
+            cls = CLASSES[opcode]
+            if opcode == CONSTANT:
+                nodes.append(cls(self.constants[first]))
+            elif opcode == VARIABLE:
+                nodes.append(cls(self.names[first]))
+            elif second < 0:
+                nodes.append(cls(nodes[first]))
+            else:
+                nodes.append(cls(nodes[first], nodes[second]))
+        return nodes[-1]
+
+    def nbytes(self):
+        """Return the size of the arrays in bytes, names excluded."""
+        return sum(len(buf) * buf.itemsize for buf in
+            (self.opcodes, self.first, self.second, self.constants))
+
+    def __len__(self):
+        """Return the number of encoded nodes."""
+        return len(self.opcodes)
+
+    def __getstate__(self):
+        """Return the arrays and names, for pickle."""
+        return (self.opcodes, self.first, self.second, self.constants,
+            self.names)
+
+    def __setstate__(self, state):
+        """Restore the arrays and names from __getstate__."""
+        (self.opcodes, self.first, self.second, self.constants,
+            self.names) = state
+
+def to_tree(encoded):
+    """Return the tree encoded by encoded, a FlatExpression.
+
+    Expressions are unpickled with this (see Expression.__reduce__).
+
+    """
+    return encoded.to_tree()
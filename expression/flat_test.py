@@ -0,0 +1,83 @@
+"""Tests the FlatExpression class in flat.py.
+
+Test classes:
+Test_FlatExpression
+
+"""
+
+import pickle
+import cPickle
+import nose
+from nose import tools
+import flat
+import interning
+from binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp, PowerOp
+from unaryop import LogarithmOp
+from constant import Constant
+from variable import Variable
+
+class Test_FlatExpression(object):
+    """Test the flat encoding of expression trees.
+
+    Ensure the following works as expected:
+        Trees survive encoding and decoding unchanged
+        Shared subtrees are encoded once, and shared again when decoded
+        Nodes have no __dict__ and can be pickled
+        Very deep trees can be pickled
+
+    """
+    def test_round_trip(self):
+        # Ensure that encoding is lossless.
+        x = Variable('x')
+        values = (
+            Constant(2.5),
+            x,
+            SumOp(x, Constant(1)),
+            DifferenceOp(Constant(0), Variable('y')),
+            QuotientOp(ProductOp(x, x), PowerOp(Constant(2), x)),
+            PowerOp(SumOp(x, Constant(1)), DifferenceOp(x, Constant(1))),
+            LogarithmOp(ProductOp(x, x)),
+        )
+        def run_logic(tree):
+            """Encode and decode tree, and compare."""
+            decoded = flat.FlatExpression(tree).to_tree()
+            tools.eq_(decoded, tree)
+            tools.eq_(repr(decoded), repr(tree))
+
+        for tree in values:
+            yield run_logic, tree
+
+    def test_sharing(self):
+        # Ensure that shared subtrees stay shared.
+        def common():
+            return SumOp(PowerOp(Variable('x'), Constant(2)), Constant(1))
+        tree = QuotientOp(common(), PowerOp(common(), Constant(3)))
+        encoded = flat.FlatExpression(tree)
+        tools.eq_(len(encoded), 8)
+        tools.eq_(len(encoded.constants), 3)
+        decoded = encoded.to_tree()
+        first, second = decoded.operands()
+        tools.ok_(first is second.operands()[0])
+
+    def test_slots(self):
+        # Ensure that nodes are slotted, and can still be pickled.
+        tree = interning.InternTable().intern(
+            SumOp(ProductOp(Variable('x'), Constant(2)), Constant(2)))
+        for node in tree.postorder():
+            tools.ok_(not hasattr(node, '__dict__'))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            tools.eq_(pickle.loads(pickle.dumps(tree, protocol)), tree)
+
+    def test_pickle_deep(self):
+        # Ensure that pickling very deep trees does not recurse.
+        tree = Variable('x')
+        for i in range(5000):
+            tree = SumOp(tree, Constant(i))
+        for module in (pickle, cPickle):
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                copy = module.loads(module.dumps(tree, protocol))
+                tools.eq_(copy, tree)
+                tools.eq_(copy.compile()({'x': 1.0}), 1 + 4999 * 5000 / 2)
+
+if __name__ == '__main__':
+    nose.main()
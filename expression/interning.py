@@ -0,0 +1,66 @@
+"""Share repeated subtrees between and within expression trees.
+
+A function such as (x^2+1)/(x^2+1)^3 is parsed into a tree with two separate,
+but equal, copies of x^2+1.  Interning replaces every subtree by a canonical
+instance, so equal subtrees become one shared node: the tree turns into a
+directed acyclic graph.  This saves memory, and the compiled functions from
+the codegen module compute every shared node only once.
+
+Classes:
+InternTable  Table of canonical instances of expressions
+
+"""
+
+class InternTable(object):
+    """Table of canonical instances of expressions.
+
+    Expressions compare by structure, so the table maps every expression to
+    the first equal expression it saw.  A table can be used for many trees;
+    subtrees are then also shared between those trees.
+
+    Methods:
+        __init__(self)
+            Create an empty table.
+
+        intern(self, tree)
+            Return tree with all subtrees replaced by canonical instances.
+
+        clear(self)
+            Forget all canonical instances.
+
+        __len__(self)
+            Return the number of canonical instances.
+
+    Attributes:
+        _canonical  Dictionary mapping each expression to its canonical
+                    instance.
+
+    """
+    def __init__(self):
+        """Create an empty table."""
+        self._canonical = {}
+
+    def intern(self, tree):
+        """Return a tree equal to tree, built from canonical instances.
+
+        Subtrees are rebuilt only where an operand had to be replaced; the
+        original tree is not modified.
+
+        """
+        replaced = {}
+        for node in tree.postorder():
+            operands = node.operands()
+            new_operands = tuple(replaced[id(op)] for op in operands)
+            new_node = node
+            if any(new is not old for new, old in zip(new_operands, operands)):
+                new_node = type(node)(*new_operands)
+            replaced[id(node)] = self._canonical.setdefault(new_node, new_node)
+        return replaced[id(tree)]
+
+    def clear(self):
+        """Forget all canonical instances."""
+        self._canonical.clear()
+
+    def __len__(self):
+        """Return the number of canonical instances."""
+        return len(self._canonical)
@@ -0,0 +1,84 @@
+"""Tests the classes in interning.py and structural comparison.
+
+Test classes:
+Test_Structure
+Test_InternTable
+
+"""
+
+import nose
+from nose import tools
+import interning
+from binaryop import SumOp, ProductOp, QuotientOp, PowerOp
+from constant import Constant
+from variable import Variable
+
+def _build():
+    """Return a new instance of (x^2+1)/(x^2+1)^3."""
+    def common():
+        return SumOp(PowerOp(Variable('x'), Constant(2)), Constant(1))
+    return QuotientOp(common(), PowerOp(common(), Constant(3)))
+
+class Test_Structure(object):
+    """Test comparing and hashing expressions by structure.
+
+    Ensure the following works as expected:
+        Equal trees compare and hash equal
+        Different trees compare unequal
+
+    """
+    def test_equal(self):
+        # Ensure that separately built equal trees are equal.
+        tools.eq_(_build(), _build())
+        tools.eq_(hash(_build()), hash(_build()))
+        tools.ok_(not _build() != _build())
+
+    def test_unequal(self):
+        # Ensure that trees differing anywhere are unequal.
+        x = Variable('x')
+        values = (
+            (x, Variable('y')),
+            (Constant(1), Constant(2)),
+            (x, Constant(1)),
+            (SumOp(x, Constant(1)), ProductOp(x, Constant(1))),
+            (SumOp(x, Constant(1)), SumOp(Constant(1), x)),
+            (_build(), QuotientOp(SumOp(PowerOp(x, Constant(2)),
+                Constant(1)), PowerOp(x, Constant(3)))),
+        )
+        def run_logic(first, second):
+            """Check that first and second are unequal."""
+            tools.ok_(first != second)
+            tools.ok_(not first == second)
+
+        for first, second in values:
+            yield run_logic, first, second
+
+class Test_InternTable(object):
+    """Test sharing subtrees with the InternTable class.
+
+    Ensure the following works as expected:
+        Equal subtrees become the same object
+        Interned trees are equal to the original
+        Subtrees are shared between trees interned with one table
+
+    """
+    def test_shared_within_tree(self):
+        # Ensure that the repeated x^2+1 becomes one node.
+        tree = interning.InternTable().intern(_build())
+        first, second = tree.operands()
+        tools.ok_(first is second.operands()[0])
+        tools.eq_(tree, _build())
+        tools.eq_(sum(1 for node in tree.postorder()), 8)
+
+    def test_shared_between_trees(self):
+        # Ensure that a table shares nodes between trees.
+        table = interning.InternTable()
+        first = table.intern(_build())
+        second = table.intern(_build())
+        tools.ok_(first is second)
+        tools.eq_(len(table), 8)
+        table.clear()
+        tools.eq_(len(table), 0)
+
+if __name__ == '__main__':
+    nose.main()
@@ -0,0 +1,200 @@
+"""Provide interval arithmetic for bounding expressions over ranges.
+
+An interval is a pair (lo, hi) of float arrays (or single NumPy values).  The
+functions here return an interval that is guaranteed to contain the result
+of the operation for every pair of values from the operand intervals: every
+computed bound is rounded outwards, away from the result, so rounding errors
+can only make the interval wider.  Bounds that are known to be exact, such
+as a zero from multiplying by zero, are not rounded.
+
+Like Expression.evaluate_array, values for which an operation is undefined
+(division by zero, zero to a negative power, a negative number to a
+fractional power, the logarithm of a number that is not positive) are left
+out.  An interval of only undefined values is empty, and is represented with
+NaN bounds.  Unbounded intervals have infinite bounds.
+
+NumPy is only imported when one of the functions is first called.
+
+Functions:
+interval  Return the interval from lo to hi.
+empty     Return whether intervals are empty.
+add       Return the interval of sums.
+subtract  Return the interval of differences.
+multiply  Return the interval of products.
+divide    Return the interval of quotients.
+power     Return the interval of powers.
+log       Return the interval of natural logarithms.
+
+"""
+
+# Powers are not correctly rounded by the C library, so their bounds are
+# moved outwards by this many floats instead of one.
+_POWER_ULPS = 4
+
+def interval(lo, hi=None):
+    """Return the interval from lo to hi, or of the single value lo."""
+    import numpy
+    lo = numpy.asarray(lo, dtype=float)
+    if hi is None:
+        return lo, lo
+    return lo, numpy.asarray(hi, dtype=float)
+
+def empty(first):
+    """Return a boolean array that is true where first is empty."""
+    import numpy
+    return numpy.isnan(first[0])
+
+def _outward(lo, hi, empty, exact_lo=False, exact_hi=False, ulps=1):
+    """Return lo and hi rounded outwards, and NaN where empty.
+
+    Bounds are not rounded where exact_lo or exact_hi is true.  NaN bounds
+    that do not come from empty operands are the result of infinities
+    cancelling out, and become infinite.
+
+    """
+    import numpy
+    lo = numpy.where(numpy.isnan(lo), -numpy.inf, lo)
+    hi = numpy.where(numpy.isnan(hi), numpy.inf, hi)
+    new_lo, new_hi = lo, hi
+    for i in range(ulps):
+        new_lo = numpy.nextafter(new_lo, -numpy.inf)
+        new_hi = numpy.nextafter(new_hi, numpy.inf)
+    lo = numpy.where(exact_lo, lo, new_lo)
+    hi = numpy.where(exact_hi, hi, new_hi)
+    return numpy.where(empty, numpy.nan, lo), numpy.where(empty, numpy.nan, hi)
+
+def add(first, second):
+    """Return the interval of first + second."""
+    import numpy
+    with numpy.errstate(all='ignore'):
+        lo = first[0] + second[0]
+        hi = first[1] + second[1]
+    # A sum of floats is only zero if it is exactly zero.
+    return _outward(lo, hi, empty(first) | empty(second), lo == 0, hi == 0)
+
+def subtract(first, second):
+    """Return the interval of first - second."""
+    import numpy
+    with numpy.errstate(all='ignore'):
+        lo = first[0] - second[1]
+        hi = first[1] - second[0]
+    return _outward(lo, hi, empty(first) | empty(second), lo == 0, hi == 0)
+
+def multiply(first, second):
+    """Return the interval of first * second."""
+    import numpy
+    lo = hi = exact_lo = exact_hi = None
+    with numpy.errstate(all='ignore'):
+        for a in first:
+            for b in second:
+                # Bounds may be infinite, but the values of an interval are
+                # finite, so zero times anything is exactly zero.
+                zero = (a == 0) | (b == 0)
+                product = numpy.where(zero, 0.0, a * b)
+                if lo is None:
+                    lo, hi, exact_lo, exact_hi = product, product, zero, zero
+                    continue
+                exact_lo = numpy.where(product < lo, zero,
+                    numpy.where(product == lo, exact_lo & zero, exact_lo))
+                exact_hi = numpy.where(product > hi, zero,
+                    numpy.where(product == hi, exact_hi & zero, exact_hi))
+                lo = numpy.minimum(lo, product)
+                hi = numpy.maximum(hi, product)
+    return _outward(lo, hi, empty(first) | empty(second), exact_lo, exact_hi)
+
+def _reciprocal(first):
+    """Return the interval of 1 / first."""
+    import numpy
+    lo, hi = first
+    with numpy.errstate(all='ignore'):
+        new_lo = numpy.where(hi == 0, -numpy.inf, 1 / hi)
+        new_hi = numpy.where(lo == 0, numpy.inf, 1 / lo)
+    # If zero is inside the interval, both signs are unbounded.
+    spans = (lo < 0) & (hi > 0)
+    new_lo = numpy.where(spans, -numpy.inf, new_lo)
+    new_hi = numpy.where(spans, numpy.inf, new_hi)
+    # 1 / x is never 0, but gets arbitrarily close for unbounded x.
+    return _outward(new_lo, new_hi, empty(first) | ((lo == 0) & (hi == 0)),
+        numpy.isinf(hi), numpy.isinf(lo))
+
+def divide(first, second):
+    """Return the interval of first / second.
+
+    Division by zero is undefined, so if second contains zero, only the
+    quotients for its other values are included.
+
+    """
+    return multiply(first, _reciprocal(second))
+
+def power(first, second):
+    """Return the interval of first ^ second.
+
+    If second is a single integer, first may have any sign.  Otherwise,
+    only the non-negative values of first are used, as negative numbers to
+    fractional powers are undefined.  If second is not a single value and
+    first has negative values, the interval is unbounded.
+
+    """
+    import numpy
+    lo, hi = first
+    exponent_lo, exponent_hi = second
+    none = empty(first) | empty(second)
+    with numpy.errstate(all='ignore'):
+        integer = ((exponent_lo == exponent_hi) &
+            (numpy.floor(exponent_lo) == exponent_lo))
+        magnitude = numpy.abs(exponent_lo)
+        odd = integer & (numpy.fmod(magnitude, 2) == 1)
+        # Integer powers: x^e for e > 0, and 1 / x^-e for e < 0.
+        small = numpy.where(odd, lo, numpy.where((lo <= 0) & (hi >= 0), 0.0,
+            numpy.minimum(numpy.abs(lo), numpy.abs(hi))))
+        large = numpy.where(odd, hi,
+            numpy.maximum(numpy.abs(lo), numpy.abs(hi)))
+        whole = _outward(numpy.power(small, magnitude),
+            numpy.power(large, magnitude), none,
+            (small == 0) | (small == 1), (large == 0) | (large == 1),
+            _POWER_ULPS)
+        inverse = _reciprocal(whole)
+        whole_lo = numpy.where(exponent_lo > 0, whole[0], inverse[0])
+        whole_hi = numpy.where(exponent_lo > 0, whole[1], inverse[1])
+        whole_lo = numpy.where(exponent_lo == 0, 1.0, whole_lo)
+        whole_hi = numpy.where(exponent_lo == 0, 1.0, whole_hi)
+        # Other powers are only defined for non-negative bases, where they
+        # are monotonic in the base and in the exponent, so the bounds are
+        # at the corners.  0 to a negative power is undefined, but positive
+        # bases close to 0 give arbitrarily large results.
+        base = numpy.maximum(lo, 0.0)
+        corners = [numpy.where((a == 0) & (b < 0), numpy.inf,
+            numpy.power(a, b)) for a in (base, hi)
+            for b in (exponent_lo, exponent_hi)]
+        other_lo = numpy.minimum(numpy.minimum(corners[0], corners[1]),
+            numpy.minimum(corners[2], corners[3]))
+        other_hi = numpy.maximum(numpy.maximum(corners[0], corners[1]),
+            numpy.maximum(corners[2], corners[3]))
+        other_lo, other_hi = _outward(other_lo, other_hi, none,
+            (other_lo == 0) | (other_lo == 1), (other_hi == 0) |
+            (other_hi == 1) | numpy.isinf(other_hi), _POWER_ULPS)
+        unbounded = (exponent_lo != exponent_hi) & (lo < 0)
+        other_lo = numpy.where(unbounded, -numpy.inf, other_lo)
+        other_hi = numpy.where(unbounded, numpy.inf, other_hi)
+        undefined = ~unbounded & ((hi < 0) | ((hi == 0) & (exponent_hi < 0)))
+        result_lo = numpy.where(integer, whole_lo, other_lo)
+        result_hi = numpy.where(integer, whole_hi, other_hi)
+        none |= numpy.where(integer, numpy.isnan(whole_lo), undefined)
+    return (numpy.where(none, numpy.nan, result_lo),
+        numpy.where(none, numpy.nan, result_hi))
+
+def log(first):
+    """Return the interval of the natural logarithm of first.
+
+    Only the positive values of first are used.  Logarithms of positive
+    numbers close to 0 are arbitrarily large negative numbers.
+
+    """
+    import numpy
+    lo, hi = first
+    with numpy.errstate(all='ignore'):
+        new_lo = numpy.where(lo > 0, numpy.log(lo), -numpy.inf)
+        new_hi = numpy.log(hi)
+    # Like powers, logarithms are not correctly rounded.
+    return _outward(new_lo, new_hi, empty(first) | ~(hi > 0),
+        (new_lo == 0) | numpy.isinf(new_lo), new_hi == 0, _POWER_ULPS)
@@ -0,0 +1,153 @@
+"""Tests the functions in interval.py and Expression.evaluate_interval.
+
+Test classes:
+Test_Interval
+
+"""
+
+import nose
+from nose import tools
+import numpy
+import interval
+from binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp, PowerOp
+from constant import Constant
+from variable import Variable
+
+def contains(outer, values):
+    """Return whether the interval outer contains all values that are not NaN.
+
+    outer holds one interval per row of values.
+
+    """
+    lo, hi = outer
+    defined = ~numpy.isnan(values)
+    with numpy.errstate(invalid='ignore'):
+        return (((numpy.reshape(lo, (-1, 1)) <= values) | ~defined).all() and
+            ((values <= numpy.reshape(hi, (-1, 1))) | ~defined).all())
+
+class Test_Interval(object):
+    """Test bounding expressions with intervals.
+
+    Ensure the following works as expected:
+        Enclosures contain the values of evaluate_array
+        Bounds are rounded outwards
+        Division by intervals that contain zero
+        Integer powers of intervals of any sign
+        Fractional powers of negative intervals
+        Very deep trees can be enclosed
+
+    """
+    def test_enclosure(self):
+        # Ensure that values sampled within bounds lie in the interval.
+        x = Variable('x')
+        values = (
+            Constant(3.5),
+            x,
+            SumOp(x, Constant(2)),
+            DifferenceOp(Constant(0.1), x),
+            ProductOp(x, SumOp(x, Constant(1))),
+            QuotientOp(Constant(1), x),
+            QuotientOp(SumOp(x, Constant(1)), DifferenceOp(x, Constant(1))),
+            PowerOp(x, Constant(2)),
+            PowerOp(x, Constant(3)),
+            PowerOp(x, Constant(-2)),
+            PowerOp(x, Constant(0.5)),
+            PowerOp(Constant(2), x),
+            PowerOp(x, x),
+            PowerOp(SumOp(ProductOp(x, x), Constant(1)), Constant(-0.5)),
+        )
+        random = numpy.random.RandomState(0)
+        lo = random.uniform(-3, 3, 200)
+        hi = lo + random.exponential(1, 200)
+        # Ranges touching zero and single points.
+        lo[:4] = hi[4:8] = 0
+        lo[4:8] = -1
+        hi[8:12] = lo[8:12]
+        samples = numpy.minimum(lo[:, None] + (hi - lo)[:, None] *
+            numpy.linspace(0, 1, 33), hi[:, None])
+        def enclosure_logic(tree):
+            """Compare the interval with sampled values."""
+            with numpy.errstate(all='ignore'):
+                exact = tree.evaluate_array({'x': samples})
+            exact = numpy.where(numpy.isinf(exact), numpy.nan,
+                exact * numpy.ones(samples.shape))
+            bounds = tree.evaluate_interval({'x': (lo, hi)})
+            tools.ok_(contains(bounds, exact))
+            # Intervals are only empty if no value is defined.
+            empty = numpy.isnan(bounds[0]) * numpy.ones(len(lo), dtype=bool)
+            tools.ok_(numpy.isnan(exact[empty]).all())
+
+        for tree in values:
+            yield enclosure_logic, tree
+
+    def test_rounding(self):
+        # Ensure that bounds are rounded outwards, but not exact zeros.
+        lo, hi = interval.add(interval.interval(0.1), interval.interval(0.2))
+        tools.ok_(lo < 0.1 + 0.2 < hi)
+        lo, hi = interval.multiply(interval.interval(0.0, 1.0),
+            interval.interval(3.0))
+        tools.eq_(lo, 0.0)
+        tools.ok_(3.0 < hi)
+        lo, hi = interval.subtract(interval.interval(1.0),
+            interval.interval(1.0))
+        tools.eq_((lo, hi), (0.0, 0.0))
+
+    def test_division(self):
+        # Ensure that division by intervals containing zero leaves it out.
+        one = interval.interval(1.0)
+        tools.eq_(interval.divide(one, interval.interval(-1.0, 2.0)),
+            (-numpy.inf, numpy.inf))
+        lo, hi = interval.divide(one, interval.interval(0.0, 2.0))
+        tools.ok_(lo <= 0.5 and 0.5 - lo < 1e-15)
+        tools.eq_(hi, numpy.inf)
+        lo, hi = interval.divide(one, interval.interval(-2.0, 0.0))
+        tools.eq_(lo, -numpy.inf)
+        tools.ok_(hi >= -0.5 and hi + 0.5 < 1e-15)
+        tools.ok_(interval.empty(interval.divide(one,
+            interval.interval(0.0))))
+
+    def test_integer_power(self):
+        # Ensure that integer powers of intervals of any sign are tight.
+        base = interval.interval(-2.0, 3.0)
+        def power_logic(exponent, lo, hi):
+            """Compare the power with the expected bounds."""
+            result = interval.power(base, interval.interval(exponent))
+            numpy.testing.assert_allclose(result, (lo, hi), rtol=1e-14)
+            tools.ok_(result[0] <= lo and hi <= result[1])
+
+        for exponent, lo, hi in ((2, 0, 9), (3, -8, 27), (0, 1, 1),
+                (-1, -numpy.inf, numpy.inf)):
+            yield power_logic, exponent, lo, hi
+        lo, hi = interval.power(interval.interval(0.0, 2.0),
+            interval.interval(-2.0))
+        tools.ok_(lo <= 0.25 and 0.25 - lo < 1e-15)
+        tools.eq_(hi, numpy.inf)
+
+    def test_fractional_power(self):
+        # Ensure that negative bases of fractional powers are left out.
+        half = interval.interval(0.5)
+        tools.ok_(interval.empty(interval.power(interval.interval(-2.0, -1.0),
+            half)))
+        lo, hi = interval.power(interval.interval(-4.0, 4.0), half)
+        tools.eq_(lo, 0.0)
+        tools.ok_(2.0 <= hi < 2.0 + 1e-14)
+        lo, hi = interval.power(interval.interval(0.0, 4.0),
+            interval.interval(-0.5))
+        tools.ok_(lo <= 0.5 and 0.5 - lo < 1e-14)
+        tools.eq_(hi, numpy.inf)
+        # A negative base to a range of exponents may be any number.
+        tools.eq_(interval.power(interval.interval(-1.0, 1.0),
+            interval.interval(1.0, 2.0)), (-numpy.inf, numpy.inf))
+
+    def test_deep_tree(self):
+        # Ensure that enclosing does not recurse.
+        x = Variable('x')
+        tree = x
+        for i in range(10000):
+            tree = SumOp(tree, x)
+        lo, hi = tree.evaluate_interval({'x': (1.0, 2.0)})
+        tools.ok_(lo <= 10001 and hi >= 20002)
+        tools.ok_(hi - lo < 10002)
+
+if __name__ == '__main__':
+    nose.main()
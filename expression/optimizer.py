@@ -0,0 +1,106 @@
+"""Simplify expression trees before they are evaluated.
+
+The parser builds trees exactly as they were typed, so constant subtrees such
+as 2*3^2 and identities such as x*1 would be computed again for every sample.
+The simplifier folds and removes them.  A simplified tree always evaluates to
+the same value as the original, so no rule is applied that could change the
+result for some values (x*0 is not 0 when x is infinite, for example).
+
+Unary minus is represented as 0 - x.  Such negations are merged into the
+surrounding sum or difference where possible, and negations of both operands
+of a product or quotient cancel.
+
+Functions:
+simplify    Return a simplified tree and the number of nodes removed.
+size        Return the number of nodes in a tree.
+
+"""
+
+from binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp, PowerOp
+from constant import Constant
+
+def size(tree):
+    """Return the number of nodes in tree."""
+    return sum(1 for node in tree.postorder())
+
+def simplify(tree):
+    """Return a simplified version of tree, and the number of nodes removed.
+
+    The original tree is not modified; unchanged subtrees are shared between
+    the original and the simplified tree.
+
+    """
+    simplified = {}
+    for node in tree.postorder():
+        if id(node) in simplified:
+            continue
+        operands = node.operands()
+        if not operands:
+            simplified[id(node)] = node
+            continue
+        new_operands = tuple(simplified[id(op)] for op in operands)
+        simplified[id(node)] = _simplify_node(node, new_operands)
+    result = simplified[id(tree)]
+    return result, size(tree) - size(result)
+
+def _is_constant(node, value=None):
+    """Return whether node is a constant, with the given value if any."""
+    if not isinstance(node, Constant):
+        return False
+    return value is None or node.evaluate({}) == value
+
+def _negated(node):
+    """Return x if node is 0 - x, otherwise None."""
+    if isinstance(node, DifferenceOp):
+        first, second = node.operands()
+        if _is_constant(first, 0):
+            return second
+    return None
+
+def _simplify_node(node, operands):
+    """Return a simplified replacement for node.
+
+    The operands of node have already been simplified and are passed in as
+    operands.
+
+    """
+    if all(_is_constant(operand) for operand in operands):
+        try:
+            return Constant(type(node)(*operands).evaluate({}))
+        except (ArithmeticError, ValueError, TypeError):
+            # Leave it, so that the error is raised when evaluating.
+            pass
+    if len(operands) == 1:
+        if operands == node.operands():
+            return node
+        return type(node)(*operands)
+    first, second = operands
+    if isinstance(node, SumOp):
+        if _is_constant(first, 0):
+            return second
+        if _is_constant(second, 0):
+            return first
+        if _negated(second) is not None:
+            return DifferenceOp(first, _negated(second))
+        if _negated(first) is not None:
+            return DifferenceOp(second, _negated(first))
+    elif isinstance(node, DifferenceOp):
+        if _is_constant(second, 0):
+            return first
+        if _negated(second) is not None:
+            if _is_constant(first, 0):
+                return _negated(second)
+            return SumOp(first, _negated(second))
+    elif isinstance(node, (ProductOp, QuotientOp)):
+        if _is_constant(second, 1):
+            return first
+        if isinstance(node, ProductOp) and _is_constant(first, 1):
+            return second
+        if _negated(first) is not None and _negated(second) is not None:
+            return type(node)(_negated(first), _negated(second))
+    elif isinstance(node, PowerOp):
+        if _is_constant(second, 1):
+            return first
+    if operands == node.operands():
+        return node
+    return type(node)(first, second)
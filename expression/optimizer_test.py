@@ -0,0 +1,80 @@
+"""Tests the functions in optimizer.py.
+
+Test classes:
+Test_Simplify
+
+"""
+
+import nose
+from nose import tools
+import optimizer
+from binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp, PowerOp
+from constant import Constant
+from variable import Variable
+
+class Test_Simplify(object):
+    """Test simplifying expression trees.
+
+    Ensure the following works as expected:
+        Constants are folded and identities removed
+        Unary minus is merged into the surrounding operators
+        Simplified trees evaluate to the same values
+        Errors in constant subtrees are kept for evaluation
+
+    """
+    def test_simplify(self):
+        # Ensure that the simplified trees are as expected.
+        x = Variable('x')
+        y = Variable('y')
+        def neg(e):
+            return DifferenceOp(Constant(0), e)
+
+        # Tuple of tuples.  Each tuple has an input tree, the expected output
+        # as from repr(), and the number of nodes removed.
+        values = (
+            (x, "Variable('x')", 0),
+            (ProductOp(Constant(2), PowerOp(Constant(3), Constant(2))),
+                "Constant(18.0)", 4),
+            (neg(Constant(3)), "Constant(-3.0)", 2),
+            (DifferenceOp(Constant(0), Constant(0)), "Constant(0.0)", 2),
+            (ProductOp(x, Constant(1)), "Variable('x')", 2),
+            (ProductOp(Constant(1), x), "Variable('x')", 2),
+            (QuotientOp(x, Constant(1)), "Variable('x')", 2),
+            (SumOp(Constant(0), x), "Variable('x')", 2),
+            (DifferenceOp(x, Constant(0)), "Variable('x')", 2),
+            (PowerOp(x, SumOp(Constant(0.5), Constant(0.5))),
+                "Variable('x')", 4),
+            (SumOp(x, neg(y)), "DifferenceOp(Variable('x'), Variable('y'))",
+                2),
+            (SumOp(neg(y), x), "DifferenceOp(Variable('x'), Variable('y'))",
+                2),
+            (DifferenceOp(x, neg(y)), "SumOp(Variable('x'), Variable('y'))",
+                2),
+            (neg(neg(x)), "Variable('x')", 4),
+            (ProductOp(neg(x), neg(y)),
+                "ProductOp(Variable('x'), Variable('y'))", 4),
+            (ProductOp(x, Constant(0)),
+                "ProductOp(Variable('x'), Constant(0.0))", 0),
+        )
+        def run_logic(tree, outval, removed):
+            """Simplify tree, and check the output and the removed count."""
+            simplified, count = optimizer.simplify(tree)
+            tools.eq_(repr(simplified), outval)
+            tools.eq_(count, removed)
+            for x_value in (-2.5, 0.0, 3.0):
+                variables = {'x': x_value, 'y': 1.5}
+                tools.eq_(simplified.evaluate(variables),
+                    tree.evaluate(variables))
+
+        for tree, o, r in values:
+            yield run_logic, tree, o, r
+
+    def test_errors_kept(self):
+        # Ensure that constant subtrees that cannot be computed are kept.
+        tree = SumOp(Variable('x'), QuotientOp(Constant(1), Constant(0)))
+        simplified, count = optimizer.simplify(tree)
+        tools.eq_(count, 0)
+        tools.assert_raises(ZeroDivisionError, simplified.evaluate, {'x': 1})
+
+if __name__ == '__main__':
+    nose.main()
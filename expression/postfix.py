@@ -0,0 +1,159 @@
+"""Evaluate expression trees with a non-recursive stack machine.
+
+Expression.evaluate recurses once per level of the tree, so it fails with a
+RuntimeError for deeply nested input, such as long chains of sums (which nest
+to the left) or many parentheses.  A Program is the tree lowered to a postfix
+(reverse Polish) list of instructions, which a simple loop executes with an
+explicit stack.  Neither lowering nor executing recurses, so trees of any
+depth can be evaluated.
+
+Shared subtrees (see the interning module) are computed once: their value is
+stored in a slot the first time, and loaded from it afterwards.
+
+Classes:
+Program  Postfix program computing the value of a tree
+
+"""
+
+import math
+import operator
+import arrayops
+import flat
+
+# Instructions that are not node opcodes from the flat module.
+STORE = len(flat.CLASSES)
+LOAD = STORE + 1
+
+# Divide like the / operator does, which differs for ints in Python 2.
+_divide = getattr(operator, 'div', operator.truediv)
+
+_SCALAR_OPERATIONS = {
+    flat.OPCODES[flat.SumOp]: operator.add,
+    flat.OPCODES[flat.DifferenceOp]: operator.sub,
+    flat.OPCODES[flat.ProductOp]: operator.mul,
+    flat.OPCODES[flat.QuotientOp]: _divide,
+    flat.OPCODES[flat.PowerOp]: operator.pow,
+    flat.OPCODES[flat.LogarithmOp]: math.log,
+}
+
+_ARRAY_OPERATIONS = dict(_SCALAR_OPERATIONS)
+_ARRAY_OPERATIONS.update({
+    flat.OPCODES[flat.QuotientOp]: arrayops.divide,
+    flat.OPCODES[flat.PowerOp]: arrayops.power,
+    flat.OPCODES[flat.LogarithmOp]: arrayops.log,
+})
+
+# Opcodes of operators with one operand; all others have two.
+_UNARY = frozenset([flat.OPCODES[flat.LogarithmOp]])
+
+def _unchanged(value):
+    """Return value."""
+    return value
+
+class Program(object):
+    """Postfix program computing the value of an expression tree.
+
+    Every instruction is an opcode with an argument.  Constants push their
+    value (the argument), variables push the value of the variable named by
+    the argument, and operators pop their operands and push their result.
+    STORE copies the top of the stack into the slot given by the argument,
+    and LOAD pushes the value of a slot.
+
+    Methods:
+        __init__(self, tree)
+            Lower tree to a program.
+
+        run(self, variables)
+            Return the value of the tree, like Expression.evaluate.
+
+        run_array(self, variables)
+            Return the values of the tree, like Expression.evaluate_array.
+
+        __len__(self)
+            Return the number of instructions.
+
+    Attributes:
+        instructions  list of (opcode, argument) pairs
+        slots         number of slots used for shared subtrees
+
+    """
+    def __init__(self, tree):
+        """Lower tree to a postfix program."""
+        uses = {}
+        for node in tree.postorder():
+            for operand in node.operands():
+                uses[id(operand)] = uses.get(id(operand), 0) + 1
+        self.instructions = []
+        slots = {}
+        stack = [(tree, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in slots:
+                self._emit(LOAD, slots[id(node)])
+            elif expanded or not node.operands():
+                opcode = flat.OPCODES[type(node)]
+                if opcode in (flat.CONSTANT, flat.VARIABLE):
+                    self._emit(opcode, node.label())
+                else:
+                    self._emit(opcode, None)
+                if uses.get(id(node), 0) > 1:
+                    slots[id(node)] = len(slots)
+                    self._emit(STORE, slots[id(node)])
+            else:
+                stack.append((node, True))
+                for operand in reversed(node.operands()):
+                    stack.append((operand, False))
+        self.slots = len(slots)
+
+    def _emit(self, opcode, argument):
+        """Append an instruction."""
+        self.instructions.append((opcode, argument))
+
+    def run(self, variables):
+        """Return the value of the tree for the given variables.
+
+        The result and any exceptions raised are those of
+        Expression.evaluate.
+
+        """
+        return self._run(variables, _SCALAR_OPERATIONS, _unchanged)
+
+    def run_array(self, variables):
+        """Return the values of the tree for arrays of variable values.
+
+        The result is that of Expression.evaluate_array: undefined samples
+        are NaN.
+
+        """
+        return arrayops.asarray(self._run(variables, _ARRAY_OPERATIONS,
+            arrayops.asarray))
+
+    def _run(self, variables, operations, convert):
+        """Execute the program, using operations for the operators.
+
+        Variable values are passed through convert before being pushed.
+
+        """
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        slots = [None] * self.slots
+        for opcode, argument in self.instructions:
+            if opcode == flat.CONSTANT:
+                push(argument)
+            elif opcode == flat.VARIABLE:
+                push(convert(variables[argument]))
+            elif opcode == STORE:
+                slots[argument] = stack[-1]
+            elif opcode == LOAD:
+                push(slots[argument])
+            elif opcode in _UNARY:
+                push(operations[opcode](pop()))
+            else:
+                second = pop()
+                push(operations[opcode](pop(), second))
+        return stack[0]
+
+    def __len__(self):
+        """Return the number of instructions."""
+        return len(self.instructions)
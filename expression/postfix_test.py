@@ -0,0 +1,84 @@
+"""Tests the Program class in postfix.py.
+
+Test classes:
+Test_Program
+
+"""
+
+import nose
+from nose import tools
+import numpy
+import postfix
+import interning
+from binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp, PowerOp
+from unaryop import LogarithmOp
+from constant import Constant
+from variable import Variable
+
+class Test_Program(object):
+    """Test lowering trees to postfix programs and running them.
+
+    Ensure the following works as expected:
+        Programs compute the same values as evaluate and evaluate_array
+        Shared subtrees are computed once
+        Very deep trees can be lowered and run
+
+    """
+    def test_same_result(self):
+        # Ensure that programs compute what evaluate computes.
+        x = Variable('x')
+        values = (
+            Constant(3.5),
+            x,
+            SumOp(x, Constant(2)),
+            DifferenceOp(Constant(0), x),
+            ProductOp(x, SumOp(x, Constant(1))),
+            QuotientOp(Constant(1), PowerOp(x, Constant(3))),
+            PowerOp(Constant(2), DifferenceOp(x, Variable('y'))),
+            LogarithmOp(PowerOp(x, Constant(2))),
+        )
+        samples = numpy.array([-2.0, 0.5, 1.0, 7.25])
+        def run_logic(tree):
+            """Compare the program with evaluate and evaluate_array."""
+            program = postfix.Program(tree)
+            for sample in samples:
+                variables = {'x': sample, 'y': 1.5}
+                tools.eq_(program.run(variables), tree.evaluate(variables))
+            variables = {'x': samples, 'y': 1.5}
+            numpy.testing.assert_array_equal(program.run_array(variables),
+                tree.evaluate_array(variables))
+
+        for tree in values:
+            yield run_logic, tree
+
+    def test_errors(self):
+        # Ensure that scalar errors are raised, and array errors are NaN.
+        program = postfix.Program(QuotientOp(Constant(1), Variable('x')))
+        tools.assert_raises(ZeroDivisionError, program.run, {'x': 0.0})
+        numpy.testing.assert_array_equal(
+            program.run_array({'x': numpy.array([0.0, 2.0])}),
+            [numpy.nan, 0.5])
+
+    def test_shared(self):
+        # Ensure that a shared subtree is computed once.
+        def common():
+            return SumOp(PowerOp(Variable('x'), Constant(2)), Constant(1))
+        tree = interning.InternTable().intern(
+            QuotientOp(common(), PowerOp(common(), Constant(3))))
+        program = postfix.Program(tree)
+        opcodes = [opcode for opcode, argument in program.instructions]
+        tools.eq_(opcodes.count(postfix.flat.OPCODES[SumOp]), 1)
+        tools.eq_(program.run({'x': 2.0}), tree.evaluate({'x': 2.0}))
+
+    def test_deep_tree(self):
+        # Ensure that trees with 100000 levels work.
+        tree = Variable('x')
+        for i in range(50000):
+            tree = DifferenceOp(Constant(0), SumOp(tree, Constant(1)))
+        program = postfix.Program(tree)
+        tools.eq_(program.run({'x': 1.0}), 1.0)
+        tools.eq_(program.run_array({'x': numpy.zeros(3)}).tolist(),
+            [0.0] * 3)
+
+if __name__ == '__main__':
+    nose.main()
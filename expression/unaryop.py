@@ -0,0 +1,157 @@
+"""Provide classes for unary operations.
+
+The parser does not produce these, but other expressions can contain them,
+such as derivatives (see the calculus module).
+
+Classes:
+UnaryOp       Base class for unary operators
+LogarithmOp   Class for natural logarithm expressions
+
+"""
+
+import math
+import expression
+import arrayops
+import interval
+
+class UnaryOp(expression.Expression):
+    """Represent an expression with a unary operator.
+
+    The operand is contained within this expression.  This is a base class:
+    evaluate(self, variables) should be overloaded.
+
+    Methods:
+        __init__(self, operand)
+            Initialise the attributes.
+
+        evaluate(self, variables) [inherited]
+            Evaluate this expression.
+
+        operands(self)
+            Return a tuple of the operand.
+
+        label(self)
+            Return the operator name.
+
+        evaluate_array(self, variables) [inherited]
+            Evaluate this expression for arrays of values.
+
+        evaluate_interval(self, bounds) [inherited]
+            Return bounds on the values of this expression over ranges.
+
+        enclose(self, intervals, bounds) [inherited]
+            Return bounds on this node from those on its operands.
+
+        source(self, operands, array=False) [inherited]
+            Return a Python expression computing this expression.
+
+        differentiate(self, variable, derivatives) [inherited]
+            Return the derivative of this expression.
+
+        __str__(self)
+            Return a human-readable string representing this expression.
+
+        __repr__(self)
+            Return a technical string representing this expression.
+
+    Attributes:
+        _operand   The expression the operator is applied to.
+        _operator  The name of the operator (class attribute).
+        _hash      The structural hash of the expression.
+
+    """
+    __slots__ = ('_operand',)
+    _operator = None
+
+    def __init__(self, operand):
+        """Initialise the attributes.
+
+        Parameters:
+        operand   the subexpression
+
+        """
+        self._operand = operand
+        self._hash = hash((type(self), operand._hash))
+
+    def operands(self):
+        """Return a tuple of the operand."""
+        return (self._operand,)
+
+    def label(self):
+        """Return the name of the operator."""
+        return self._operator
+
+    def __str__(self):
+        """Return a human-readable string representation of this expression.
+
+        This is the name of the operator followed by the operand in
+        parentheses.
+
+        """
+        return "".join([self._operator, '(', str(self._operand), ')'])
+
+    def __repr__(self):
+        """Return a technical string representing this expression."""
+        return "UnaryOp({0}, {1!r})".format(self._operator, self._operand)
+
+
+class LogarithmOp(UnaryOp):
+    """Represent the natural logarithm of an expression.
+
+    For details, see the UnaryOp docstring.
+
+    Important differences:
+
+    Methods:
+        evaluate(self, variables)
+            Return the logarithm of the operand.
+
+        evaluate_array(self, variables)
+            Return the logarithm of the operand for arrays of values.
+
+        enclose(self, intervals, bounds)
+            Return bounds on the logarithm from those on the operand.
+
+        source(self, operands, array=False)
+            Return a Python expression computing the logarithm.
+
+        differentiate(self, variable, derivatives)
+            Return the derivative of the logarithm.
+
+    """
+    __slots__ = ()
+    _operator = "ln"
+
+    def evaluate(self, variables):
+        """Return the logarithm of the operand.
+
+        A ValueError is raised if the operand is not positive.
+
+        """
+        return math.log(self._operand.evaluate(variables))
+
+    def evaluate_array(self, variables):
+        """Return the logarithm of the operand for arrays of values.
+
+        Samples where the operand is not positive are NaN.
+
+        """
+        return arrayops.log(self._operand.evaluate_array(variables))
+
+    def enclose(self, intervals, bounds):
+        """Return bounds on the logarithm from those on the operand."""
+        return interval.log(*intervals)
+
+    def source(self, operands, array=False):
+        """Return a Python expression computing the logarithm."""
+        if array:
+            return "log({0})".format(*operands)
+        return "math.log({0})".format(*operands)
+
+    def differentiate(self, variable, derivatives):
+        """Return the derivative of the operand divided by the operand."""
+        import calculus
+        return calculus.divide(derivatives[0], self._operand)
+
+    def __repr__(self):
+        return "LogarithmOp({0!r})".format(self._operand)
@@ -0,0 +1,65 @@
+"""Tests the classes in unaryop.py.
+
+Test classes:
+Test_LogarithmOp
+
+"""
+
+import math
+import nose
+from nose import tools
+import numpy
+from unaryop import LogarithmOp
+from binaryop import SumOp
+from constant import Constant
+from variable import Variable
+
+class Test_LogarithmOp(object):
+    """Test the LogarithmOp class.
+
+    Ensure the following works as expected:
+        Array and compiled results match evaluate for every sample
+        Logarithms of numbers that are not positive are errors or NaN
+        Intervals contain the logarithms of their values
+        Strings show the operator and operand
+
+    """
+    def test_matches_evaluate(self):
+        # Ensure that every sample matches the scalar result.
+        tree = LogarithmOp(SumOp(Variable('x'), Constant(4)))
+        samples = numpy.linspace(-3, 3, 13)
+        result = tree.evaluate_array({'x': samples})
+        for sample, value in zip(samples, result):
+            tools.eq_(value, tree.evaluate({'x': sample}))
+        tools.ok_(numpy.array_equal(tree.compile(array=True)(
+            {'x': samples}), result))
+        tools.eq_(tree.compile()({'x': 1.5}), math.log(5.5))
+
+    def test_undefined(self):
+        # Ensure that the logarithm of 0 and of negative numbers is refused.
+        tree = LogarithmOp(Variable('x'))
+        tools.assert_raises(ValueError, tree.evaluate, {'x': 0.0})
+        tools.assert_raises(ValueError, tree.compile(), {'x': -1.0})
+        numpy.testing.assert_array_equal(tree.evaluate_array(
+            {'x': numpy.array([-1.0, 0.0, 1.0])}), [numpy.nan, numpy.nan, 0])
+
+    def test_interval(self):
+        # Ensure that only the positive part of an interval is used.
+        tree = LogarithmOp(Variable('x'))
+        lo, hi = tree.evaluate_interval({'x': (-1.0, math.e)})
+        tools.eq_(lo, -numpy.inf)
+        tools.ok_(1 <= hi < 1 + 1e-14)
+        lo, hi = tree.evaluate_interval({'x': (1.0, 2.0)})
+        tools.eq_(lo, 0)
+        tools.ok_(math.log(2) <= hi)
+        lo, hi = tree.evaluate_interval({'x': (-2.0, 0.0)})
+        tools.ok_(numpy.isnan(lo) and numpy.isnan(hi))
+
+    def test_str(self):
+        # Ensure that the operand is shown in parentheses.
+        tree = LogarithmOp(Variable('x'))
+        tools.eq_(str(tree), "ln(x)")
+        tools.eq_(repr(tree), "LogarithmOp(Variable('x'))")
+
+if __name__ == '__main__':
+    nose.main()
@@ -6,6 +6,9 @@ Constant        Class for constants
 """
 
 import expression
+import arrayops
+import interval
+from constant import Constant
 
 class Variable(expression.Expression):
     """Represent an expression that is a variable.
@@ -17,6 +20,24 @@ class Variable(expression.Expression):
         evaluate(self) 
             Evaluate this expression.
 
+        operands(self)
+            Return an empty tuple; variables have no subexpressions.
+
+        evaluate_array(self, variables)
+            Evaluate this expression for arrays of values.
+
+        enclose(self, intervals, bounds)
+            Return the bounds of the variable as an interval.
+
+        label(self)
+            Return the name of the variable.
+
+        source(self, operands, array=False)
+            Return a Python expression looking up the variable.
+
+        differentiate(self, variable, derivatives)
+            Return the constant 1 or 0.
+
         __str__(self)
             Return a human-readable string representing this expression.
             
@@ -25,15 +46,45 @@ class Variable(expression.Expression):
 
     Attributes:
         _name  The name used to represent this variable (usually 'x').
+        _hash  The structural hash of the variable.
 
     """
+    __slots__ = ('_name',)
+
     def __init__(self, name):
         """Initialise the attributes."""
         self._name = name
+        self._hash = hash((Variable, name))
 
     def evaluate(self, variables):
         """Return the value of this variable."""
-        variables[self._name]
+        return variables[self._name]
+
+    def evaluate_array(self, variables):
+        """Return the values of this variable as a float array."""
+        return arrayops.asarray(variables[self._name])
+
+    def enclose(self, intervals, bounds):
+        """Return the bounds of this variable as an interval."""
+        return interval.interval(*bounds[self._name])
+
+    def operands(self):
+        """Return an empty tuple, as a variable has no subexpressions."""
+        return ()
+
+    def label(self):
+        """Return the name of the variable."""
+        return self._name
+
+    def source(self, operands, array=False):
+        """Return a Python expression looking the variable up in variables."""
+        if array:
+            return "asarray(variables[{0!r}])".format(self._name)
+        return "variables[{0!r}]".format(self._name)
+
+    def differentiate(self, variable, derivatives):
+        """Return 1 if this is variable, and 0 otherwise."""
+        return Constant(1 if self._name == variable else 0)
 
     def __str__(self):
         """Return a human-readable string representing of this expression.
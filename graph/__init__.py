@@ -4,7 +4,23 @@ Classes:
 Canvas   Canvas for graphs to be drawn on.
 Graph    A graph on the Canvas.
 
-"""
+Modules:
+viewport  The visible part of the plane
+sampler   Sample functions into arrays of points for plotting
+adaptive  Sample functions adaptively, with a bounded error in pixels
+tiles     Cache sampled functions in tiles, for panning and zooming
+decimate  Reduce curves to the points that can be told apart on screen
+pipeline  Turn plot requests into curves, dropping stale requests
+canvas    The widget graphs are drawn on
+axes      Choose the gridlines of a plot and their labels
+group     Sample several functions over one shared array of x values
+raster    Draw plots into arrays of pixels, without Qt
+export    Save plots as PNG or SVG files, without Qt
+analysis  Find the roots and extrema of functions over a plot
+quadrature  Integrate functions over the x range of a plot
 
-__all__ = []
+"""
 
+__all__ = ['viewport', 'sampler', 'adaptive', 'tiles',
+    'decimate', 'pipeline', 'canvas', 'axes', 'group',
+    'raster', 'export', 'analysis', 'quadrature']
@@ -0,0 +1,177 @@
+"""Sample functions adaptively, with a bounded error in pixels.
+
+Evenly spaced samples are wasted where a function is nearly straight, and
+still too far apart where it bends sharply (x^50 near 1) or has a pole (1/x
+near 0).  An AdaptiveSampler starts from a coarse grid and keeps halving
+the intervals whose chord is further than a tolerance from the function, as
+measured halfway along them in pixels of the plot (at right angles to the
+chord, so that steep lines are not refined needlessly).  Intervals with very
+steep chords are halved as well, as they may cross a pole or a jump.  All
+intervals of one halving are evaluated in a single NumPy call.
+
+An interval is not halved further once it is narrower than a fraction of a
+pixel.  Where it still fails the tests, the function may have a pole or a
+jump there, or become undefined.  Only those intervals are checked for a
+discontinuity, and the curve is split there (see Sampler.break_at).
+
+Before an interval is halved, the tree can be bounded over it with interval
+arithmetic (see Expression.evaluate_interval).  If the bounds show that the
+function stays above or below the viewport, or that its visible part fits
+within the tolerance, the interval is not refined.  This proves what the
+samples can only suggest, and saves the evaluations of steep functions
+outside the viewport (x^50 or 2^x far from the origin).  But bounding a
+tree walks it node by node, and costs more than the compiled evaluations it
+saves for the trees typed into a plot, so it is only done on request.
+
+Classes:
+AdaptiveSampler  Sample an expression tree with error-bounded refinement
+
+"""
+
+import numpy
+import sampler
+
+# Default size of the plot in pixels.
+WIDTH = 800
+HEIGHT = 600
+
+# Default largest distance between the curve and the function, in pixels.
+TOLERANCE = 0.5
+
+# Pixels between the samples of the initial grid.
+SPACING = 32
+
+# Intervals are not halved once narrower than this fraction of a pixel.
+RESOLUTION = 0.25
+
+# The number of halvings of such an interval when checking it for a pole or
+# a jump.  Fewer are needed than after uniform sampling, as the interval is
+# already narrow.
+BISECTIONS = 8
+
+class AdaptiveSampler(sampler.Sampler):
+    """Sample an expression tree with error-bounded refinement.
+
+    Methods:
+        __init__(self, tree, variable='x', budget=sampler.BUDGET)
+            Compile tree.
+
+        sample(self, viewport, width=WIDTH, height=HEIGHT,
+                tolerance=TOLERANCE, intervals=False)
+            Return the Curve of the tree in viewport.
+
+        settled(self, x0, x1, viewport, tolerance)
+            Return which intervals provably need no refinement.
+
+    Attributes:
+        enclosures  The number of x intervals the tree was bounded over.
+
+    See Sampler for the other methods and attributes.
+
+    """
+    def __init__(self, tree, variable='x', budget=sampler.BUDGET):
+        """Compile tree, which may only use variable.  See Sampler."""
+        sampler.Sampler.__init__(self, tree, variable, budget)
+        self.enclosures = 0
+
+    def sample(self, viewport, width=WIDTH, height=HEIGHT,
+            tolerance=TOLERANCE, intervals=False):
+        """Return the Curve of the tree in viewport, plotted at width x height.
+
+        Intervals are halved until the function is within tolerance pixels
+        of their chord halfway along them.  Intervals entirely above or below
+        viewport are not refined, nor, if intervals is true, those for
+        which settled is true.  Once the budget is used up, the intervals
+        with the largest errors are refined first.
+
+        """
+        scale = height / viewport.height()
+        aspect = scale * viewport.width() / width
+        smallest = viewport.width() / width * RESOLUTION
+        count = min(max(2, int(width) // SPACING + 1), self.capacity)
+        x = numpy.linspace(viewport.x_min, viewport.x_max, count)
+        y = self.evaluate(x)
+        xs = [x]
+        ys = [y]
+        # Starts of the intervals that failed, but are too narrow to be
+        # halved again or were left when the budget ran out.
+        unresolved = [numpy.empty(0)]
+        left = self.capacity - count
+        x0, x1, y0, y1 = x[:-1], x[1:], y[:-1], y[1:]
+        with numpy.errstate(invalid='ignore'):
+            priority = numpy.abs(y1 - y0)
+        while len(x0) and left > 0:
+            if intervals:
+                keep = ~self.settled(x0, x1, viewport, tolerance / scale)
+                x0, x1, y0, y1 = x0[keep], x1[keep], y0[keep], y1[keep]
+                priority = priority[keep]
+                if not len(x0):
+                    break
+            if len(x0) > left:
+                keep = numpy.sort(numpy.argsort(-priority,
+                    kind='mergesort')[:left])
+                x0, x1, y0, y1 = x0[keep], x1[keep], y0[keep], y1[keep]
+            middle = (x0 + x1) / 2
+            values = self.evaluate(middle)
+            left -= len(middle)
+            xs.append(middle)
+            ys.append(values)
+            with numpy.errstate(invalid='ignore'):
+                # Only the visible part of the chord is drawn.
+                low, high = viewport.y_min, viewport.y_max
+                first = numpy.clip(y0, low, high)
+                halfway = numpy.clip(values, low, high)
+                last = numpy.clip(y1, low, high)
+                slope = (last - first) * aspect / (x1 - x0)
+                error = (numpy.abs(halfway - (first + last) / 2) * scale /
+                    numpy.sqrt(1 + slope * slope))
+                above = (y0 > high) & (values > high) & (y1 > high)
+                below = (y0 < low) & (values < low) & (y1 < low)
+                # A steep chord may cross a pole or jump instead.
+                steep = (numpy.abs(last - first) >
+                    sampler.JUMP * viewport.height())
+                refine = (~(error <= tolerance) | steep) & ~above & ~below
+            undefined = (numpy.isnan(y0) & numpy.isnan(values) &
+                numpy.isnan(y1))
+            refine &= ~undefined
+            narrow = x1 - x0 <= 2 * smallest
+            unresolved.append(x0[refine & narrow])
+            unresolved.append(middle[refine & narrow])
+            refine &= ~narrow
+            error[numpy.isnan(error)] = numpy.inf
+            x0, middle, x1 = x0[refine], middle[refine], x1[refine]
+            y0, values, y1 = y0[refine], values[refine], y1[refine]
+            error = error[refine]
+            x0, x1 = (numpy.concatenate((x0, middle)),
+                numpy.concatenate((middle, x1)))
+            y0, y1 = (numpy.concatenate((y0, values)),
+                numpy.concatenate((values, y1)))
+            priority = numpy.concatenate((error, error))
+        unresolved.append(x0)
+        x = numpy.concatenate(xs)
+        order = numpy.argsort(x, kind='mergesort')
+        x = x[order]
+        y = numpy.concatenate(ys)[order]
+        candidates = numpy.searchsorted(x, numpy.concatenate(unresolved))
+        candidates = candidates[~numpy.isnan(y[candidates]) &
+            ~numpy.isnan(y[candidates + 1])]
+        return self.break_at(x, y, numpy.unique(candidates), BISECTIONS)
+
+    def settled(self, x0, x1, viewport, tolerance):
+        """Return a boolean array, true where no refinement is needed.
+
+        The tree is bounded over the intervals from x0 to x1 (arrays).  An
+        interval is settled if the function is undefined over all of it, or
+        if the part of its bounds inside the y range of viewport is at most
+        tolerance high, in units of y.  The chord of such an interval is
+        within tolerance of the function wherever either is visible.
+
+        """
+        self.enclosures += len(x0)
+        lo, hi = self.tree.evaluate_interval({self.variable: (x0, x1)})
+        with numpy.errstate(invalid='ignore'):
+            visible = (numpy.minimum(hi, viewport.y_max) -
+                numpy.maximum(lo, viewport.y_min))
+            settled = numpy.isnan(lo) | (visible <= tolerance)
+        # A tree without variables has single bounds for all intervals.
+        return settled & numpy.ones(len(x0), dtype=bool)
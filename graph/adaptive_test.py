@@ -0,0 +1,116 @@
+"""Tests the adaptive module.
+
+Test classes:
+Test_AdaptiveSampler
+
+"""
+
+import numpy
+import nose
+from nose import tools
+from expression.binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp
+from expression.binaryop import PowerOp
+from expression.constant import Constant
+from expression.variable import Variable
+from viewport import Viewport
+import adaptive
+import sampler
+
+x = Variable('x')
+
+class Test_AdaptiveSampler(object):
+    """Test adaptive sampling.
+
+    Ensure the following works as expected:
+        Straight lines are not refined
+        Curves are within the tolerance of the function
+        Poles split the curve, steep lines do not
+        The edge of the domain is found to within a pixel
+        Curves stay within their budget
+        Far fewer samples are taken than by uniform sampling
+        Intervals that are bounded outside the viewport or flat are skipped
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.viewport = Viewport(-10, 10, -10, 10)
+
+    def test_line(self):
+        # Ensure that one halving shows that a line is straight.
+        line = adaptive.AdaptiveSampler(SumOp(ProductOp(Constant(0.5), x),
+            Constant(1)))
+        curve = line.sample(self.viewport, 320, 320)
+        tools.eq_(len(curve), 21)
+        tools.eq_(line.evaluations, 21)
+        tools.eq_(curve.segments(), [(0, 21)])
+
+    def test_tolerance(self):
+        # Ensure that the curve is close to the function between samples.
+        tree = PowerOp(x, Constant(4))
+        curve = adaptive.AdaptiveSampler(tree).sample(self.viewport, 800, 600)
+        middle = (curve.x[:-1] + curve.x[1:]) / 2
+        exact = sampler.Sampler(tree).evaluate(middle)
+        drawn = (curve.y[:-1] + curve.y[1:]) / 2
+        # Only compare where the chord is visible and not steep.
+        visible = ((numpy.abs(curve.y[:-1]) < 10) &
+            (numpy.abs(curve.y[1:]) < 10) &
+            (numpy.abs(numpy.diff(curve.y)) < 0.5))
+        error = numpy.abs(exact - drawn)[visible] * 600 / 20
+        tools.ok_(visible.sum() > 10)
+        tools.ok_(error.max() <= adaptive.TOLERANCE)
+
+    def test_pole(self):
+        # Ensure that no line is drawn across a pole.
+        curve = adaptive.AdaptiveSampler(QuotientOp(Constant(1),
+            DifferenceOp(x, Constant(0.3)))).sample(self.viewport)
+        segments = curve.segments()
+        tools.eq_(len(segments), 2)
+        tools.ok_(curve.x[segments[0][1] - 1] < 0.3 < curve.x[segments[1][0]])
+
+    def test_steep(self):
+        # Ensure that steep continuous functions are not split.
+        curve = adaptive.AdaptiveSampler(PowerOp(x, Constant(51))).sample(
+            self.viewport)
+        tools.eq_(curve.segments(), [(0, len(curve))])
+
+    def test_domain(self):
+        # Ensure that the curve starts within a pixel of where x^0.5 does.
+        curve = adaptive.AdaptiveSampler(PowerOp(x, Constant(0.5))).sample(
+            self.viewport, 800, 600)
+        start = curve.segments()[0][0]
+        tools.ok_(0 <= curve.x[start] < 20.0 / 800)
+
+    def test_budget(self):
+        # Ensure that the budget is kept, and the largest errors refined.
+        tree = QuotientOp(Constant(1), x)
+        curve = adaptive.AdaptiveSampler(tree, budget=3200).sample(
+            self.viewport)
+        tools.ok_(curve.nbytes() <= 3200)
+        tools.eq_(len(curve.segments()), 2)
+
+    def test_fewer(self):
+        # Ensure that far fewer samples are taken than by a uniform grid.
+        tree = SumOp(PowerOp(x, Constant(3)), QuotientOp(Constant(1), x))
+        adaptive_sampler = adaptive.AdaptiveSampler(tree)
+        adaptive_sampler.sample(self.viewport, 800, 600)
+        tools.ok_(adaptive_sampler.evaluations * 5 < sampler.SAMPLES)
+    def test_intervals(self):
+        # Ensure that bounding the tree saves evaluations, not accuracy.
+        tree = PowerOp(x, Constant(50))
+        viewport = Viewport(-2, 2, 0, 1)
+        bounded = adaptive.AdaptiveSampler(tree)
+        curve = bounded.sample(viewport, 800, 600, intervals=True)
+        unbounded = adaptive.AdaptiveSampler(tree)
+        unbounded.sample(viewport, 800, 600)
+        tools.ok_(bounded.enclosures > 0)
+        tools.eq_(unbounded.enclosures, 0)
+        tools.ok_(bounded.evaluations < unbounded.evaluations)
+        tools.eq_(curve.segments(), [(0, len(curve))])
+        # The initial grid of a constant is never refined.
+        constant = adaptive.AdaptiveSampler(Constant(5))
+        curve = constant.sample(self.viewport, 320, 320, intervals=True)
+        tools.eq_(constant.evaluations, 11)
+        tools.eq_(curve.segments(), [(0, 11)])
+
+if __name__ == '__main__':
+    nose.main()
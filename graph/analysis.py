@@ -0,0 +1,220 @@
+"""Find the roots and extrema of functions over the x range of a plot.
+
+The points of a plotted curve already show roughly where its roots and
+extrema are: the function changes sign between two samples around a root,
+and its derivative changes sign around an extremum.  An Analyser evaluates
+the tree and its first two derivatives (see calculus.compile_derivatives)
+at all the x values of a sampled Curve at once, and looks for those sign
+changes in bulk.  Every interval found brackets a root of the function, or
+of its derivative for an extremum.
+
+All the brackets are then refined together, with Newton's method guarded
+by bisection: each step evaluates the function and its derivative for all
+the brackets left at once, and steps that would leave a bracket halve it
+instead.  A bracket around a pole also changes sign, but the function
+grows towards it instead of shrinking, and such brackets are dropped.
+
+Intervals of a curve broken at a pole or jump (see sampler.Sampler.split)
+are not searched.  Only roots and extrema that the samples of the curve
+reveal are found: two roots between neighbouring samples cancel out.
+
+Classes:
+Analyser  Find the roots and extrema of a sampled expression tree
+
+Functions:
+roots     Return the roots of a tree in a viewport.
+extrema   Return the extrema of a tree in a viewport.
+
+"""
+
+import numpy
+from expression import calculus
+import sampler
+
+# Brackets are refined until they, or the last Newton step, are smaller
+# than this fraction of the x range of the curve.
+TOLERANCE = 1e-12
+
+# The most steps a bracket is refined with.  Bisection alone narrows a
+# bracket of a thousandth of the range to TOLERANCE in 30 steps.
+ITERATIONS = 60
+
+class Analyser(object):
+    """Find the roots and extrema of a sampled expression tree.
+
+    Methods:
+        __init__(self, member)
+            Compile the derivatives of the tree of a sampler.
+
+        evaluate(self, x)
+            Return the values of the tree and its derivatives at x.
+
+        roots(self, curve)
+            Return the roots of the tree over a Curve of it.
+
+        extrema(self, curve)
+            Return the extrema of the tree over a Curve of it.
+
+    Attributes:
+        sampler      The sampler.Sampler of the tree.
+        evaluations  The number of x values the tree and its derivatives
+                     were evaluated for.
+
+    """
+    def __init__(self, member):
+        """Compile the tree of member, a sampler.Sampler, and its first and
+        second derivatives into one function."""
+        self.sampler = member
+        self.evaluations = 0
+        self._function = calculus.compile_derivatives(member.tree,
+            member.variable, 2, array=True)
+
+    def evaluate(self, x):
+        """Return a new array of the values of the tree and its derivatives.
+
+        The array has three rows, the values of the tree at x and those of
+        its first and second derivatives.  Values are NaN where they are
+        undefined or infinite.
+
+        """
+        values = numpy.empty((3,) + numpy.shape(x))
+        with numpy.errstate(all='ignore'):
+            for row, value in zip(values, self._function(
+                    {self.sampler.variable: x})):
+                row[...] = value
+        values[~numpy.isfinite(values)] = numpy.nan
+        self.evaluations += numpy.size(x)
+        return values
+
+    def roots(self, curve):
+        """Return a sorted array of the roots of the tree over curve.
+
+        Roots are found where the function changes sign between points of
+        curve, which must be a Curve of the tree, or is zero at one.  Roots
+        where it only touches zero are found as extrema of value zero.
+
+        """
+        x, values, joined = self._scan(curve)
+        y = values[0]
+        with numpy.errstate(invalid='ignore'):
+            crossing = numpy.flatnonzero(joined & (y[:-1] * y[1:] < 0))
+        found, kept = self._refine(x[crossing], x[crossing + 1],
+            y[crossing], y[crossing + 1], 0, self._tolerance(x))
+        # Extrema are roots if they are tiny next to the samples around them.
+        touching, value = self._extrema(x, values, joined)[:2]
+        near = numpy.clip(numpy.searchsorted(x, touching), 1, len(x) - 1)
+        with numpy.errstate(invalid='ignore'):
+            touching = touching[numpy.abs(value) <= TOLERANCE *
+                numpy.maximum(numpy.abs(y[near - 1]), numpy.abs(y[near]))]
+        return self._merge(numpy.concatenate([x[y == 0], found, touching]),
+            self._tolerance(x))
+
+    def extrema(self, curve):
+        """Return the extrema of the tree over curve, a Curve of it.
+
+        Extrema are found where the derivative changes sign between points
+        of curve, or is zero at one between points where it has opposite
+        signs.  Returns arrays of their x and y values, sorted by x, and a
+        boolean array that is true for maxima and false for minima.
+
+        """
+        return self._extrema(*self._scan(curve))
+
+    def _scan(self, curve):
+        """Return the x values of curve, the values of the tree and its
+        derivatives there, and which intervals between them are joined."""
+        x = curve.x
+        joined = ~numpy.isnan(curve.y[:-1]) & ~numpy.isnan(curve.y[1:])
+        return x, self.evaluate(x), joined
+
+    def _extrema(self, x, values, joined):
+        """Return the extrema found by a scan, like extrema."""
+        slope = values[1]
+        with numpy.errstate(invalid='ignore'):
+            turning = numpy.flatnonzero(joined & (slope[:-1] * slope[1:] < 0))
+            # Points where the slope is zero, between opposite slopes.
+            flat = 1 + numpy.flatnonzero(joined[:-1] & joined[1:] &
+                (slope[1:-1] == 0) & (slope[:-2] * slope[2:] < 0))
+        found, kept = self._refine(x[turning], x[turning + 1],
+            slope[turning], slope[turning + 1], 1, self._tolerance(x))
+        found = numpy.concatenate([x[flat], found])
+        # The function rises before a maximum.
+        maximum = numpy.concatenate([slope[flat - 1],
+            slope[turning][kept]]) > 0
+        order = numpy.argsort(found)
+        return found[order], self.evaluate(found[order])[0], maximum[order]
+
+    def _tolerance(self, x):
+        """Return the width to which brackets within x are refined."""
+        if len(x) < 2:
+            return 0.0
+        return TOLERANCE * (x[-1] - x[0])
+
+    def _refine(self, low, high, value_low, value_high, order, tolerance):
+        """Return the roots of a derivative of the tree in brackets.
+
+        order is 0 for the tree itself, 1 for its first derivative.  The
+        derivative must change sign from value_low at every low to
+        value_high at the matching high.
+        All the brackets are refined at once, and those around a pole are
+        dropped.  Returns the roots, and a boolean array that is true for
+        the brackets they were found in.
+
+        """
+        # Towards a pole, the function grows instead of shrinking.
+        limit = numpy.minimum(numpy.abs(value_low), numpy.abs(value_high))
+        low, high = low.copy(), high.copy()
+        value_low = value_low.copy()
+        x = (low + high) / 2
+        active = numpy.arange(len(x))
+        for i in range(ITERATIONS):
+            if not active.size:
+                break
+            values = self.evaluate(x[active])
+            value, slope = values[order], values[order + 1]
+            # Keep the part of the bracket over which the sign changes.
+            with numpy.errstate(invalid='ignore'):
+                below = value * value_low[active] < 0
+            high[active] = numpy.where(below, x[active], high[active])
+            low[active] = numpy.where(below, low[active], x[active])
+            value_low[active] = numpy.where(below, value_low[active], value)
+            # Step as Newton's method would, or halve the bracket where that
+            # would leave it or the slope is undefined.
+            with numpy.errstate(all='ignore'):
+                step = x[active] - value / slope
+                inside = (step > low[active]) & (step < high[active])
+            step = numpy.where(inside, step, (low[active] + high[active]) / 2)
+            done = ((numpy.abs(step - x[active]) <= tolerance) |
+                (high[active] - low[active] <= tolerance) | (value == 0))
+            x[active] = numpy.where(value == 0, x[active], step)
+            active = active[~done]
+        with numpy.errstate(invalid='ignore'):
+            kept = numpy.abs(self.evaluate(x)[order]) <= limit
+        return x[kept], kept
+
+    def _merge(self, x, tolerance):
+        """Return x sorted, without values within tolerance of another."""
+        x = numpy.sort(x)
+        if not x.size:
+            return x
+        return x[numpy.concatenate(([True], numpy.diff(x) > tolerance))]
+
+def roots(tree, viewport, samples=None, variable='x'):
+    """Return the roots of tree over the x range of viewport.
+
+    See Analyser.roots; the tree is sampled with samples points.  Use an
+    Analyser to analyse the same tree repeatedly, so that it is only
+    compiled once.
+
+    """
+    member = sampler.Sampler(tree, variable)
+    return Analyser(member).roots(member.sample(viewport, samples))
+
+def extrema(tree, viewport, samples=None, variable='x'):
+    """Return the extrema of tree over the x range of viewport.
+
+    See Analyser.extrema and roots.
+
+    """
+    member = sampler.Sampler(tree, variable)
+    return Analyser(member).extrema(member.sample(viewport, samples))
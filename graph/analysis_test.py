@@ -0,0 +1,112 @@
+"""Tests the analysis module.
+
+Test classes:
+Test_Analyser
+
+"""
+
+import numpy
+import nose
+from nose import tools
+from expression.binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp
+from expression.binaryop import PowerOp
+from expression.constant import Constant
+from expression.variable import Variable
+from viewport import Viewport
+import sampler
+import analysis
+
+x = Variable('x')
+
+def quintic():
+    """Return x^5 - 5x^3 + 4x, whose roots are 0, +-1 and +-2."""
+    return SumOp(DifferenceOp(PowerOp(x, Constant(5)), ProductOp(Constant(5),
+        PowerOp(x, Constant(3)))), ProductOp(Constant(4), x))
+
+def square(shift, lift=0):
+    """Return (x - shift)^2 + lift."""
+    difference = DifferenceOp(x, Constant(shift))
+    return SumOp(ProductOp(difference, difference), Constant(lift))
+
+class Test_Analyser(object):
+    """Test finding roots and extrema.
+
+    Ensure the following works as expected:
+        Roots and extrema are found to within the tolerance
+        Extrema are told apart as maxima and minima
+        Poles are neither roots nor extrema
+        Roots where a function only touches zero are found
+        Extrema with no curvature are found; inflections are not
+        All brackets are refined together
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.viewport = Viewport(-10, 10, -10, 10)
+
+    def test_roots(self):
+        # Ensure that every root is found, once.
+        numpy.testing.assert_allclose(analysis.roots(quintic(),
+            self.viewport, 400), [-2, -1, 0, 1, 2], atol=1e-10)
+        numpy.testing.assert_allclose(analysis.roots(square(0, -2),
+            self.viewport, 400), [-2 ** 0.5, 2 ** 0.5], atol=1e-10)
+
+    def test_extrema(self):
+        # Ensure that extrema are found where the slope is zero.
+        inner = ((15 - 145 ** 0.5) / 10) ** 0.5
+        outer = ((15 + 145 ** 0.5) / 10) ** 0.5
+        found, y, maximum = analysis.extrema(quintic(), self.viewport, 400)
+        numpy.testing.assert_allclose(found, [-outer, -inner, inner, outer],
+            atol=1e-10)
+        numpy.testing.assert_allclose(y, [x_ ** 5 - 5 * x_ ** 3 + 4 * x_
+            for x_ in found])
+        tools.eq_(maximum.tolist(), [True, False, True, False])
+
+    def test_poles(self):
+        # Ensure that a sign change across a pole is not taken for a root.
+        tree = QuotientOp(DifferenceOp(ProductOp(x, x), Constant(4)),
+            DifferenceOp(x, Constant(1.5)))
+        numpy.testing.assert_allclose(analysis.roots(tree, self.viewport),
+            [-2, 2], atol=1e-10)
+        tree = QuotientOp(Constant(1), square(0.3))
+        tools.eq_(analysis.roots(tree, self.viewport).size, 0)
+        tools.eq_(analysis.extrema(tree, self.viewport)[0].size, 0)
+
+    def test_touching(self):
+        # Ensure that roots between samples of an even power are found.
+        numpy.testing.assert_allclose(analysis.roots(square(0.3),
+            self.viewport), [0.3], atol=1e-6)
+        tools.eq_(analysis.roots(square(0.3, 1e-3), self.viewport).size, 0)
+
+    def test_flat(self):
+        # Ensure that x^4 has a minimum, and x^3 no extremum.
+        found, y, maximum = analysis.extrema(PowerOp(x, Constant(4)),
+            self.viewport, 400)
+        numpy.testing.assert_allclose(found, [0], atol=1e-3)
+        tools.eq_(maximum.tolist(), [False])
+        tools.eq_(analysis.extrema(PowerOp(x, Constant(3)),
+            self.viewport)[0].size, 0)
+
+    def test_batched(self):
+        # Ensure that many roots take few more evaluations than the scan.
+        tree = Constant(1)
+        for k in range(20):
+            tree = ProductOp(tree, DifferenceOp(x, Constant(-9.87 + k)))
+        member = sampler.Sampler(tree)
+        curve = member.sample(self.viewport, 1000)
+        finder = analysis.Analyser(member)
+        numpy.testing.assert_allclose(finder.roots(curve),
+            -9.87 + numpy.arange(20), atol=1e-9)
+        tools.ok_(finder.evaluations < 2 * len(curve) + 20 *
+            analysis.ITERATIONS)
+
+    def test_broken(self):
+        # Ensure that intervals across a break in the curve are skipped.
+        member = sampler.Sampler(quintic())
+        curve = member.sample(self.viewport, 400)
+        curve.y[(curve.x > 0.5) & (curve.x < 1.5)] = numpy.nan
+        numpy.testing.assert_allclose(analysis.Analyser(member).roots(curve),
+            [-2, -1, 0, 2], atol=1e-10)
+
+if __name__ == '__main__':
+    nose.main()
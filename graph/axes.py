@@ -0,0 +1,54 @@
+"""Choose the gridlines of a plot and their labels.
+
+Gridlines are a round number of units apart: 1, 2 or 5 times a power of
+ten, whichever is the smallest such step that puts them at least SPACING
+pixels apart.  They lie on the multiples of that step, and are labelled
+with as many decimals as the step has.
+
+Functions:
+step   Return the distance between gridlines in units.
+ticks  Return the positions of the gridlines in a range.
+label  Return the label of a gridline.
+
+"""
+
+import math
+import numpy
+
+# Least distance between gridlines, in pixels.
+SPACING = 50
+
+def step(span, pixels, spacing=SPACING):
+    """Return the distance between gridlines in units.
+
+    span units are plotted over pixels pixels, and gridlines must be at
+    least spacing pixels apart.
+
+    """
+    if span <= 0 or pixels <= 0:
+        raise ValueError("Span and pixels must be positive.")
+    least = float(span) * spacing / pixels
+    power = 10.0 ** math.floor(math.log10(least))
+    for factor in (1, 2, 5):
+        if factor * power >= least:
+            return factor * power
+    return 10 * power
+
+def ticks(low, high, distance):
+    """Return an array of the multiples of distance from low to high."""
+    first = int(math.ceil(low / distance))
+    last = int(math.floor(high / distance))
+    return numpy.arange(first, last + 1) * distance
+
+def label(value, distance):
+    """Return the label of the gridline at value, distance apart.
+
+    The label has as many decimals as are needed to tell gridlines apart.
+
+    """
+    decimals = max(0, -int(math.floor(math.log10(distance))))
+    text = "{0:.{1}f}".format(value, decimals)
+    # Rounding may turn a tiny negative value into -0.
+    if float(text) == 0:
+        text = text.lstrip('-')
+    return text
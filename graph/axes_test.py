@@ -0,0 +1,50 @@
+"""Tests the axes module.
+
+Test classes:
+Test_Axes
+
+"""
+
+import numpy
+import nose
+from nose import tools
+import axes
+
+class Test_Axes(object):
+    """Test choosing gridlines.
+
+    Ensure the following works as expected:
+        Steps are round and at least the spacing apart
+        The gridlines in a range are found
+        Labels have the decimals of the step
+
+    """
+    def test_step(self):
+        # Ensure that steps are round and at least the spacing apart.
+        tools.eq_(axes.step(20, 640), 2)
+        tools.eq_(axes.step(20, 200), 5)
+        tools.eq_(axes.step(20, 100), 10)
+        tools.eq_(axes.step(1, 500, 100), 0.2)
+        tools.eq_(axes.step(3e6, 600), 5e5)
+        for span in numpy.logspace(-6, 6, 50):
+            distance = axes.step(span, 640)
+            tools.ok_(distance * 640 / span >= axes.SPACING)
+            tools.ok_(distance * 640 / span < 2.5 * axes.SPACING + 1e-9)
+        tools.assert_raises(ValueError, axes.step, 0, 640)
+
+    def test_ticks(self):
+        # Ensure that the multiples in the range are found.
+        numpy.testing.assert_array_equal(axes.ticks(-10, 10, 5),
+            [-10, -5, 0, 5, 10])
+        numpy.testing.assert_array_equal(axes.ticks(0.1, 0.9, 0.5), [0.5])
+        tools.eq_(len(axes.ticks(1.1, 1.9, 1)), 0)
+
+    def test_label(self):
+        # Ensure that labels have the decimals of the step, and no -0.
+        tools.eq_(axes.label(5, 5), "5")
+        tools.eq_(axes.label(0.30000000000000004, 0.1), "0.3")
+        tools.eq_(axes.label(-1e-17, 0.1), "0.0")
+        tools.eq_(axes.label(-0.25, 0.05), "-0.25")
+
+if __name__ == '__main__':
+    nose.main()
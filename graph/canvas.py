@@ -0,0 +1,247 @@
+"""Provide the widget graphs are drawn on.
+
+Each curve is drawn as one QPainterPath, which is built once per curve and
+then drawn with a transform from the plane to the widget.  The path is built
+from the NumPy arrays of the curve without a Python loop per point: NumPy
+writes the points in the binary format of QPainterPath, and the path is read
+from that with a QDataStream.  Curves with more points than the widget has
+columns for are decimated first (see the decimate module), so repainting
+takes about as long for a curve of a million points as for one of a
+thousand.
+
+The gridlines, axes and their labels only change with the viewport, and are
+kept in a QPixmap until it does.
+
+Classes:
+Canvas  Widget that draws curves in a viewport
+
+Functions:
+path    Return a QPainterPath through the points of two arrays.
+
+"""
+
+import struct
+import numpy
+from PyQt4 import QtGui
+from PyQt4 import QtCore
+import axes
+import decimate
+
+# Points are drawn at most this many heights of the viewport above or below
+# it, as painting fails for huge coordinates.  Lines to points that are
+# further out are steep enough that the part inside hardly moves.
+REACH = 100
+
+# Pixels around the changed part of a curve that are repainted with it, for
+# the width of the pen and its antialiasing.
+MARGIN = 2
+
+# Colours of the curves, in turn, and of the axes and the gridlines.
+CURVES = [QtCore.Qt.darkBlue, QtCore.Qt.darkRed, QtCore.Qt.darkGreen,
+    QtCore.Qt.darkMagenta, QtCore.Qt.darkCyan, QtCore.Qt.darkYellow]
+AXES = QtCore.Qt.black
+GRID = QtGui.QColor(224, 224, 224)
+
+# Element types of a QPainterPath, and the layout of an element in the
+# format a QDataStream reads paths in.
+MOVE_TO = 0
+LINE_TO = 1
+ELEMENT = numpy.dtype([('type', '>i4'), ('x', '>f8'), ('y', '>f8')])
+
+def path(x, y):
+    """Return a QPainterPath through the points of arrays x and y.
+
+    Consecutive points are joined by lines, except where y is NaN.
+
+    """
+    defined = ~numpy.isnan(y)
+    starts = defined & ~numpy.concatenate(([False], defined[:-1]))
+    elements = numpy.empty(numpy.count_nonzero(defined), ELEMENT)
+    elements['type'] = numpy.where(starts[defined], MOVE_TO, LINE_TO)
+    elements['x'] = x[defined]
+    elements['y'] = y[defined]
+    # The stream ends with the index of the last subpath and the fill rule.
+    last = numpy.flatnonzero(elements['type'] == MOVE_TO)
+    data = (struct.pack('>i', len(elements)) + elements.tostring() +
+        struct.pack('>ii', last[-1] if len(last) else 0,
+            int(QtCore.Qt.OddEvenFill)))
+    painter_path = QtGui.QPainterPath()
+    stream = QtCore.QDataStream(QtCore.QByteArray(data))
+    stream >> painter_path
+    return painter_path
+
+class Canvas(QtGui.QWidget):
+    """Widget that draws curves in a viewport.
+
+    The canvas only draws: curves are sampled elsewhere (see the pipeline
+    module) and handed to set_curves.  When curves are refined in the same
+    viewport, only the columns where they changed are repainted.
+
+    Methods:
+        __init__(self, parent=None)
+            Create an empty canvas.
+
+        set_curves(self, curves, viewport, changed=None)
+            Draw curves in viewport from now on.
+
+        clear(self)
+            Draw nothing from now on.
+
+        background(self)
+            Return the pixmap of the gridlines and axes.
+
+        paintEvent(self, event)
+            Draw the background and the curves.
+
+        resizeEvent(self, event)
+            Forget what depends on the size.
+
+        sizeHint(self)
+            Return the preferred size.
+
+    Attributes:
+        curves     The list of sampler.Curves that are drawn.
+        viewport   The viewport.Viewport they are drawn in, or None.
+        decimator  The decimate.Decimator curves are reduced with.
+
+    """
+    def __init__(self, parent=None):
+        """Create an empty canvas."""
+        QtGui.QWidget.__init__(self, parent)
+        self.curves = []
+        self.viewport = None
+        self.decimator = decimate.Decimator()
+        self._paths = None
+        self._background = None
+        self._background_key = None
+        self.setSizePolicy(QtGui.QSizePolicy.Expanding,
+            QtGui.QSizePolicy.Expanding)
+
+    def set_curves(self, curves, viewport, changed=None):
+        """Draw the list curves in viewport from now on.
+
+        changed is an (x_min, x_max) pair.  If it is given and the viewport
+        and the number of curves are the same as before, the curves are
+        taken to differ from the last ones only between x_min and x_max,
+        and only that part is repainted.  Curves are coloured in turn with
+        the colours of CURVES.
+
+        """
+        same = (len(curves) == len(self.curves) and
+            viewport == self.viewport)
+        self.curves = list(curves)
+        self.viewport = viewport
+        self._paths = None
+        if changed is None or not same:
+            self.update()
+            return
+        x_scale = self.width() / viewport.width()
+        left = int((changed[0] - viewport.x_min) * x_scale)
+        right = int((changed[1] - viewport.x_min) * x_scale) + 1
+        self.update(left - MARGIN, 0, right - left + 2 * MARGIN,
+            self.height())
+
+    def clear(self):
+        """Draw nothing from now on."""
+        self.curves = []
+        self._paths = None
+        self.update()
+
+    def background(self):
+        """Return a pixmap of the gridlines, axes and labels.
+
+        The pixmap is drawn again only if the viewport or the size of the
+        canvas changed since the last call.
+
+        """
+        key = (self.viewport, self.width(), self.height())
+        if key != self._background_key:
+            self._background = self._draw_background()
+            self._background_key = key
+        return self._background
+
+    def paintEvent(self, event):
+        """Draw the background and the curves in the exposed rectangle."""
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(event.rect(), self.background(), event.rect())
+        if not self.curves:
+            return
+        if self._paths is None:
+            self._paths = [self._curve_path(curve) for curve in self.curves]
+        viewport = self.viewport
+        x_scale = self.width() / viewport.width()
+        y_scale = self.height() / viewport.height()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setTransform(QtGui.QTransform(x_scale, 0, 0, -y_scale,
+            -viewport.x_min * x_scale, viewport.y_max * y_scale))
+        for i, curve_path in enumerate(self._paths):
+            pen = QtGui.QPen(QtGui.QColor(CURVES[i % len(CURVES)]))
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.drawPath(curve_path)
+
+    def resizeEvent(self, event):
+        """Decimate the curves for the new width when next drawn."""
+        self._paths = None
+        QtGui.QWidget.resizeEvent(self, event)
+
+    def sizeHint(self):
+        """Return the preferred size of the canvas."""
+        return QtCore.QSize(640, 480)
+
+    def _curve_path(self, curve):
+        """Return the path of curve in the coordinates of the plane."""
+        viewport = self.viewport
+        curve = self.decimator.decimate(curve, viewport, self.width())
+        reach = REACH * viewport.height()
+        with numpy.errstate(invalid='ignore'):
+            y = numpy.clip(curve.y, viewport.y_min - reach,
+                viewport.y_max + reach)
+        return path(curve.x, y)
+
+    def _draw_background(self):
+        """Return a new pixmap of the gridlines, axes and labels."""
+        pixmap = QtGui.QPixmap(self.size())
+        pixmap.fill(QtCore.Qt.white)
+        width, height = self.width(), self.height()
+        if self.viewport is None or width <= 0 or height <= 0:
+            return pixmap
+        viewport = self.viewport
+        x_step = axes.step(viewport.width(), width)
+        y_step = axes.step(viewport.height(), height)
+        x_ticks = axes.ticks(viewport.x_min, viewport.x_max, x_step)
+        y_ticks = axes.ticks(viewport.y_min, viewport.y_max, y_step)
+        columns = (x_ticks - viewport.x_min) * (width / viewport.width())
+        rows = (viewport.y_max - y_ticks) * (height / viewport.height())
+        # The axes are drawn at the edge if the origin is out of view.
+        column = min(max(0, -viewport.x_min * width / viewport.width()),
+            width - 1)
+        row = min(max(0, viewport.y_max * height / viewport.height()),
+            height - 1)
+        painter = QtGui.QPainter(pixmap)
+        painter.setPen(GRID)
+        for x in columns:
+            painter.drawLine(QtCore.QLineF(x, 0, x, height))
+        for y in rows:
+            painter.drawLine(QtCore.QLineF(0, y, width, y))
+        painter.setPen(AXES)
+        painter.drawLine(QtCore.QLineF(column, 0, column, height))
+        painter.drawLine(QtCore.QLineF(0, row, width, row))
+        metrics = painter.fontMetrics()
+        # Labels go below and right of the axes, unless that is out of view.
+        below = row + metrics.ascent() + 2
+        if below > height:
+            below = row - metrics.descent() - 2
+        for x, value in zip(columns, x_ticks):
+            if value != 0:
+                painter.drawText(QtCore.QPointF(x + 2, below),
+                    axes.label(value, x_step))
+        for y, value in zip(rows, y_ticks):
+            if value != 0:
+                text = axes.label(value, y_step)
+                left = column + 2
+                if left + metrics.width(text) > width:
+                    left = column - metrics.width(text) - 2
+                painter.drawText(QtCore.QPointF(left, y - 2), text)
+        painter.end()
+        return pixmap
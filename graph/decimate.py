@@ -0,0 +1,89 @@
+"""Reduce curves to the points that can be told apart on screen.
+
+A curve sampled finely over a wide x range has many points per column of
+pixels, and drawing lines between all of them takes time but shows nothing
+more.  A Decimator keeps only the lowest and the highest point of every
+column of every segment, so about two points per column are left.  Within
+a column, the lines between the points cover the pixels from the lowest to
+the highest point, with or without the points in between, so the drawn
+curve looks the same; only the lines joining neighbouring columns may start
+at a different height within them.  Spikes and extrema are kept exactly, as
+they are the points that are kept.  The first and last point of every
+segment are kept as well, and every run of NaN points between segments is
+reduced to one NaN point, so segments start, end and break where they did.
+
+All of this is done with a few passes of NumPy over the arrays.
+
+Classes:
+Decimator  Reduce curves to about two points per column of pixels
+
+"""
+
+import numpy
+from sampler import Curve
+
+class Decimator(object):
+    """Reduce curves to about two points per column of pixels.
+
+    Methods:
+        __init__(self)
+            Set the counters to zero.
+
+        decimate(self, curve, viewport, width)
+            Return curve reduced for drawing at width pixels.
+
+        ratio(self)
+            Return how many times fewer points were kept.
+
+    Attributes:
+        received  The number of points of all curves given to decimate.
+        kept      The number of points of the curves it returned.
+
+    """
+    def __init__(self):
+        """Set the counters to zero."""
+        self.received = 0
+        self.kept = 0
+
+    def decimate(self, curve, viewport, width):
+        """Return curve with about two points per column of pixels.
+
+        The x range of viewport is plotted on width columns.  Points left or
+        right of viewport are reduced as if they were in one more column on
+        either side.  Curves with at most two points per column are returned
+        unchanged.
+
+        """
+        self.received += len(curve)
+        if len(curve) <= 2 * (width + 2):
+            self.kept += len(curve)
+            return curve
+        x, y = curve.x, curve.y
+        undefined = numpy.isnan(y)
+        columns = numpy.clip(numpy.floor((x - viewport.x_min) /
+            viewport.width() * width), -1, width).astype(numpy.int64)
+        # Runs of points in the same column of the same segment, or of NaN
+        # points in the same column.
+        starts = numpy.flatnonzero(numpy.concatenate(([True],
+            (numpy.diff(columns) != 0) | (undefined[1:] != undefined[:-1]))))
+        lengths = numpy.diff(numpy.append(starts, len(y)))
+        # Segment ends are next to NaN points or at the ends of the curve,
+        # and one NaN point is kept for every break between segments.
+        after = numpy.concatenate(([True], undefined[:-1]))
+        ends = ~undefined & (after | numpy.concatenate((undefined[1:],
+            [True])))
+        keep = [numpy.flatnonzero(ends | (undefined & ~after))]
+        for extreme in (numpy.fmin, numpy.fmax):
+            # The first point of every run with the extreme value of its run.
+            found = numpy.flatnonzero(y == numpy.repeat(extreme.reduceat(y,
+                starts), lengths))
+            run = numpy.searchsorted(starts, found, 'right')
+            keep.append(found[numpy.concatenate(([True],
+                run[1:] != run[:-1]))])
+        keep = numpy.unique(numpy.concatenate(keep))
+        self.kept += len(keep)
+        return Curve(x[keep], y[keep])
+
+    def ratio(self):
+        """Return received / kept, or 1 if nothing was decimated yet."""
+        return float(self.received) / self.kept if self.kept else 1.0
@@ -0,0 +1,93 @@
+"""Tests the decimate module.
+
+Test classes:
+Test_Decimator
+
+"""
+
+import numpy
+import nose
+from nose import tools
+from viewport import Viewport
+from sampler import Curve
+import decimate
+
+class Test_Decimator(object):
+    """Test reducing curves for drawing.
+
+    Ensure the following works as expected:
+        About two points are kept per column
+        The lowest and highest point of every column are kept exactly
+        Segments keep their ends and breaks
+        Runs of NaN points are reduced to one
+        Short curves are returned unchanged
+        The reduction ratio is counted
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.viewport = Viewport(-10, 10, -10, 10)
+        cls.x = numpy.linspace(-10, 10, 100001)
+        random = numpy.random.RandomState(1)
+        cls.y = numpy.cumsum(random.normal(0, 0.1, len(cls.x)))
+
+    def test_extremes(self):
+        # Ensure that every column keeps its lowest and highest point.
+        y = self.y.copy()
+        y[1234] = 1000
+        curve = decimate.Decimator().decimate(Curve(self.x, y),
+            self.viewport, 200)
+        tools.ok_(len(curve) <= 2 * 202)
+        tools.ok_(1000 in curve.y)
+        columns = numpy.clip(numpy.floor((self.x + 10) / 20 * 200), -1, 200)
+        kept = numpy.clip(numpy.floor((curve.x + 10) / 20 * 200), -1, 200)
+        for column in (0, 57, 199, 200):
+            inside = y[columns == column]
+            tools.eq_(curve.y[kept == column].min(), inside.min())
+            tools.eq_(curve.y[kept == column].max(), inside.max())
+        # The points kept are points of the curve.
+        indices = numpy.searchsorted(self.x, curve.x)
+        numpy.testing.assert_array_equal(y[indices], curve.y)
+
+    def test_segments(self):
+        # Ensure that segments start, end and break where they did.
+        y = self.y.copy()
+        y[30000:30010] = numpy.nan
+        y[60000] = numpy.nan
+        original = Curve(self.x, y)
+        curve = decimate.Decimator().decimate(original, self.viewport, 100)
+        tools.eq_([(curve.x[start], curve.x[stop - 1]) for start, stop in
+            curve.segments()], [(original.x[start], original.x[stop - 1])
+            for start, stop in original.segments()])
+
+    def test_undefined(self):
+        # Ensure that runs of NaN points are kept as one break, or dropped
+        # before the first segment.
+        y = self.y.copy()
+        y[:50000] = numpy.nan
+        y[70000:70010] = numpy.nan
+        original = Curve(self.x, y)
+        curve = decimate.Decimator().decimate(original, self.viewport, 100)
+        tools.ok_(len(curve) <= 2 * 102 + 2)
+        tools.eq_(numpy.isnan(curve.y).sum(), 1)
+        tools.eq_([(curve.x[start], curve.x[stop - 1]) for start, stop in
+            curve.segments()], [(original.x[start], original.x[stop - 1])
+            for start, stop in original.segments()])
+
+    def test_short(self):
+        # Ensure that curves with few points per column are not changed.
+        curve = Curve(self.x[::1000], self.y[::1000])
+        tools.ok_(decimate.Decimator().decimate(curve, self.viewport, 800)
+            is curve)
+
+    def test_ratio(self):
+        # Ensure that the reduction is counted over all curves.
+        decimator = decimate.Decimator()
+        tools.eq_(decimator.ratio(), 1)
+        curve = decimator.decimate(Curve(self.x, self.y), self.viewport, 500)
+        tools.eq_((decimator.received, decimator.kept),
+            (len(self.x), len(curve)))
+        tools.ok_(decimator.ratio() > 90)
+
+if __name__ == '__main__':
+    nose.main()
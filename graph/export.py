@@ -0,0 +1,210 @@
+"""Save plots as PNG or SVG files, without Qt.
+
+Both formats are written with the standard library and NumPy only, so that
+plots can be saved where there is no display.  A PNG file has the pixels of
+a raster.Raster, compressed with zlib.  An SVG file describes the same plot
+with vectors: a line per gridline and axis, and a path per curve.  Both
+are written to the file as they are produced, so that exporting a curve of
+millions of points takes no more memory than one of a few.
+
+Functions:
+render     Return a raster.Raster of curves.
+write_png  Write an image of curves as PNG to a file object.
+write_svg  Write curves as SVG to a file object.
+save       Save curves to a file, in the format of its extension.
+
+"""
+
+import os
+import struct
+import zlib
+import numpy
+import axes
+import raster
+
+# The eight bytes every PNG file starts with.
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# The zlib level PNG images are compressed with.  Higher levels take twice
+# as long or more, for files half the size.
+COMPRESSION = 3
+
+# The PNG filter of rows that are stored as their difference from the row
+# above, and of rows stored as they are.
+UP = 2
+NONE = 0
+
+# Rows of a PNG image that are filtered and compressed at a time, and the
+# size in bytes at which compressed data is written out as an IDAT chunk.
+BAND = 64
+IDAT_SIZE = 1 << 16
+
+def render(curves, viewport, width, height):
+    """Return a width x height raster.Raster of curves in viewport.
+
+    The gridlines and axes are drawn first, then the curves in the colours
+    of raster.CURVES, in turn, in one pass.
+
+    """
+    image = raster.Raster(width, height)
+    image.draw_grid(viewport)
+    image.draw_curves(curves, viewport, [raster.CURVES[i % len(
+        raster.CURVES)] for i in range(len(curves))])
+    return image
+
+def _chunk(kind, data):
+    """Return a PNG chunk of kind with data, and its length and CRC."""
+    return (struct.pack(">I", len(data)) + kind + data +
+        struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+
+def write_png(curves, viewport, width, height, stream):
+    """Write a width x height PNG image of curves in viewport to stream.
+
+    The image is that of render, as 8-bit RGBA.  Rows are stored as their
+    difference from the row above, which is zero for most of them, as
+    plots are mostly background.  They are filtered and compressed BAND at
+    a time, and written in IDAT chunks of about IDAT_SIZE bytes, so that
+    no more than the raster itself is held in memory.
+
+    """
+    pixels = render(curves, viewport, width, height).pixels.reshape(height,
+        4 * width)
+    stream.write(PNG_SIGNATURE)
+    stream.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6,
+        0, 0, 0)))
+    compressor = zlib.compressobj(COMPRESSION)
+    # Every row starts with the byte of its filter.
+    rows = numpy.empty((min(BAND, height), 1 + 4 * width), dtype=numpy.uint8)
+    rows[:, 0] = UP
+    pending = []
+    size = 0
+    for start in range(0, height, BAND):
+        stop = min(start + BAND, height)
+        band = rows[:stop - start]
+        if start == 0:
+            band[0, 0] = NONE
+            band[0, 1:] = pixels[0]
+            numpy.subtract(pixels[1:stop], pixels[:stop - 1],
+                out=band[1:, 1:])
+        else:
+            band[0, 0] = UP
+            numpy.subtract(pixels[start:stop], pixels[start - 1:stop - 1],
+                out=band[:, 1:])
+        data = compressor.compress(band.tostring())
+        if data:
+            pending.append(data)
+            size += len(data)
+        if size >= IDAT_SIZE:
+            stream.write(_chunk(b"IDAT", b"".join(pending)))
+            pending = []
+            size = 0
+    pending.append(compressor.flush())
+    stream.write(_chunk(b"IDAT", b"".join(pending)))
+    stream.write(_chunk(b"IEND", b""))
+
+def _colour(rgb):
+    """Return the SVG notation of an RGB triple."""
+    return "#{0:02x}{1:02x}{2:02x}".format(*rgb)
+
+def _path_data(curve, viewport, width, height):
+    """Yield the SVG path data of curve, raster.CHUNK points at a time.
+
+    Every piece is a string of commands separated by spaces; pieces with
+    no points are skipped.  A new subpath starts after every NaN point.
+
+    """
+    move = True
+    for start in range(0, len(curve.x), raster.CHUNK):
+        stop = start + raster.CHUNK
+        columns, rows = raster.to_pixels(curve.x[start:stop],
+            curve.y[start:stop], viewport, width, height)
+        missing = numpy.isnan(rows)
+        moves = numpy.empty(len(rows), dtype=bool)
+        moves[0] = move
+        moves[1:] = missing[:-1]
+        move = missing[-1]
+        kept = ~missing
+        if not kept.any():
+            continue
+        # SVG coordinates start at the corner of the first pixel.
+        values = numpy.empty((kept.sum(), 3), dtype=object)
+        values[:, 0] = numpy.where(moves[kept], "M", "L")
+        values[:, 1] = columns[kept] + 0.5
+        values[:, 2] = rows[kept] + 0.5
+        yield " ".join(["%s%.2f,%.2f"] * len(values)) % tuple(values.ravel())
+
+def write_svg(curves, viewport, width, height, stream):
+    """Write an SVG image of curves in viewport to stream.
+
+    The image is width x height pixels, and shows the same as that of
+    render, with labelled gridlines.  Path data is formatted and written
+    raster.CHUNK points at a time.
+
+    """
+    stream.write('<svg xmlns="http://www.w3.org/2000/svg" width="{0}" '
+        'height="{1}" viewBox="0 0 {0} {1}">\n'.format(width, height))
+    stream.write('<rect width="100%" height="100%" fill="{0}"/>\n'.format(
+        _colour(raster.BACKGROUND)))
+    x_step = axes.step(viewport.width(), width)
+    y_step = axes.step(viewport.height(), height)
+    x_ticks = axes.ticks(viewport.x_min, viewport.x_max, x_step)
+    y_ticks = axes.ticks(viewport.y_min, viewport.y_max, y_step)
+    # Lines run along the edges of pixels, not their centres.
+    columns, rows = raster.to_pixels(x_ticks, y_ticks, viewport, width,
+        height)
+    columns += 0.5
+    rows += 0.5
+    column, row = raster.to_pixels(0.0, 0.0, viewport, width, height)
+    column = min(max(0.5, column + 0.5), width - 0.5)
+    row = min(max(0.5, row + 0.5), height - 0.5)
+    stream.write('<g stroke="{0}" stroke-width="1">\n'.format(
+        _colour(raster.GRID)))
+    for x in columns:
+        stream.write('<line x1="{0:.2f}" y1="0" x2="{0:.2f}" y2="{1}"/>\n'
+            .format(x, height))
+    for y in rows:
+        stream.write('<line x1="0" y1="{0:.2f}" x2="{1}" y2="{0:.2f}"/>\n'
+            .format(y, width))
+    stream.write('</g>\n<g stroke="{0}" stroke-width="1">\n'.format(
+        _colour(raster.AXES)))
+    stream.write('<line x1="{0:.2f}" y1="0" x2="{0:.2f}" y2="{1}"/>\n'
+        .format(column, height))
+    stream.write('<line x1="0" y1="{0:.2f}" x2="{1}" y2="{0:.2f}"/>\n'
+        .format(row, width))
+    stream.write('</g>\n<g font-family="sans-serif" font-size="10">\n')
+    for x, value in zip(columns, x_ticks):
+        if value != 0:
+            stream.write('<text x="{0:.2f}" y="{1:.2f}">{2}</text>\n'.format(
+                x + 2, row + 12 if row + 12 < height else row - 3,
+                axes.label(value, x_step)))
+    for y, value in zip(rows, y_ticks):
+        if value != 0:
+            stream.write('<text x="{0:.2f}" y="{1:.2f}">{2}</text>\n'.format(
+                column + 2, y - 2, axes.label(value, y_step)))
+    stream.write('</g>\n<g fill="none" stroke-width="1">\n')
+    for i, curve in enumerate(curves):
+        started = False
+        for data in _path_data(curve, viewport, width, height):
+            if not started:
+                stream.write('<path stroke="{0}" d="'.format(_colour(
+                    raster.CURVES[i % len(raster.CURVES)])))
+                started = True
+            else:
+                stream.write(" ")
+            stream.write(data)
+        if started:
+            stream.write('"/>\n')
+    stream.write('</g>\n</svg>\n')
+
+def save(curves, viewport, filename, width, height):
+    """Save curves in viewport to filename, width x height pixels.
+
+    The format is chosen by the extension of filename: .png or .svg.
+
+    """
+    writers = {'.png': write_png, '.svg': write_svg}
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in writers:
+        raise ValueError("Unknown image format `{0}'.".format(extension))
+    with open(filename, 'wb') as stream:
+        writers[extension](curves, viewport, width, height, stream)
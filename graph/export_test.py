@@ -0,0 +1,118 @@
+"""Tests the export module.
+
+Test classes:
+Test_Export
+
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+from StringIO import StringIO
+from xml.etree import ElementTree
+import numpy
+import nose
+from nose import tools
+from viewport import Viewport
+import sampler
+import raster
+import export
+
+def read_png(data):
+    """Return the pixels of PNG data written by export.write_png."""
+    tools.eq_(data[:8], export.PNG_SIGNATURE)
+    chunks = {}
+    position = 8
+    while position < len(data):
+        length, = struct.unpack(">I", data[position:position + 4])
+        kind = data[position + 4:position + 8]
+        body = data[position + 8:position + 8 + length]
+        crc, = struct.unpack(">I", data[position + 8 + length:
+            position + 12 + length])
+        tools.eq_(crc, zlib.crc32(kind + body) & 0xffffffff)
+        chunks[kind] = chunks.get(kind, b"") + body
+        position += 12 + length
+    width, height, depth, kind = struct.unpack(">IIBB",
+        chunks[b"IHDR"][:10])
+    tools.eq_((depth, kind), (8, 6))
+    rows = numpy.frombuffer(zlib.decompress(chunks[b"IDAT"]),
+        dtype=numpy.uint8).reshape(height, 1 + 4 * width)
+    pixels = rows[:, 1:].copy()
+    for row in range(1, height):
+        if rows[row, 0] == export.UP:
+            pixels[row] += pixels[row - 1]
+    return pixels.reshape(height, width, 4)
+
+class Test_Export(object):
+    """Test saving plots as PNG and SVG.
+
+    Ensure the following works as expected:
+        PNG files have the pixels of the rendered raster
+        SVG files are well-formed, with a subpath per segment
+        Writing in chunks, bands and several IDAT chunks changes nothing
+        Files are saved in the format of their extension
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.viewport = Viewport(-10, 10, -10, 10)
+        cls.curves = [sampler.Curve(numpy.array([-10, -1, 0, 1, 10.0]),
+            numpy.array([-5, 5, numpy.nan, 5, -5.0])),
+            sampler.Curve(numpy.array([-10, 10.0]), numpy.array([2, 2.0]))]
+
+    def test_png(self):
+        # Ensure that the image decodes to the rendered pixels.
+        stream = StringIO()
+        export.write_png(self.curves, self.viewport, 64, 48, stream)
+        numpy.testing.assert_array_equal(read_png(stream.getvalue()),
+            export.render(self.curves, self.viewport, 64, 48).pixels)
+
+    def test_svg(self):
+        # Ensure that the image parses, with a path per curve.
+        stream = StringIO()
+        export.write_svg(self.curves, self.viewport, 64, 48, stream)
+        root = ElementTree.fromstring(stream.getvalue())
+        paths = root.findall('.//{http://www.w3.org/2000/svg}path')
+        tools.eq_(len(paths), 2)
+        tools.eq_(paths[0].get('d').count('M'), 2)
+        tools.eq_(paths[1].get('d'), "M0.00,19.20 L64.00,19.20")
+
+    def test_chunks(self):
+        # Ensure that files are the same however they are split up.
+        def write():
+            png = StringIO()
+            svg = StringIO()
+            export.write_png(self.curves, self.viewport, 64, 48, png)
+            export.write_svg(self.curves, self.viewport, 64, 48, svg)
+            return png.getvalue(), svg.getvalue()
+        whole_png, whole_svg = write()
+        saved = raster.CHUNK, export.BAND, export.IDAT_SIZE
+        raster.CHUNK, export.BAND, export.IDAT_SIZE = 2, 5, 1
+        try:
+            png, svg = write()
+        finally:
+            raster.CHUNK, export.BAND, export.IDAT_SIZE = saved
+        tools.eq_(svg, whole_svg)
+        tools.ok_(png.count(b"IDAT") > 1)
+        numpy.testing.assert_array_equal(read_png(png), read_png(whole_png))
+
+    def test_save(self):
+        # Ensure that the extension chooses the format.
+        directory = tempfile.mkdtemp()
+        try:
+            for name in ('plot.png', 'plot.SVG'):
+                export.save(self.curves, self.viewport,
+                    os.path.join(directory, name), 64, 48)
+            with open(os.path.join(directory, 'plot.png'), 'rb') as stream:
+                tools.eq_(stream.read(8), export.PNG_SIGNATURE)
+            with open(os.path.join(directory, 'plot.SVG')) as stream:
+                tools.ok_(stream.read().startswith('<svg'))
+            tools.assert_raises(ValueError, export.save, self.curves,
+                self.viewport, os.path.join(directory, 'plot.gif'), 64, 48)
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    nose.main()
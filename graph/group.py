@@ -0,0 +1,121 @@
+"""Sample several functions over one shared array of x values.
+
+Plots often overlay many functions.  Sampling them one by one repeats the
+work they have in common: every function gets its own array of x values,
+its own call per batch of samples, and subexpressions that several of them
+share (such as x^2 in x^2 + 1 and 1/x^2) are computed once per function.
+A SamplerGroup instead compiles all the trees into a single function with
+codegen.compile_trees, which computes every shared subtree once, and
+evaluates it once for all functions over the same x array.
+
+Each function keeps its own sampler.Sampler as well, for what is done per
+function: checking for poles, and evaluating a single function.
+
+Classes:
+SamplerGroup  Sample several expression trees together
+
+"""
+
+import numpy
+from expression import codegen
+import sampler
+
+class SamplerGroup(object):
+    """Sample several expression trees together.
+
+    Methods:
+        __init__(self, samplers)
+            Group samplers of the same variable.
+
+        from_trees(cls, trees, variable='x', budget=sampler.BUDGET)
+            Return a group of new samplers of trees.
+
+        evaluate(self, x, indices=None)
+            Return the values of the trees for an array of x values.
+
+        sample(self, viewport, samples=None)
+            Return the Curves of the trees in viewport.
+
+        __len__(self)
+            Return the number of samplers.
+
+    Attributes:
+        samplers     The sampler.Sampler of every tree.
+        trees        The sampled expression trees.
+        variable     The name of the variable of the x axis.
+        evaluations  The number of x values the trees were evaluated for
+                     together.
+
+    """
+    def __init__(self, samplers):
+        """Group samplers, which must sample the same variable.
+
+        The samplers may be shared with other groups, so that the trees
+        of functions that stay when others change are not compiled again.
+
+        """
+        if not samplers:
+            raise ValueError("A group needs at least one sampler.")
+        self.samplers = list(samplers)
+        self.trees = [member.tree for member in self.samplers]
+        self.variable = self.samplers[0].variable
+        if any(member.variable != self.variable for member in
+                self.samplers):
+            raise ValueError("All samplers must sample the same variable.")
+        self.evaluations = 0
+        self._functions = {}
+
+    @classmethod
+    def from_trees(cls, trees, variable='x', budget=sampler.BUDGET):
+        """Return a group of new samplers of trees.  See Sampler."""
+        return cls([sampler.Sampler(tree, variable, budget) for tree in
+            trees])
+
+    def evaluate(self, x, indices=None):
+        """Return a new 2-D array of the values of the trees at x.
+
+        Row i has the values of tree indices[i], or of tree i if indices
+        is None.  Values are NaN where a tree is undefined or infinite.
+        The trees are evaluated together, with one function compiled for
+        each combination of indices that is asked for.
+
+        """
+        if indices is None:
+            indices = range(len(self.samplers))
+        indices = tuple(indices)
+        self.evaluations += numpy.size(x)
+        if len(indices) == 1:
+            return self.samplers[indices[0]].evaluate(x)[numpy.newaxis]
+        function = self._functions.get(indices)
+        if function is None:
+            function = codegen.compile_trees([self.trees[i] for i in indices],
+                array=True)
+            self._functions[indices] = function
+        y = numpy.empty((len(indices),) + numpy.shape(x))
+        with numpy.errstate(all='ignore'):
+            for row, values in zip(y, function({self.variable: x})):
+                row[...] = values
+        y[~numpy.isfinite(y)] = numpy.nan
+        for i in indices:
+            self.samplers[i].evaluations += numpy.size(x)
+        return y
+
+    def sample(self, viewport, samples=None):
+        """Return a list of the Curves of the trees over viewport.
+
+        The curves share evenly spaced x values, as in Sampler.sample, but
+        are each broken at their own poles.  The budget of every sampler
+        applies to its curve.
+
+        """
+        if samples is None:
+            samples = sampler.SAMPLES
+        samples = max(2, min([samples] + [member.capacity for member in
+            self.samplers]))
+        x = numpy.linspace(viewport.x_min, viewport.x_max, samples)
+        return [member.split(x, y, viewport) for member, y in
+            zip(self.samplers, self.evaluate(x))]
+
+    def __len__(self):
+        """Return the number of samplers in the group."""
+        return len(self.samplers)
@@ -0,0 +1,79 @@
+"""Tests the group module.
+
+Test classes:
+Test_SamplerGroup
+
+"""
+
+import numpy
+import nose
+from nose import tools
+from expression.binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp
+from expression.constant import Constant
+from expression.variable import Variable
+from viewport import Viewport
+import sampler
+import group
+
+x = Variable('x')
+
+def trees():
+    """Return new trees that share the subtree x * x."""
+    square = ProductOp(x, x)
+    return [SumOp(square, Constant(1)), QuotientOp(Constant(1), square),
+        Constant(2), QuotientOp(Constant(1), DifferenceOp(x, Constant(0.3)))]
+
+class Test_SamplerGroup(object):
+    """Test sampling trees together.
+
+    Ensure the following works as expected:
+        Trees have the values they have alone
+        Shared subtrees are computed once
+        Curves share x values and break at their own poles
+        Samplers of different variables are rejected
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.viewport = Viewport(-10, 10, -10, 10)
+
+    def test_evaluate(self):
+        # Ensure that every row has the values of its tree alone.
+        functions = group.SamplerGroup.from_trees(trees())
+        values = numpy.linspace(-2, 2, 101)
+        y = functions.evaluate(values)
+        tools.eq_(y.shape, (4, 101))
+        for tree, row in zip(trees(), y):
+            numpy.testing.assert_array_equal(row,
+                sampler.Sampler(tree).evaluate(values))
+        numpy.testing.assert_array_equal(functions.evaluate(values, [3, 1]),
+            y[[3, 1]])
+        numpy.testing.assert_array_equal(functions.evaluate(values, [2]),
+            y[[2]])
+        tools.eq_(functions.evaluations, 3 * 101)
+        tools.eq_(functions.samplers[3].evaluations, 2 * 101)
+        tools.eq_(functions.samplers[2].evaluations, 2 * 101)
+
+    def test_fused(self):
+        # Ensure that the shared square is computed once.
+        functions = group.SamplerGroup.from_trees(trees()[:2])
+        functions.evaluate(numpy.zeros(1))
+        source = functions._functions[(0, 1)].source
+        tools.eq_(source.count("*"), 1)
+
+    def test_sample(self):
+        # Ensure that curves share x values but break at their own poles.
+        curves = group.SamplerGroup.from_trees(trees()).sample(self.viewport,
+            101)
+        tools.eq_(len(curves), 4)
+        numpy.testing.assert_array_equal(curves[0].x, curves[2].x)
+        tools.eq_([len(curve.segments()) for curve in curves], [1, 2, 1, 2])
+
+    def test_variables(self):
+        # Ensure that a group has a single variable.
+        tools.assert_raises(ValueError, group.SamplerGroup,
+            [sampler.Sampler(x), sampler.Sampler(Variable('t'), 't')])
+        tools.assert_raises(ValueError, group.SamplerGroup, [])
+
+if __name__ == '__main__':
+    nose.main()
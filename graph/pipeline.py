@@ -0,0 +1,153 @@
+"""Turn plot requests into curves, dropping requests that became stale.
+
+Plotting a function takes several steps: parsing it, compiling and sampling
+the tree, and reducing the curve for drawing.  A Pipeline runs those steps,
+and is meant to be run outside the thread of the user interface, so that
+the interface never waits for a heavy function.
+
+While one request is being worked on, the user may already have changed the
+function or the viewport.  Every request therefore gets a generation number
+from Pipeline.request, and a newer request makes all older ones stale.  A
+stale request is abandoned at the next step with a Cancelled exception, so
+its result is never computed in full, let alone shown.
+
+Pipeline.stream generates a coarse preview of the curve first, and then
+ever finer curves (see TileCache.progressive), so that something is shown
+at once even when the full curve takes seconds.
+
+A request may plot any number of functions.  They are sampled together
+with a group.SamplerGroup, which shares the x values, the evaluation calls
+and the common subexpressions of the functions.
+
+Classes:
+Cancelled  Exception raised for requests that have become stale
+Pipeline   Parse, sample and decimate functions for plotting
+
+"""
+
+import threading
+import sampler
+import group
+import tiles
+import decimate
+
+class Cancelled(Exception):
+    """Exception raised when a newer request makes a request stale."""
+    pass
+
+class Pipeline(object):
+    """Parse, sample and decimate functions for plotting.
+
+    The pipeline may be used from several threads.  Curves are sampled
+    together from a tiles.TileCache, so that requests that only pan or zoom
+    evaluate little, and reduced with a decimate.Decimator.
+
+    Methods:
+        __init__(self, parser=None)
+            Create a pipeline.
+
+        request(self)
+            Return the generation of a new request.
+
+        cancelled(self, generation)
+            Return whether a request has become stale.
+
+        check(self, generation)
+            Raise Cancelled if a request has become stale.
+
+        run(self, generation, functions, viewport, width)
+            Return the curves of functions for drawing.
+
+        stream(self, generation, functions, viewport, width)
+            Generate ever finer curves of functions for drawing.
+
+    Attributes:
+        parser      The parser of functions, usually a parser.cache.ParseCache.
+        tiles       The tiles.TileCache curves are sampled from.
+        decimator   The decimate.Decimator curves are reduced with.
+        generation  The generation of the newest request.
+
+    """
+    def __init__(self, parser=None):
+        """Create a pipeline that parses functions with parser.
+
+        parser must have a parse method like human.Parser.  By default, a
+        parser.cache.ParseCache is used.
+
+        """
+        if parser is None:
+            from parser import cache
+            parser = cache.ParseCache()
+        self.parser = parser
+        self.tiles = tiles.TileCache()
+        self.decimator = decimate.Decimator()
+        self.generation = 0
+        self._samplers = None
+        self._lock = threading.Lock()
+
+    def request(self):
+        """Return the generation of a new request, making older ones stale."""
+        with self._lock:
+            self.generation += 1
+            return self.generation
+
+    def cancelled(self, generation):
+        """Return whether the request of generation has become stale."""
+        return generation != self.generation
+
+    def check(self, generation):
+        """Raise Cancelled if the request of generation has become stale."""
+        if self.cancelled(generation):
+            raise Cancelled()
+
+    def run(self, generation, functions, viewport, width):
+        """Return a list of the curves of function strings for drawing.
+
+        The curves cover viewport, plotted width pixels wide.  Errors
+        in functions are raised as the parser raises them.  Cancelled is
+        raised as soon as the request of generation has become stale.
+
+        """
+        samplers = self._group(generation, functions)
+        curves = self.tiles.sample_group(samplers, viewport)
+        self.check(generation)
+        return [self.decimator.decimate(curve, viewport, width) for curve in
+            curves]
+
+    def stream(self, generation, functions, viewport, width):
+        """Generate ever finer curves of function strings for drawing.
+
+        Yields (curves, x_min, x_max) triples, like
+        TileCache.progressive_group: coarse previews first, and the curves
+        of run last.  x_min and x_max are the part of viewport that changed
+        since the previous curves.  Errors and Cancelled are raised as by
+        run, also between curves.
+
+        """
+        samplers = self._group(generation, functions)
+        for curves, x_min, x_max in self.tiles.progressive_group(samplers,
+                viewport):
+            self.check(generation)
+            yield ([self.decimator.decimate(curve, viewport, width) for curve
+                in curves], x_min, x_max)
+            self.check(generation)
+
+    def _group(self, generation, functions):
+        """Return a SamplerGroup of the function strings.
+
+        The samplers of trees that were in the last group are reused.
+
+        """
+        self.check(generation)
+        trees = [self.parser.parse(function) for function in functions]
+        if not trees:
+            raise ValueError("There are no functions to plot.")
+        self.check(generation)
+        known = {}
+        if self._samplers is not None:
+            known = dict((member.tree, member) for member in
+                self._samplers.samplers)
+        self._samplers = group.SamplerGroup([known.get(tree) or
+            sampler.Sampler(tree) for tree in trees])
+        self.check(generation)
+        return self._samplers
@@ -0,0 +1,120 @@
+"""Tests the pipeline module.
+
+Test classes:
+Test_Pipeline
+
+"""
+
+import numpy
+import nose
+from nose import tools
+from expression.binaryop import ProductOp, QuotientOp
+from expression.constant import Constant
+from expression.variable import Variable
+from viewport import Viewport
+import pipeline
+
+x = Variable('x')
+
+class TreeParser(object):
+    """Parse strings by looking them up in a dictionary of trees.
+
+    The parser package cannot be imported by the tests here, as the parser
+    module of the standard library takes its place.
+
+    """
+    def __init__(self, trees):
+        """Set the dictionary of trees."""
+        self.trees = trees
+        self.parsed = 0
+
+    def parse(self, instring):
+        """Return the tree of instring, or raise an Exception."""
+        self.parsed += 1
+        if instring not in self.trees:
+            raise Exception("Syntax error at end of input.")
+        return self.trees[instring]
+
+class Test_Pipeline(object):
+    """Test turning plot requests into curves.
+
+    Ensure the following works as expected:
+        Curves are sampled and decimated for the viewport
+        Parse errors are raised
+        Newer requests make older ones stale
+        The compiled trees are kept between requests
+        Streamed curves end with the curve of run
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.viewport = Viewport(-10, 10, -10, 10)
+
+    def setUp(self):
+        self.parser = TreeParser({'x^2': ProductOp(x, x),
+            '1/x': QuotientOp(Constant(1), x)})
+        self.pipeline = pipeline.Pipeline(self.parser)
+
+    def test_run(self):
+        # Ensure that the curve covers the viewport with few points.
+        generation = self.pipeline.request()
+        curve, = self.pipeline.run(generation, ['1/x'], self.viewport, 100)
+        tools.eq_((curve.x[0], curve.x[-1]), (-10, 10))
+        tools.ok_(len(curve) <= 2 * 102 + 2)
+        tools.eq_(len(curve.segments()), 2)
+        tools.ok_(self.pipeline.decimator.ratio() > 1)
+
+    def test_errors(self):
+        # Ensure that parse errors reach the caller.
+        generation = self.pipeline.request()
+        tools.assert_raises(Exception, self.pipeline.run, generation, ['x^'],
+            self.viewport, 100)
+
+    def test_cancel(self):
+        # Ensure that stale requests are abandoned.
+        old = self.pipeline.request()
+        new = self.pipeline.request()
+        tools.ok_(self.pipeline.cancelled(old))
+        tools.ok_(not self.pipeline.cancelled(new))
+        tools.assert_raises(pipeline.Cancelled, self.pipeline.run, old,
+            ['x^2'], self.viewport, 100)
+        tools.eq_(self.parser.parsed, 0)
+        self.pipeline.run(new, ['x^2'], self.viewport, 100)
+
+    def test_sampler_kept(self):
+        # Ensure that panning reuses the compiled tree and its tiles.
+        self.pipeline.run(self.pipeline.request(), ['x^2'], self.viewport,
+            100)
+        first = self.pipeline._samplers.samplers[0]
+        evaluations = first.evaluations
+        self.pipeline.run(self.pipeline.request(), ['x^2'],
+            Viewport(-6, 14, -10, 10), 100)
+        tools.ok_(self.pipeline._samplers.samplers[0] is first)
+        tools.ok_(first.evaluations - evaluations < evaluations)
+        # Adding a function keeps the sampler of the first.
+        curves = self.pipeline.run(self.pipeline.request(), ['1/x', 'x^2'],
+            self.viewport, 100)
+        tools.ok_(self.pipeline._samplers.samplers[1] is first)
+        tools.eq_([len(curve.segments()) for curve in curves], [2, 1])
+        tools.assert_raises(ValueError, self.pipeline.run,
+            self.pipeline.request(), [], self.viewport, 100)
+
+    def test_stream(self):
+        # Ensure that streaming ends with the full curve, unless cancelled.
+        generation = self.pipeline.request()
+        batches = list(self.pipeline.stream(generation, ['1/x'],
+            self.viewport, 100))
+        tools.ok_(len(batches) > 1)
+        tools.eq_(batches[0][1:], (-10, 10))
+        fresh = pipeline.Pipeline(self.parser)
+        curve, = fresh.run(fresh.request(), ['1/x'], self.viewport, 100)
+        numpy.testing.assert_array_equal(batches[-1][0][0].x, curve.x)
+        numpy.testing.assert_array_equal(batches[-1][0][0].y, curve.y)
+        batches = self.pipeline.stream(self.pipeline.request(), ['x^2'],
+            self.viewport, 100)
+        next(batches)
+        self.pipeline.request()
+        tools.assert_raises(pipeline.Cancelled, next, batches)
+
+if __name__ == '__main__':
+    nose.main()
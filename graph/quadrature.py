@@ -0,0 +1,263 @@
+"""Integrate functions over the x range of a plot.
+
+The area under a curve is found with adaptive Gauss-Kronrod quadrature.
+Every interval is estimated with the 15 point Kronrod rule, and its error
+with the difference from the 7 point Gauss rule on the same points.  All
+the intervals are estimated together, with one evaluation of the tree per
+round for all their points.  Each round halves the intervals with the
+largest errors, just enough of them to make the total error small enough
+if theirs vanished, so that the number of evaluations grows with how hard
+the function is to integrate, not with the size of the range.
+
+Poles (such as those of a QuotientOp) and the edges of the domain of the
+function are found first, by sampling it and checking the intervals where
+it is steep or becomes undefined, like sampler.Sampler.split does.  The
+range is split at them, so that no interval has one inside it.  Where the
+function is undefined, it has no area.  Around a pole of 1 / x or worse,
+the area grows without bound, which is checked for before integrating.
+
+Classes:
+Integrator  Integrate a sampled expression tree
+
+Functions:
+integrate   Return the integral of a tree over a range.
+
+"""
+
+import numpy
+import sampler
+
+# Samples taken to find poles and the edges of the domain.
+SAMPLES = 257
+
+# Intervals between samples that change by more than this fraction of the
+# spread of the samples are checked for a pole or jump.  See sampler.JUMP.
+JUMP = sampler.JUMP
+
+# The number of times an interval is halved to find a pole, jump or edge.
+BISECTIONS = 52
+
+# Intervals the range is split into to start with, besides the breaks.
+INITIAL = 16
+
+# The integral is accurate enough when the estimated error is at most
+# this fraction of it, or at most ABSOLUTE.
+RELATIVE = 1e-10
+ABSOLUTE = 1e-12
+
+# The integral diverges around a break if the function grows there at
+# least as fast as 1 / x^GROWTH, as measured a fraction NEAR of the range
+# away from it.
+GROWTH = 0.99
+NEAR = 1e-6
+
+# The most rounds of halving intervals, and the most intervals.  The error
+# is infinite if the integral is not accurate enough by then.
+ROUNDS = 100
+INTERVALS = 1 << 14
+
+# The positive nodes of the 15 point Kronrod rule, and their weights in it
+# and in the 7 point Gauss rule that uses every other node.
+_KRONROD_NODES = [0.991455371120812639206854697526329,
+    0.949107912342758524526189684047851, 0.864864423359769072789712788640926,
+    0.741531185599394439863864773280788, 0.586087235467691130294144845693013,
+    0.405845151377397166906606412076961, 0.207784955007898467600689403773245,
+    0.0]
+_KRONROD_WEIGHTS = [0.022935322010529224963732008058970,
+    0.063092092629978553290700663189204, 0.104790010322250183839876322541518,
+    0.140653259715525918745189590510238, 0.169004726639267902826583426598550,
+    0.190350578064785409913256402421014, 0.204432940075298892414161999234649,
+    0.209482141084727828012999174891714]
+_GAUSS_WEIGHTS = [0.0, 0.129484966168869693270611432679082, 0.0,
+    0.279705391489276667901467771423780, 0.0,
+    0.381830050505118944950369775488975, 0.0,
+    0.417959183673469387755102040816327]
+
+def _symmetric(values, sign):
+    """Return the values for the negative nodes and then the positive ones.
+
+    The node 0 comes last in values, and only once in the result.
+
+    """
+    values = numpy.array(values)
+    return numpy.concatenate((sign * values, values[-2::-1]))
+
+NODES = _symmetric(_KRONROD_NODES, -1)
+KRONROD = _symmetric(_KRONROD_WEIGHTS, 1)
+GAUSS = _symmetric(_GAUSS_WEIGHTS, 1)
+
+class Integrator(object):
+    """Integrate a sampled expression tree.
+
+    Methods:
+        __init__(self, member)
+            Integrate the tree of a sampler.
+
+        integrate(self, x_min, x_max)
+            Return the integral of the tree over a range, and its error.
+
+        breaks(self, x_min, x_max)
+            Return the poles, jumps and edges of the domain in a range.
+
+    Attributes:
+        sampler  The sampler.Sampler of the tree, which counts its
+                 evaluations.
+
+    """
+    def __init__(self, member):
+        """Integrate the tree of member, a sampler.Sampler."""
+        self.sampler = member
+
+    def integrate(self, x_min, x_max):
+        """Return the integral of the tree from x_min to x_max.
+
+        Returns the integral and an estimate of its absolute error, which
+        is infinite if it did not converge.  The integral is NaN if it
+        diverges around a pole.  It is negative if x_max is less than x_min.
+
+        """
+        if x_max < x_min:
+            value, error = self.integrate(x_max, x_min)
+            return -value, error
+        if x_max == x_min:
+            return 0.0, 0.0
+        breaks = self.breaks(x_min, x_max)
+        if self._diverges(breaks, NEAR * (x_max - x_min)):
+            return float('nan'), float('inf')
+        edges = numpy.union1d(numpy.linspace(x_min, x_max, INITIAL + 1),
+            breaks)
+        low, high = edges[:-1], edges[1:]
+        # Intervals over which the tree is undefined have no area.
+        middle = self.sampler.evaluate((low + high) / 2)
+        low, high = low[~numpy.isnan(middle)], high[~numpy.isnan(middle)]
+        estimate, spread = self._estimate(low, high)
+        for i in range(ROUNDS):
+            total = estimate.sum()
+            error = spread.sum()
+            excess = error - max(ABSOLUTE, RELATIVE * abs(total))
+            if excess <= 0:
+                return total, error
+            if len(low) > INTERVALS:
+                break
+            # Halve the intervals with the largest errors, as few as would
+            # bring the error within the tolerance if theirs vanished.
+            order = numpy.argsort(-spread)
+            halved = order[:numpy.searchsorted(numpy.cumsum(spread[order]),
+                excess) + 1]
+            kept = numpy.ones(len(low), dtype=bool)
+            kept[halved] = False
+            middle = (low[halved] + high[halved]) / 2
+            new_low = numpy.concatenate((low[halved], middle))
+            new_high = numpy.concatenate((middle, high[halved]))
+            new_estimate, new_spread = self._estimate(new_low, new_high)
+            low = numpy.concatenate((low[kept], new_low))
+            high = numpy.concatenate((high[kept], new_high))
+            estimate = numpy.concatenate((estimate[kept], new_estimate))
+            spread = numpy.concatenate((spread[kept], new_spread))
+        return estimate.sum(), float('inf')
+
+    def breaks(self, x_min, x_max):
+        """Return a sorted array of where the tree breaks in a range.
+
+        The tree is sampled from x_min to x_max.  Poles and jumps are found
+        between samples that are far apart vertically, with
+        sampler.Sampler.find_breaks, and the edges of the domain between
+        samples where the tree becomes undefined.
+
+        """
+        x = numpy.linspace(x_min, x_max, SAMPLES)
+        y = self.sampler.evaluate(x)
+        defined = ~numpy.isnan(y)
+        if not defined.any():
+            return numpy.zeros(0)
+        low, high = numpy.percentile(y[defined], [5, 95])
+        with numpy.errstate(invalid='ignore'):
+            steep = numpy.flatnonzero(numpy.abs(numpy.diff(y)) > JUMP *
+                (high - low))
+        broken, where = self.sampler.find_breaks(x[steep], x[steep + 1],
+            y[steep], y[steep + 1], BISECTIONS)
+        # Around a pole of an even power, such as that of 1 / x^2, the tree
+        # has the same sign on both sides, and find_breaks can miss it.
+        size = numpy.abs(y)
+        with numpy.errstate(invalid='ignore'):
+            peaks = 1 + numpy.flatnonzero((size[1:-1] > size[:-2]) &
+                (size[1:-1] >= size[2:]) & (y[:-2] * y[1:-1] > 0) &
+                (y[1:-1] * y[2:] > 0))
+        peaks = peaks[numpy.in1d(peaks, steep) | numpy.in1d(peaks - 1, steep)]
+        edges = numpy.flatnonzero(defined[:-1] != defined[1:])
+        found = numpy.concatenate((where[broken], self._peaks(x[peaks - 1],
+            x[peaks + 1]), self._edges(x[edges], x[edges + 1],
+            defined[edges])))
+        return numpy.unique(found)
+
+    def _peaks(self, low, high):
+        """Return where the size of the tree is largest between low and high.
+
+        Both are arrays, and the tree must grow and then shrink in size
+        between each low and high.  Undefined values count as infinite.
+
+        """
+        for i in range(2 * BISECTIONS):
+            third = (high - low) / 3
+            left = numpy.abs(self.sampler.evaluate(low + third))
+            right = numpy.abs(self.sampler.evaluate(high - third))
+            left[numpy.isnan(left)] = numpy.inf
+            right[numpy.isnan(right)] = numpy.inf
+            rising = left < right
+            low = numpy.where(rising, low + third, low)
+            high = numpy.where(rising, high, high - third)
+        return (low + high) / 2
+
+    def _edges(self, low, high, defined):
+        """Return where the tree becomes undefined between low and high.
+
+        All arguments are arrays; the tree is defined at every low where
+        defined is true, and at every high where it is false.
+
+        """
+        for i in range(BISECTIONS):
+            middle = (low + high) / 2
+            same = ~numpy.isnan(self.sampler.evaluate(middle)) == defined
+            low = numpy.where(same, middle, low)
+            high = numpy.where(same, high, middle)
+        return (low + high) / 2
+
+    def _diverges(self, breaks, distance):
+        """Return whether the tree grows too fast to integrate at a break.
+
+        The tree is evaluated on both sides of every break, distance and
+        half of it away, and its growth between them compared to GROWTH.
+
+        """
+        x = breaks[:, numpy.newaxis] + distance * numpy.array([-1, -0.5,
+            0.5, 1])
+        y = numpy.abs(self.sampler.evaluate(x))
+        with numpy.errstate(all='ignore'):
+            return bool((numpy.log2(y[:, 1:3] / y[:, ::3]) >= GROWTH).any())
+
+    def _estimate(self, low, high):
+        """Return arrays of the integrals over intervals, and their errors.
+
+        The integral over each interval from low to high is estimated with
+        the Kronrod rule, and its error with the Gauss rule.  The tree is
+        evaluated once for the nodes of all the intervals, and counts as
+        zero where it is undefined.
+
+        """
+        half = (high - low) / 2
+        x = ((low + high) / 2)[:, numpy.newaxis] + half[:, numpy.newaxis] * \
+            NODES
+        y = self.sampler.evaluate(x)
+        y[numpy.isnan(y)] = 0
+        kronrod = half * y.dot(KRONROD)
+        return kronrod, numpy.abs(kronrod - half * y.dot(GAUSS))
+
+def integrate(tree, x_min, x_max, variable='x'):
+    """Return the integral of tree from x_min to x_max, and its error.
+
+    See Integrator.integrate.  Use an Integrator to integrate the same tree
+    repeatedly, so that it is only compiled once.
+
+    """
+    return Integrator(sampler.Sampler(tree, variable)).integrate(x_min,
+        x_max)
@@ -0,0 +1,98 @@
+"""Tests the quadrature module.
+
+Test classes:
+Test_Integrator
+
+"""
+
+import numpy
+import nose
+from nose import tools
+from expression.binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp
+from expression.binaryop import PowerOp
+from expression.unaryop import LogarithmOp
+from expression.constant import Constant
+from expression.variable import Variable
+import sampler
+import quadrature
+
+x = Variable('x')
+
+def lorentzian(width):
+    """Return 1 / (1 + (x / width)^2), a peak of the given width."""
+    return QuotientOp(Constant(1), SumOp(Constant(1), ProductOp(Constant(
+        width ** -2), ProductOp(x, x))))
+
+class Test_Integrator(object):
+    """Test integrating functions.
+
+    Ensure the following works as expected:
+        Polynomials are integrated exactly
+        Smooth functions are integrated to within the tolerance
+        Functions undefined over part of the range have no area there
+        Integrable singularities at poles and edges converge
+        Integrals that diverge at a pole are NaN, with an infinite error
+        Reversed ranges give the negative integral
+        Harder functions take more evaluations
+
+    """
+    def test_polynomial(self):
+        # Ensure that the Kronrod rule is exact for a quintic.
+        tree = SumOp(DifferenceOp(PowerOp(x, Constant(5)), ProductOp(Constant(
+            5), PowerOp(x, Constant(3)))), ProductOp(Constant(4), x))
+        value, error = quadrature.integrate(tree, 0, 3)
+        tools.assert_almost_equal(value, 3 ** 6 / 6.0 - 5 * 3 ** 4 / 4.0 +
+            18, places=12)
+        tools.ok_(error < 1e-12)
+
+    def test_smooth(self):
+        # Ensure that the error estimate bounds the true error.
+        for width in [1, 0.01]:
+            value, error = quadrature.integrate(lorentzian(width), -10, 10)
+            exact = 2 * width * numpy.arctan(10 / width)
+            tools.ok_(abs(value - exact) <= max(error, 1e-14))
+            tools.ok_(error <= quadrature.RELATIVE * exact)
+
+    def test_domain(self):
+        # Ensure that log x only counts from 0.
+        value, error = quadrature.integrate(LogarithmOp(x), -1, 2)
+        tools.assert_almost_equal(value, 2 * numpy.log(2) - 2, places=9)
+        tools.eq_(quadrature.integrate(LogarithmOp(x), -2, -1), (0.0, 0.0))
+
+    def test_singular(self):
+        # Ensure that 1 / sqrt(x) and 1 / sqrt|x - 0.3| converge.
+        value, error = quadrature.integrate(PowerOp(x, Constant(-0.5)), 0, 4)
+        tools.assert_almost_equal(value, 4, places=8)
+        difference = DifferenceOp(x, Constant(0.3))
+        value, error = quadrature.integrate(PowerOp(ProductOp(difference,
+            difference), Constant(-0.25)), -1, 4)
+        tools.assert_almost_equal(value, 2 * 1.3 ** 0.5 + 2 * 3.7 ** 0.5,
+            places=6)
+
+    def test_poles(self):
+        # Ensure that poles of odd and even powers are found to diverge.
+        difference = DifferenceOp(x, Constant(0.3))
+        for tree in [QuotientOp(Constant(1), x), QuotientOp(Constant(1),
+                difference), PowerOp(difference, Constant(-2))]:
+            value, error = quadrature.integrate(tree, -1, 2)
+            tools.ok_(numpy.isnan(value))
+            tools.eq_(error, float('inf'))
+
+    def test_reversed(self):
+        # Ensure that swapping the bounds negates the integral.
+        value, error = quadrature.integrate(ProductOp(x, x), 2, -1)
+        tools.assert_almost_equal(value, -3, places=12)
+        tools.eq_(quadrature.integrate(x, 1, 1), (0.0, 0.0))
+
+    def test_adaptive(self):
+        # Ensure that a narrow peak costs more evaluations than a wide one,
+        # and few more than sampling for breaks.
+        counts = []
+        for width in [1, 0.001]:
+            member = sampler.Sampler(lorentzian(width))
+            quadrature.Integrator(member).integrate(-10, 10)
+            counts.append(member.evaluations)
+        tools.ok_(counts[0] < counts[1] < 20 * quadrature.SAMPLES)
+
+if __name__ == '__main__':
+    nose.main()
@@ -0,0 +1,382 @@
+"""Draw plots into arrays of pixels, without Qt.
+
+Plots rendered in batch jobs have no display to draw on, so they are drawn
+with NumPy instead: a Raster is an array of RGBA pixels, and lines are drawn
+antialiased with the algorithm of Xiaolin Wu, for all of them at once.  Each
+line covers the two pixels nearest to it in every column (or row, if it is
+steep), in proportion to how near it passes.  Lines are first clipped to
+the image, so that a line to a point far outside it (near a pole) takes no
+more steps than one across it.
+
+All the curves of a plot are drawn in one pass, a chunk of lines and a
+group of steps along them at a time, into the one preallocated array, so
+that long or dense curves take no more memory than short ones.  The
+coverage of the lines of a curve is added up before it is blended, so that
+lines meeting at a point cover it exactly once.
+
+Classes:
+Raster     Image of RGBA pixels that plots are drawn on
+
+Functions:
+to_pixels  Return the pixel coordinates of points of the plane.
+
+"""
+
+import numpy
+import axes
+
+# Points are drawn at most this many heights of the viewport above or below
+# it.  See canvas.REACH.
+REACH = 100
+
+# Points of a curve that are drawn or written at a time.
+CHUNK = 4096
+
+# Steps along lines that are drawn at a time.  Every step covers two pixels
+# and takes a dozen temporary arrays, and a line may take as many steps as
+# the width plus the height of the image, so lines are drawn in groups of
+# about this many steps, however long they are, to bound the memory used.
+STEPS = 1 << 15
+
+# Cover is added up pixel by pixel, rather than over the range of pixels
+# it falls in, if that range is this many times longer than its pixels.
+SPARSE = 16
+
+# Colours of the curves, in turn, and of the background, the axes and the
+# gridlines, as RGB triples.  The curves have the colours of canvas.CURVES.
+# Colours may also be given as RGBA; RGB colours are opaque.
+CURVES = [(0, 0, 128), (128, 0, 0), (0, 128, 0), (128, 0, 128),
+    (0, 128, 128), (128, 128, 0)]
+BACKGROUND = (255, 255, 255)
+AXES = (0, 0, 0)
+GRID = (224, 224, 224)
+
+def to_pixels(x, y, viewport, width, height):
+    """Return arrays of the pixel coordinates of points x and y.
+
+    The plane is mapped onto width x height pixels, with viewport covering
+    them from the top left corner (x_min, y_max).  The centre of pixel
+    (i, j) is at (i, j).  y is clipped to REACH heights of the viewport
+    around it, and stays NaN where it is NaN.
+
+    """
+    reach = REACH * viewport.height()
+    with numpy.errstate(invalid='ignore'):
+        y = numpy.clip(y, viewport.y_min - reach, viewport.y_max + reach)
+    columns = (numpy.asarray(x) - viewport.x_min) * (width /
+        viewport.width()) - 0.5
+    rows = (viewport.y_max - y) * (height / viewport.height()) - 0.5
+    return columns, rows
+
+def _rgba(colour):
+    """Return colour as an RGBA array, opaque if it is an RGB triple."""
+    return numpy.array(tuple(colour) + (255,) * (4 - len(colour)),
+        dtype=float)
+
+class _Coverage(object):
+    """How much the lines of one curve cover each pixel of an image.
+
+    Pixels are indexed in the order of columns, so that the lines of a
+    chunk of a curve, which is narrow, cover a short range of indices.
+    Cover is added up over that range, or, if it has few pixels for its
+    length, over just those pixels, to avoid touching the whole range.
+
+    Methods:
+        __init__(self, size)
+            Create the coverage of size pixels, all uncovered.
+
+        add(self, pixels, cover)
+            Add cover to pixels.
+
+        take(self)
+            Return the pixels covered and their cover, and clear them.
+
+    """
+    def __init__(self, size):
+        """Create the coverage of size pixels, all uncovered."""
+        self.values = numpy.zeros(size)
+        # The range added up densely, and the pixels added sparsely.
+        self._span = [size, 0]
+        self._pixels = []
+
+    def add(self, pixels, cover):
+        """Add cover to pixels, arrays of indices and of cover."""
+        if not len(pixels):
+            return
+        low = pixels.min()
+        high = pixels.max() + 1
+        if len(pixels) * SPARSE < high - low:
+            pixels, inverse = numpy.unique(pixels, return_inverse=True)
+            self.values[pixels] += numpy.bincount(inverse, cover)
+            self._pixels.append(pixels)
+        else:
+            self.values[low:high] += numpy.bincount(pixels - low, cover,
+                minlength=high - low)
+            self._span = [min(self._span[0], low), max(self._span[1], high)]
+
+    def take(self):
+        """Return the pixels covered and their cover, and clear them."""
+        low, high = self._span
+        if low < high:
+            self._pixels.append(low + numpy.flatnonzero(
+                self.values[low:high]))
+        if len(self._pixels) == 1:
+            pixels = self._pixels[0]
+        else:
+            pixels = numpy.unique(numpy.concatenate(self._pixels or
+                [numpy.zeros(0, dtype=int)]))
+        cover = self.values[pixels]
+        self.values[pixels] = 0
+        self._span = [self.values.size, 0]
+        self._pixels = []
+        return pixels, cover
+
+class Raster(object):
+    """Image of RGBA pixels that plots are drawn on.
+
+    Methods:
+        __init__(self, width, height, background=BACKGROUND)
+            Create an image filled with background.
+
+        draw_grid(self, viewport)
+            Draw the gridlines and the axes of viewport.
+
+        draw_curve(self, curve, viewport, colour)
+            Draw a sampler.Curve.
+
+        draw_curves(self, curves, viewport, colours)
+            Draw several sampler.Curves in one pass.
+
+        draw_lines(self, x0, y0, x1, y1, colour)
+            Draw lines between points given in pixels.
+
+    Attributes:
+        width   The width of the image in pixels.
+        height  The height of the image in pixels.
+        pixels  uint8 array of shape (height, width, 4).
+
+    """
+    def __init__(self, width, height, background=BACKGROUND):
+        """Create a width x height image filled with background."""
+        if width < 1 or height < 1:
+            raise ValueError("An image must be at least one pixel.")
+        self.width = width
+        self.height = height
+        self.pixels = numpy.empty((height, width, 4), dtype=numpy.uint8)
+        # Broadcasting a row is much faster than broadcasting a colour.
+        self.pixels[...] = numpy.array([_rgba(background)] * width,
+            dtype=numpy.uint8)
+
+    def draw_grid(self, viewport):
+        """Draw the gridlines of viewport, as chosen by axes, and its axes.
+
+        The axes are drawn at the edge if the origin is out of view.  Both
+        are drawn a pixel wide, without antialiasing.
+
+        """
+        x_ticks = axes.ticks(viewport.x_min, viewport.x_max,
+            axes.step(viewport.width(), self.width))
+        y_ticks = axes.ticks(viewport.y_min, viewport.y_max,
+            axes.step(viewport.height(), self.height))
+        columns, rows = to_pixels(x_ticks, y_ticks, viewport, self.width,
+            self.height)
+        columns = numpy.floor(columns + 0.5).astype(int)
+        rows = numpy.floor(rows + 0.5).astype(int)
+        grid = _rgba(GRID)
+        self.pixels[:, columns[(columns >= 0) & (columns < self.width)]] = grid
+        self.pixels[rows[(rows >= 0) & (rows < self.height)]] = grid
+        column, row = to_pixels(0.0, 0.0, viewport, self.width, self.height)
+        column = min(max(0, int(numpy.floor(column + 0.5))), self.width - 1)
+        row = min(max(0, int(numpy.floor(row + 0.5))), self.height - 1)
+        self.pixels[:, column] = _rgba(AXES)
+        self.pixels[row] = _rgba(AXES)
+
+    def draw_curve(self, curve, viewport, colour):
+        """Draw the lines between the points of each segment of curve."""
+        self.draw_curves([curve], viewport, [colour])
+
+    def draw_curves(self, curves, viewport, colours):
+        """Draw the lines of each of curves in the matching colour.
+
+        The lines of all the curves are drawn together, about CHUNK at a
+        time, and each curve is blended over those before it.
+
+        """
+        coverage = _Coverage(self.width * self.height)
+        current = None
+        for x0, y0, x1, y1, owner in self._lines(curves, viewport):
+            for pixels, cover, line in self._fragments(x0, y0, x1, y1):
+                owners = owner[line]
+                # Fragments are in the order of their lines, and so of
+                # curves.
+                for i in numpy.unique(owners):
+                    start, stop = numpy.searchsorted(owners, [i, i + 1])
+                    if i != current and current is not None:
+                        self._blend(*coverage.take() + (colours[current],))
+                    current = i
+                    coverage.add(pixels[start:stop], cover[start:stop])
+        if current is not None:
+            self._blend(*coverage.take() + (colours[current],))
+
+    def draw_lines(self, x0, y0, x1, y1, colour):
+        """Draw the lines from (x0, y0) to (x1, y1) in colour.
+
+        The arguments are arrays of pixel coordinates, one element per
+        line.  Lines are clipped to the image, and drawn antialiased.
+
+        """
+        coverage = _Coverage(self.width * self.height)
+        for pixels, cover, line in self._fragments(x0, y0, x1, y1):
+            coverage.add(pixels, cover)
+        self._blend(*coverage.take() + (colour,))
+
+    def _lines(self, curves, viewport):
+        """Yield the lines between the points of curves, in pixels.
+
+        Lines are yielded about CHUNK at a time, in the order of curves, as
+        arrays x0, y0, x1, y1 and the index of the curve of every line.
+        Lines to and from NaN points are left out.
+
+        """
+        pieces = []
+        count = 0
+        for i, curve in enumerate(curves):
+            for start in range(0, max(len(curve.x) - 1, 1), CHUNK):
+                # Chunks overlap by a point, for the line between them.
+                stop = start + CHUNK + 1
+                columns, rows = to_pixels(curve.x[start:stop],
+                    curve.y[start:stop], viewport, self.width, self.height)
+                joined = ~numpy.isnan(rows[:-1]) & ~numpy.isnan(rows[1:])
+                pieces.append((columns[:-1][joined], rows[:-1][joined],
+                    columns[1:][joined], rows[1:][joined],
+                    numpy.repeat(i, joined.sum())))
+                count += len(pieces[-1][0])
+                if count >= CHUNK:
+                    yield [numpy.concatenate(a) for a in zip(*pieces)]
+                    pieces = []
+                    count = 0
+        if count:
+            yield [numpy.concatenate(a) for a in zip(*pieces)]
+
+    def _fragments(self, x0, y0, x1, y1):
+        """Yield the pixels covered by lines, about STEPS steps at a time.
+
+        Yields the indices of the pixels in the order of columns (x *
+        height + y), how much of each is covered (from 0 to 1) and the index
+        of the line covering it, in the order of the lines.  A pixel is
+        yielded once for every line covering it.
+
+        """
+        x0, y0, x1, y1, kept = self._clip(x0, y0, x1, y1)
+        # A line takes at most two steps more than its longer side.
+        steps = numpy.cumsum(numpy.maximum(numpy.abs(x1 - x0),
+            numpy.abs(y1 - y0)) + 2)
+        if not len(steps):
+            return
+        cuts = numpy.unique(numpy.concatenate(([0], numpy.searchsorted(steps,
+            numpy.arange(STEPS, steps[-1], STEPS)), [len(steps)])))
+        for start, stop in zip(cuts[:-1], cuts[1:]):
+            pixels, cover, line = self._wu(x0[start:stop], y0[start:stop],
+                x1[start:stop], y1[start:stop])
+            yield pixels, cover, kept[start + line]
+
+    def _wu(self, x0, y0, x1, y1):
+        """Return the pixels covered by lines, by the algorithm of Wu.
+
+        The lines must have been clipped.  Returns the pixels and their
+        cover like _fragments, and the index of the line covering each.
+
+        """
+        # Step along the longer axis u of every line; v is the other axis,
+        # and v = intercept + gradient * u along the line.
+        steep = numpy.abs(y1 - y0) > numpy.abs(x1 - x0)
+        u0, v0 = numpy.where(steep, y0, x0), numpy.where(steep, x0, y0)
+        u1, v1 = numpy.where(steep, y1, x1), numpy.where(steep, x1, y1)
+        low = numpy.minimum(u0, u1)
+        high = numpy.maximum(u0, u1)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            gradient = numpy.where(u1 != u0, (v1 - v0) / (u1 - u0), 0)
+        intercept = v0 - gradient * u0
+        first = numpy.floor(low + 0.5)
+        steps = (numpy.floor(high + 0.5) - first).astype(int) + 1
+        line = numpy.repeat(numpy.arange(len(steps)), steps)
+        u = numpy.arange(len(line)) + numpy.repeat(first - (numpy.cumsum(
+            steps) - steps), steps)
+        # The length of the line within the column of every step, which is
+        # less than a pixel at its ends.
+        length = (numpy.minimum(high[line], u + 0.5) -
+            numpy.maximum(low[line], u - 0.5))
+        v = intercept[line] + gradient[line] * u
+        below = numpy.floor(v)
+        fraction = v - below
+        # The pixels either side of every step, kept in the order of lines.
+        u = numpy.repeat(u, 2)
+        v = (below[:, numpy.newaxis] + (0, 1)).ravel()
+        cover = numpy.column_stack((length * (1 - fraction),
+            length * fraction)).ravel()
+        line = numpy.repeat(line, 2)
+        steep = steep[line]
+        x = numpy.where(steep, v, u).astype(int)
+        y = numpy.where(steep, u, v).astype(int)
+        inside = ((cover > 0) & (x >= 0) & (x < self.width) & (y >= 0) &
+            (y < self.height))
+        return (x * self.height + y)[inside], cover[inside], line[inside]
+
+    def _blend(self, pixels, cover, colour):
+        """Blend colour over pixels, given as indices in column order.
+
+        Pixels are covered at most once, however much cover they have.
+
+        """
+        colour = _rgba(colour)
+        alpha = (numpy.minimum(cover, 1) * colour[3] + 0.5).astype(
+            numpy.uint16)[:, numpy.newaxis]
+        colour[3] = 255
+        columns, rows = numpy.divmod(pixels, self.height)
+        pixels = rows * self.width + columns
+        # Pixels are moved as 32-bit words and blended in 16-bit integers,
+        # which hold 255 * 255, for speed.
+        words = self.pixels.view(numpy.uint32).reshape(-1)
+        target = words.take(pixels).view(numpy.uint8).reshape(-1, 4).astype(
+            numpy.uint16)
+        target *= 255 - alpha
+        target += colour.astype(numpy.uint16) * alpha + 127
+        # Division by 255, exact for numbers below 2 ** 16.
+        target += (target >> 8) + 1
+        target >>= 8
+        words[pixels] = target.astype(numpy.uint8).view(numpy.uint32).reshape(
+            -1)
+
+    def _clip(self, x0, y0, x1, y1):
+        """Return the parts of lines inside the image, extended by a pixel.
+
+        Lines are clipped with the algorithm of Liang and Barsky, for all of
+        them at once.  Lines entirely outside are dropped; the indices of
+        those kept are returned after their ends.
+
+        """
+        x0, y0, x1, y1 = [numpy.asarray(a, dtype=float) for a in
+            (x0, y0, x1, y1)]
+        # Most lines are inside the image, with nothing to clip.
+        if not len(x0) or (min(x0.min(), x1.min()) >= -1 and
+                max(x0.max(), x1.max()) <= self.width and
+                min(y0.min(), y1.min()) >= -1 and
+                max(y0.max(), y1.max()) <= self.height):
+            return x0, y0, x1, y1, numpy.arange(len(x0))
+        dx = x1 - x0
+        dy = y1 - y0
+        t0 = numpy.zeros(len(x0))
+        t1 = numpy.ones(len(x0))
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            for p, q in ((-dx, x0 + 1), (dx, self.width - x0),
+                    (-dy, y0 + 1), (dy, self.height - y0)):
+                t = q / p
+                t0 = numpy.where(p < 0, numpy.maximum(t0, t), t0)
+                t1 = numpy.where(p > 0, numpy.minimum(t1, t), t1)
+                # Parallel to this edge and outside it.
+                t1 = numpy.where((p == 0) & (q < 0), -1, t1)
+        kept = numpy.flatnonzero(t0 <= t1)
+        t0, t1 = t0[kept], t1[kept]
+        x0, y0, dx, dy = x0[kept], y0[kept], dx[kept], dy[kept]
+        return (x0 + t0 * dx, y0 + t0 * dy, x0 + t1 * dx, y0 + t1 * dy,
+            kept)
@@ -0,0 +1,140 @@
+"""Tests the raster module.
+
+Test classes:
+Test_Raster
+
+"""
+
+import numpy
+import nose
+from nose import tools
+from viewport import Viewport
+import sampler
+import raster
+
+BLACK = (0, 0, 0)
+
+class Test_Raster(object):
+    """Test drawing into arrays of pixels.
+
+    Ensure the following works as expected:
+        Points of the plane are mapped onto pixel centres
+        Lines cover the pixels nearest to them, antialiased
+        Lines meeting at a point cover it once, and curves blend in turn
+        Lines far outside the image are clipped
+        Curves break at NaN points
+        Curves drawn in chunks or groups of steps are drawn the same
+        Gridlines and axes are drawn
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.viewport = Viewport(-10, 10, -10, 10)
+
+    def test_to_pixels(self):
+        # Ensure that the corners of the viewport are the corners of pixels.
+        columns, rows = raster.to_pixels(numpy.array([-10, 10, 0]),
+            numpy.array([10, -10, 1e300]), self.viewport, 20, 10)
+        numpy.testing.assert_array_equal(columns, [-0.5, 19.5, 9.5])
+        numpy.testing.assert_array_equal(rows[:2], [-0.5, 9.5])
+        tools.eq_(rows[2], -0.5 - raster.REACH * 10)
+
+    def test_lines(self):
+        # Ensure that lines cover the pixels nearest to them, by nearness.
+        image = raster.Raster(20, 10)
+        image.draw_lines([0, 3], [2, 0.75], [19.5, 8], [2, 0.75], BLACK)
+        ink = 255 - image.pixels[..., 0].astype(int)
+        tools.eq_(ink[2].tolist(), [128] + [255] * 19)
+        tools.eq_(ink[[1, 3], 9:].sum(), 0)
+        tools.eq_(ink[:, 5].tolist(), [64, 191, 255] + [0] * 7)
+        tools.ok_((image.pixels[..., 3] == 255).all())
+
+    def test_steep(self):
+        # Ensure that steep lines step along rows, and diagonals are even.
+        image = raster.Raster(20, 20)
+        image.draw_lines([3], [0], [4], [19], BLACK)
+        ink = 255 - image.pixels[..., 0].astype(int)
+        tools.eq_((ink[:, 3] + ink[:, 4]).tolist(), [128] + [255] * 18 +
+            [128])
+        tools.ok_(ink[1, 3] > ink[1, 4] and ink[18, 3] < ink[18, 4])
+        image = raster.Raster(20, 20)
+        image.draw_lines([0], [0], [19], [19], BLACK)
+        ink = 255 - image.pixels[..., 0].astype(int)
+        numpy.testing.assert_array_equal(ink.diagonal()[1:19], 255)
+        tools.eq_(ink.sum(), 255 * 18 + 128 * 2)
+
+    def test_joins(self):
+        # Ensure that lines meeting at a point cover it exactly once.
+        image = raster.Raster(20, 10)
+        image.draw_lines([0, 10], [5, 5], [10, 19], [5, 5], BLACK)
+        tools.eq_(image.pixels[5, 10, 0], 0)
+        # Ensure that curves are blended in turn, with their alpha.
+        image = raster.Raster(20, 10)
+        image.draw_curves([sampler.Curve(numpy.array([-10, 0, 10.0]),
+            numpy.ones(3)), sampler.Curve(numpy.array([0, 10.0]),
+            numpy.ones(2))], self.viewport, [(255, 0, 0, 128), (0, 0, 255)])
+        tools.eq_(image.pixels[4, 5].tolist(), [255, 127, 127, 255])
+        tools.eq_(image.pixels[4, 15].tolist(), [0, 0, 255, 255])
+
+    def test_clip(self):
+        # Ensure that lines far outside the image are clipped and cheap.
+        image = raster.Raster(20, 10)
+        image.draw_lines([5, 0], [-1e9, -5], [5, 19], [1e9, -5], BLACK)
+        drawn = (image.pixels[..., :3] == 0).all(axis=2)
+        tools.eq_(drawn.sum(), 10)
+        tools.ok_(drawn[:, 5].all())
+        x0, y0, x1, y1, kept = image._clip(numpy.array([5.0, 0]),
+            numpy.array([-1e9, -5]), numpy.array([5.0, 19]),
+            numpy.array([1e9, -5]))
+        numpy.testing.assert_almost_equal([y0[0], y1[0]], [-1, 10])
+        tools.eq_(kept.tolist(), [0])
+
+    def test_curve(self):
+        # Ensure that no line is drawn across a NaN point.
+        image = raster.Raster(20, 20)
+        curve = sampler.Curve(numpy.array([-9.5, -1.5, 0.5, 1.5, 9.5]),
+            numpy.array([0.5, 0.5, numpy.nan, 0.5, 0.5]))
+        image.draw_curve(curve, self.viewport, BLACK)
+        ink = 255 - image.pixels[..., 0].astype(int)
+        tools.eq_(ink[9, 7:13].tolist(), [255, 128, 0, 0, 128, 255])
+        tools.eq_(ink.sum(), 255 * 14 + 128 * 4)
+
+    def test_chunks(self):
+        # Ensure that chunks join up, and break at NaN points across them.
+        x = numpy.linspace(-10, 10, 101)
+        y = 8 * numpy.sin(x)
+        y[[30, 31, 33, 60]] = numpy.nan
+        curve = sampler.Curve(x, y)
+        whole = raster.Raster(40, 30)
+        whole.draw_curve(curve, self.viewport, BLACK)
+        saved = raster.CHUNK
+        raster.CHUNK = 3
+        try:
+            chunked = raster.Raster(40, 30)
+            chunked.draw_curve(curve, self.viewport, BLACK)
+        finally:
+            raster.CHUNK = saved
+        numpy.testing.assert_array_equal(chunked.pixels, whole.pixels)
+        # Groups of steps split the lines of a chunk, and those of curves.
+        other = sampler.Curve(x, -y)
+        whole.draw_curves([curve, other], self.viewport, raster.CURVES)
+        saved = raster.STEPS
+        raster.STEPS = 5
+        try:
+            chunked.draw_curves([curve, other], self.viewport, raster.CURVES)
+        finally:
+            raster.STEPS = saved
+        numpy.testing.assert_array_equal(chunked.pixels, whole.pixels)
+
+    def test_grid(self):
+        # Ensure that the axes and gridlines are drawn.
+        image = raster.Raster(200, 200)
+        image.draw_grid(self.viewport)
+        numpy.testing.assert_array_equal(image.pixels[:, 100, :3], 0)
+        numpy.testing.assert_array_equal(image.pixels[100, :, :3], 0)
+        numpy.testing.assert_array_equal(image.pixels[:100, 150, :3], 224)
+        numpy.testing.assert_array_equal(image.pixels[3, 3], 255)
+        tools.assert_raises(ValueError, raster.Raster, 0, 10)
+
+if __name__ == '__main__':
+    nose.main()
@@ -0,0 +1,228 @@
+"""Sample functions into arrays of points for plotting.
+
+Everything that plots a function (the window, exports, batch jobs) gets its
+points from here.  A Sampler compiles a parsed expression tree once, with
+Expression.compile(array=True), and evaluates it for a whole array of x
+values per call.  The result is a Curve: two contiguous float arrays of x
+and y values.
+
+A curve is drawn by joining consecutive points with lines, except where it
+is broken: y is NaN where the function is undefined or infinite, and a NaN
+point is inserted between two samples on either side of a pole (such as 1/x
+at 0) or a jump, so that no line is drawn across it.
+
+The points of one curve never take more than a fixed number of bytes (the
+budget).  If more samples are asked for, fewer are taken.
+
+Classes:
+Curve    Sampled points of a function
+Sampler  Sample an expression tree over viewports
+
+Functions:
+sample   Return the Curve of a tree in a viewport.
+
+"""
+
+import numpy
+from expression.variable import Variable
+
+# Default limit on the size of the arrays of one curve, in bytes.
+BUDGET = 1 << 16
+
+# Size of one point in bytes: a float for x and one for y.
+POINT_BYTES = 16
+
+# Default number of samples of a curve.
+SAMPLES = 2001
+
+# Consecutive samples further apart than this fraction of the height of the
+# viewport are checked for a discontinuity between them.
+JUMP = 0.05
+
+# The number of times such an interval is halved while checking it.
+BISECTIONS = 24
+
+class Curve(object):
+    """Sampled points of a function.
+
+    x is sorted.  Points whose y is NaN are not drawn, and split the curve
+    into segments: lines are drawn between consecutive points of a segment.
+
+    Methods:
+        __init__(self, x, y)
+            Set the points.
+
+        segments(self)
+            Return the index ranges of the segments.
+
+        nbytes(self)
+            Return the size of the arrays in bytes.
+
+        __len__(self)
+            Return the number of points.
+
+    Attributes:
+        x  float array of x values
+        y  float array of y values, NaN between segments
+
+    """
+    def __init__(self, x, y):
+        """Set the points from two arrays of equal length."""
+        if len(x) != len(y):
+            raise ValueError("x and y must have the same length.")
+        self.x = x
+        self.y = y
+
+    def segments(self):
+        """Return a list of (start, stop) pairs, one per segment.
+
+        The points of a segment are x[start:stop] and y[start:stop].
+
+        """
+        defined = numpy.concatenate(([0], ~numpy.isnan(self.y), [0]))
+        edges = numpy.diff(defined.astype(numpy.int8))
+        return list(zip(numpy.flatnonzero(edges == 1).tolist(),
+            numpy.flatnonzero(edges == -1).tolist()))
+
+    def nbytes(self):
+        """Return the size of the x and y arrays in bytes."""
+        return self.x.nbytes + self.y.nbytes
+
+    def __len__(self):
+        """Return the number of points."""
+        return len(self.x)
+
+class Sampler(object):
+    """Sample an expression tree over viewports.
+
+    Methods:
+        __init__(self, tree, variable='x', budget=BUDGET)
+            Compile tree.
+
+        evaluate(self, x)
+            Return the values of the tree for an array of x values.
+
+        sample(self, viewport, samples=None)
+            Return the Curve of the tree in viewport.
+
+    Attributes:
+        tree         The sampled expression tree.
+        variable     The name of the variable of the x axis.
+        capacity     The most points a curve may have, from the budget.
+        evaluations  The number of x values the tree was evaluated for.
+
+    """
+    def __init__(self, tree, variable='x', budget=BUDGET):
+        """Compile tree, which may only use variable.
+
+        budget is the limit on the size of a curve in bytes.
+
+        """
+        for node in tree.postorder():
+            if isinstance(node, Variable) and node.label() != variable:
+                raise ValueError("Unknown variable `{0}'.".format(
+                    node.label()))
+        self.tree = tree
+        self.variable = variable
+        self.capacity = budget // POINT_BYTES
+        if self.capacity < 2:
+            raise ValueError("The budget must allow at least two points.")
+        self.evaluations = 0
+        self._function = tree.compile(array=True)
+
+    def evaluate(self, x):
+        """Return a new array of the values of the tree at x.
+
+        Values are NaN where the tree is undefined or infinite.
+
+        """
+        y = numpy.empty(numpy.shape(x))
+        with numpy.errstate(all='ignore'):
+            y[...] = self._function({self.variable: x})
+        y[~numpy.isfinite(y)] = numpy.nan
+        self.evaluations += y.size
+        return y
+
+    def sample(self, viewport, samples=None):
+        """Return the Curve of the tree over the x range of viewport.
+
+        samples is the number of evenly spaced x values, SAMPLES by default,
+        and is limited by the budget.  The y range of viewport is used to
+        find poles.
+
+        """
+        if samples is None:
+            samples = SAMPLES
+        samples = max(2, min(samples, self.capacity))
+        x = numpy.linspace(viewport.x_min, viewport.x_max, samples)
+        return self.split(x, self.evaluate(x), viewport)
+
+    def split(self, x, y, viewport):
+        """Return the Curve of x and y, broken at poles and jumps.
+
+        Consecutive points that are far apart vertically, and not both on
+        the same side outside viewport, are checked with break_at.
+
+        """
+        with numpy.errstate(invalid='ignore'):
+            above = y > viewport.y_max
+            below = y < viewport.y_min
+            steep = numpy.abs(numpy.diff(y)) > JUMP * viewport.height()
+        return self.break_at(x, y, numpy.flatnonzero(steep &
+            ~(above[:-1] & above[1:]) & ~(below[:-1] & below[1:])))
+
+    def break_at(self, x, y, candidates, bisections=BISECTIONS):
+        """Return the Curve of x and y, broken where it is discontinuous.
+
+        candidates are the indices i for which the function is checked for
+        a discontinuity between x[i] and x[i + 1], with find_breaks.  A NaN
+        point is inserted where the curve is broken.  If there is no room for
+        it in the budget, the point after it is made NaN instead.
+
+        """
+        if not candidates.size:
+            return Curve(x, y)
+        broken, where = self.find_breaks(x[candidates], x[candidates + 1],
+            y[candidates], y[candidates + 1], bisections)
+        jumps = candidates[broken]
+        room = max(0, self.capacity - len(x))
+        y[jumps[room:] + 1] = numpy.nan
+        jumps = jumps[:room]
+        return Curve(numpy.insert(x, jumps + 1, where[broken][:room]),
+            numpy.insert(y, jumps + 1, numpy.nan))
+
+    def find_breaks(self, x0, x1, y0, y1, bisections=BISECTIONS):
+        """Return where the tree is discontinuous between x0 and x1.
+
+        All arguments are arrays, and the intervals from x0 to x1 are
+        checked at once.  Each is halved bisections times, keeping the half
+        over which the value changes most.  Over a continuous function the
+        change shrinks with the interval, but not over a pole or a jump.
+
+        Returns a boolean array that is true for the intervals with a
+        discontinuity, and an array of the x values at which they are.
+
+        """
+        change = numpy.abs(y1 - y0)
+        broken = numpy.zeros(len(x0), dtype=bool)
+        with numpy.errstate(invalid='ignore'):
+            for i in range(bisections):
+                middle = (x0 + x1) / 2
+                values = self.evaluate(middle)
+                broken |= numpy.isnan(values)
+                left = numpy.abs(values - y0) >= numpy.abs(y1 - values)
+                x1 = numpy.where(left, middle, x1)
+                y1 = numpy.where(left, values, y1)
+                x0 = numpy.where(left, x0, middle)
+                y0 = numpy.where(left, y0, values)
+            broken |= numpy.abs(y1 - y0) > change / 2
+        return broken, (x0 + x1) / 2
+
+def sample(tree, viewport, samples=None, variable='x', budget=BUDGET):
+    """Return the Curve of tree in viewport.
+
+    See Sampler.sample.  Use a Sampler to sample the same tree repeatedly,
+    so that it is only compiled once.
+
+    """
+    return Sampler(tree, variable, budget).sample(viewport, samples)
@@ -0,0 +1,86 @@
+"""Tests the sampler module.
+
+Test classes:
+Test_Sampler
+
+"""
+
+import numpy
+import nose
+from nose import tools
+from expression.binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp
+from expression.binaryop import PowerOp
+from expression.constant import Constant
+from expression.variable import Variable
+from viewport import Viewport
+import sampler
+
+x = Variable('x')
+
+class Test_Sampler(object):
+    """Test sampling expression trees.
+
+    Ensure the following works as expected:
+        Points are sampled evenly over the x range
+        Undefined and infinite values break the curve
+        Poles break the curve, steep lines do not
+        Curves stay within their budget
+        Only the variable of the x axis may be used
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.viewport = Viewport(-10, 10, -10, 10)
+
+    def curve(self, tree, samples=None, budget=sampler.BUDGET):
+        """Return the curve of tree in the default viewport."""
+        return sampler.sample(tree, self.viewport, samples, budget=budget)
+
+    def test_values(self):
+        # Ensure the points are those of the function.
+        curve = self.curve(DifferenceOp(PowerOp(x, Constant(2)), Constant(1)), samples=5)
+        tools.eq_(curve.x.tolist(), [-10, -5, 0, 5, 10])
+        tools.eq_(curve.y.tolist(), [99, 24, -1, 24, 99])
+        tools.eq_(curve.segments(), [(0, 5)])
+
+    def test_constant(self):
+        # Ensure that constant functions give one value per sample.
+        curve = self.curve(Constant(3), samples=4)
+        tools.eq_(curve.y.tolist(), [3, 3, 3, 3])
+
+    def test_undefined(self):
+        # Ensure that undefined values are NaN and split the curve.
+        curve = self.curve(SumOp(PowerOp(x, Constant(0.5)),
+            QuotientOp(Constant(1), DifferenceOp(x, Constant(5)))), samples=21)
+        tools.ok_(numpy.isnan(curve.y[:10]).all())
+        tools.ok_(numpy.isnan(curve.y[15]))
+        tools.eq_(curve.segments(), [(10, 15), (16, 21)])
+
+    def test_pole(self):
+        # Ensure that no line is drawn across a pole.
+        curve = self.curve(QuotientOp(Constant(1), x), samples=100)
+        tools.eq_(len(curve), 101)
+        tools.eq_(curve.segments(), [(0, 50), (51, 101)])
+        tools.ok_(curve.x[49] < curve.x[50] < curve.x[51])
+
+    def test_steep(self):
+        # Ensure that continuous steep functions are not split.
+        curve = self.curve(ProductOp(Constant(1000000), x), samples=100)
+        tools.eq_(curve.segments(), [(0, 100)])
+
+    def test_budget(self):
+        # Ensure that curves never exceed their budget.
+        curve = self.curve(x, samples=10000, budget=1600)
+        tools.eq_(len(curve), 100)
+        tools.ok_(curve.nbytes() <= 1600)
+        curve = self.curve(QuotientOp(Constant(1), x), samples=100, budget=1600)
+        tools.ok_(curve.nbytes() <= 1600)
+        tools.eq_(curve.segments(), [(0, 50), (51, 100)])
+
+    @tools.raises(ValueError)
+    def test_unknown_variable(self):
+        # Ensure that other variables are rejected before sampling.
+        sampler.Sampler(SumOp(x, Variable('y')))
+
+if __name__ == '__main__':
+    nose.main()
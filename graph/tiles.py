@@ -0,0 +1,343 @@
+"""Cache sampled functions in tiles, for panning and zooming.
+
+Panning or zooming a plot changes the viewport slightly, but a Sampler
+evaluates the whole function again.  A TileCache instead splits the x axis
+into tiles, samples every tile separately and keeps the samples: panning
+then only evaluates the newly exposed tiles.
+
+Tiles come in zoom levels.  At level L, tiles are 2^L wide and tile i covers
+i * 2^L to (i + 1) * 2^L, with TILE_SAMPLES evenly spaced samples (and one
+more at its right end).  The level for a viewport is chosen so that about
+TILES tiles cover it.  As TILE_SAMPLES is a power of two, the x values of
+every level are exact floats, and every other sample of a tile is also a
+sample of its parent on the next level.  So when zooming in, half the
+samples of a new tile are taken from its parent if that is cached, and when
+zooming out, from its children.
+
+The cache keeps the most recently used tiles, up to a limit in bytes.  As
+poles are found with the y range of the viewport, curves are broken at them
+(with Sampler.split) after the tiles are put together, not in the tiles.
+
+An expensive function can take seconds to sample.  TileCache.progressive
+first generates a coarse preview from the tiles a few levels up, which
+takes a fraction of the evaluations, and then refines it a tile at a time,
+reusing the samples of the levels above.
+
+Overlaid functions are sampled together, with a group.SamplerGroup: the
+tiles of all of them that are missing are sampled with one call over their
+shared x values.  Each tree still has tiles of its own, so that changing
+one function keeps the tiles of the others.
+
+Classes:
+TileCache  Bounded, thread-safe LRU cache of sampled tiles
+
+"""
+
+import collections
+import math
+import threading
+import numpy
+from sampler import Curve
+from group import SamplerGroup
+
+# Number of intervals between the samples of a tile; a power of two.
+TILE_SAMPLES = 256
+
+# Least number of tiles a viewport is covered by.
+TILES = 4
+
+# Default limit on the size of the cached samples, in bytes.
+CAPACITY = 1 << 24
+
+# Levels above the level of a viewport that its preview is sampled at.
+COARSE = 3
+
+class TileCache(object):
+    """Bounded, thread-safe LRU cache of sampled tiles.
+
+    Tiles are keyed by the tree and variable of the Sampler they were
+    sampled with, as trees compare by structure, their level and their
+    index.  If the samples take more than capacity bytes, the least recently
+    used tiles are evicted.
+
+    Methods:
+        __init__(self, capacity=CAPACITY)
+            Create an empty cache.
+
+        sample(self, sampler, viewport)
+            Return the Curve of the tree of sampler in viewport.
+
+        sample_group(self, samplers, viewport)
+            Return the Curves of a group of trees in viewport.
+
+        progressive(self, sampler, viewport, coarse=COARSE)
+            Generate ever finer Curves of the tree in viewport.
+
+        progressive_group(self, samplers, viewport, coarse=COARSE)
+            Generate ever finer Curves of a group of trees in viewport.
+
+        tile(self, sampler, level, index)
+            Return the values of a tile.
+
+        tile_group(self, samplers, level, index)
+            Return the values of a tile for a group of trees.
+
+        level(self, viewport)
+            Return the zoom level for viewport.
+
+        hit_rate(self)
+            Return the fraction of tiles found in the cache.
+
+        clear(self)
+            Forget all tiles; the counters are kept.
+
+        nbytes(self)
+            Return the size of the cached samples in bytes.
+
+        __len__(self)
+            Return the number of cached tiles.
+
+    Attributes:
+        capacity   The maximum size of the cached samples in bytes.
+        hits       Number of tiles found in the cache.
+        misses     Number of tiles that had to be sampled.
+        reused     Number of those for which half the samples were taken
+                   from the next level up or down.
+        evictions  Number of tiles evicted to make space.
+
+    """
+    def __init__(self, capacity=CAPACITY):
+        """Create an empty cache of at most capacity bytes."""
+        if capacity < 1:
+            raise ValueError("Cache capacity must be positive.")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.reused = 0
+        self.evictions = 0
+        self._tiles = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def level(self, viewport):
+        """Return the level of the tiles viewport is drawn with."""
+        return int(math.floor(math.log(viewport.width() / TILES, 2)))
+
+    def sample(self, sampler, viewport):
+        """Return the Curve of the tree of sampler over viewport.
+
+        The curve has the samples of all tiles that viewport overlaps, up to
+        the first sample outside it on either side, and is broken at poles
+        like the curves of sampler.sample.
+
+        """
+        return self.sample_group(SamplerGroup([sampler]), viewport)[0]
+
+    def sample_group(self, samplers, viewport):
+        """Return a list of the Curves of a group.SamplerGroup over viewport.
+
+        The trees are sampled like the tree of sample, but the tiles that
+        are not cached are sampled for all the trees at once.
+
+        """
+        x, y = self._samples(samplers, self.level(viewport), viewport)
+        return [member.split(x, values, viewport) for member, values in
+            zip(samplers.samplers, y)]
+
+    def progressive(self, sampler, viewport, coarse=COARSE):
+        """Generate Curves of viewport, from a coarse preview to sample's.
+
+        Yields (curve, x_min, x_max) triples.  The first curve is sampled
+        coarse levels above the level of viewport, from a handful of tiles.
+        Every later one replaces the part of the curve over one tile with
+        the tile of the next level down, and x_min and x_max are the part
+        of viewport that changed; only that part is checked for poles.
+        Each level takes every other sample from the level above, so that
+        the evaluations of the preview are not wasted.  The last curve
+        equals that of sample.
+
+        If every tile of the level of viewport is cached, only the last
+        curve is generated.
+
+        """
+        for curves, x_min, x_max in self.progressive_group(
+                SamplerGroup([sampler]), viewport, coarse):
+            yield curves[0], x_min, x_max
+
+    def progressive_group(self, samplers, viewport, coarse=COARSE):
+        """Generate lists of Curves of a group, like progressive.
+
+        Yields (curves, x_min, x_max) triples, with a curve per tree of
+        the group.SamplerGroup samplers.
+
+        """
+        level = self.level(viewport)
+        if self._cached(samplers, level, viewport):
+            yield (self.sample_group(samplers, viewport), viewport.x_min,
+                viewport.x_max)
+            return
+        x, y = self._samples(samplers, level + coarse, viewport)
+        curves = [member.split(x, values, viewport) for member, values in
+            zip(samplers.samplers, y)]
+        yield curves, viewport.x_min, viewport.x_max
+        for finer in range(level + coarse - 1, level - 1, -1):
+            first, last = self._span(finer, viewport)
+            for index in range(first, last + 1):
+                # The tiles are copied, as split may change the values.
+                x, y = self._trim(self._x(finer, index, index + 1),
+                    numpy.array(self.tile_group(samplers, finer, index)),
+                    viewport)
+                curves = [self._splice(curve, member.split(x, values,
+                    viewport), viewport) for curve, member, values in
+                    zip(curves, samplers.samplers, y)]
+                yield (curves, max(x[0], viewport.x_min),
+                    min(x[-1], viewport.x_max))
+
+    def _splice(self, curve, piece, viewport):
+        """Return curve with its part over the x range of piece replaced.
+
+        Tiles start and end with samples of the level above, so the rest of
+        the curve is still broken where it should be.  The ends of curve
+        outside viewport are dropped if piece reaches past viewport.
+
+        """
+        start = 0
+        if piece.x[0] > viewport.x_min:
+            start = numpy.searchsorted(curve.x, piece.x[0], 'left')
+        stop = len(curve)
+        if piece.x[-1] < viewport.x_max:
+            stop = numpy.searchsorted(curve.x, piece.x[-1], 'right')
+        return Curve(
+            numpy.concatenate((curve.x[:start], piece.x, curve.x[stop:])),
+            numpy.concatenate((curve.y[:start], piece.y, curve.y[stop:])))
+
+    def _span(self, level, viewport):
+        """Return the indices of the first and last tile of level in view."""
+        width = 2.0 ** level
+        first = int(math.floor(viewport.x_min / width))
+        last = max(first, int(math.ceil(viewport.x_max / width)) - 1)
+        return first, last
+
+    def _x(self, level, first, stop):
+        """Return the x values of the tiles of level from first to stop."""
+        return ((numpy.arange((stop - first) * TILE_SAMPLES + 1) +
+            first * TILE_SAMPLES) * (2.0 ** level / TILE_SAMPLES))
+
+    def _trim(self, x, y, viewport):
+        """Return x and y up to the first sample outside viewport.
+
+        y may have a row of values per tree.
+
+        """
+        start = max(0, numpy.searchsorted(x, viewport.x_min, 'right') - 1)
+        stop = numpy.searchsorted(x, viewport.x_max, 'left') + 1
+        return x[start:stop], y[..., start:stop]
+
+    def _samples(self, samplers, level, viewport):
+        """Return a new x array and 2-D y array of the tiles in viewport."""
+        first, last = self._span(level, viewport)
+        tiles = [numpy.array(self.tile_group(samplers, level, index)) for
+            index in range(first, last + 1)]
+        # Neighbouring tiles share the sample at their common end.
+        y = numpy.concatenate([values[:, :-1] for values in tiles] +
+            [tiles[-1][:, -1:]], axis=1)
+        return self._trim(self._x(level, first, last + 1), y, viewport)
+
+    def _cached(self, samplers, level, viewport):
+        """Return whether all tiles of level in viewport are cached."""
+        first, last = self._span(level, viewport)
+        with self._lock:
+            return all((member.tree, member.variable, level, index) in
+                self._tiles for member in samplers.samplers
+                for index in range(first, last + 1))
+
+    def tile(self, sampler, level, index):
+        """Return the values of tile index of level, sampled with sampler.
+
+        The result has TILE_SAMPLES + 1 values and must not be modified.
+
+        """
+        return self.tile_group(SamplerGroup([sampler]), level, index)[0]
+
+    def tile_group(self, samplers, level, index):
+        """Return a list of the values of a tile for a group of samplers.
+
+        Tiles that are not cached are sampled for all their trees with one
+        call of samplers.evaluate, except for the samples that are taken
+        from the next level up or down.
+
+        """
+        keys = [(member.tree, member.variable, level, index) for member in
+            samplers.samplers]
+        tiles = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                values = self._tiles.pop(key, None)
+                if values is not None:
+                    self._tiles[key] = values
+                    self.hits += 1
+                    tiles[i] = values
+                    continue
+                self.misses += 1
+                tree, variable = key[:2]
+                parent = self._tiles.get((tree, variable, level + 1,
+                    index // 2))
+                children = [self._tiles.get((tree, variable, level - 1,
+                    2 * index + j)) for j in (0, 1)]
+                missing.append((i, parent, children))
+        if not missing:
+            return tiles
+        x = self._x(level, index, index + 1)
+        # Trees of which every sample, or only every other one, is needed.
+        whole = []
+        halves = []
+        for i, parent, children in missing:
+            values = tiles[i] = numpy.empty(TILE_SAMPLES + 1)
+            if parent is not None:
+                half = (index % 2) * (TILE_SAMPLES // 2)
+                values[::2] = parent[half:half + TILE_SAMPLES // 2 + 1]
+                halves.append(i)
+            elif children[0] is not None and children[1] is not None:
+                values[:TILE_SAMPLES // 2] = children[0][:-1:2]
+                values[TILE_SAMPLES // 2:] = children[1][::2]
+            else:
+                whole.append(i)
+        if halves:
+            for i, values in zip(halves, samplers.evaluate(x[1::2], halves)):
+                tiles[i][1::2] = values
+        if whole:
+            for i, values in zip(whole, samplers.evaluate(x, whole)):
+                tiles[i][:] = values
+        with self._lock:
+            self.reused += len(missing) - len(whole)
+            for i, parent, children in missing:
+                if keys[i] not in self._tiles:
+                    self._nbytes += tiles[i].nbytes
+                self._tiles[keys[i]] = tiles[i]
+            while self._nbytes > self.capacity and len(self._tiles) > 1:
+                evicted = self._tiles.popitem(last=False)[1]
+                self._nbytes -= evicted.nbytes
+                self.evictions += 1
+        return tiles
+
+    def hit_rate(self):
+        """Return hits / (hits + misses), or 0 if no tile was asked for."""
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def clear(self):
+        """Forget all tiles; the counters are kept."""
+        with self._lock:
+            self._tiles.clear()
+            self._nbytes = 0
+
+    def nbytes(self):
+        """Return the size of the cached samples in bytes."""
+        with self._lock:
+            return self._nbytes
+
+    def __len__(self):
+        """Return the number of cached tiles."""
+        with self._lock:
+            return len(self._tiles)
@@ -0,0 +1,177 @@
+"""Tests the tiles module.
+
+Test classes:
+Test_TileCache
+
+"""
+
+import numpy
+import nose
+from nose import tools
+from expression.binaryop import SumOp, DifferenceOp, ProductOp, QuotientOp
+from expression.constant import Constant
+from expression.variable import Variable
+from viewport import Viewport
+import sampler
+import group
+import tiles
+
+x = Variable('x')
+
+def parabola():
+    """Return a new tree for x * x / 100, which is never steep."""
+    return QuotientOp(ProductOp(x, x), Constant(100))
+
+class Test_TileCache(object):
+    """Test caching sampled tiles.
+
+    Ensure the following works as expected:
+        Curves have the values of the function and cover the viewport
+        Panning only samples the newly exposed tiles
+        Zooming reuses the samples of the next level
+        Equal trees share tiles
+        The least recently used tiles are evicted beyond the capacity
+        Poles still break the curve
+        Progressive curves start coarse and end as the full curve
+        Groups sample missing tiles together and keep tiles per tree
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.viewport = Viewport(-10, 10, -10, 10)
+
+    def test_values(self):
+        # Ensure that the curve has the right values and covers the view.
+        tree = SumOp(ProductOp(x, x), x)
+        curve = tiles.TileCache().sample(sampler.Sampler(tree), self.viewport)
+        numpy.testing.assert_array_equal(curve.y,
+            sampler.Sampler(tree).evaluate(curve.x))
+        tools.eq_((curve.x[0], curve.x[-1]), (-10, 10))
+        step = numpy.diff(curve.x)
+        tools.ok_((step == step[0]).all())
+        curve = tiles.TileCache().sample(sampler.Sampler(tree),
+            Viewport(-9.99, 9.99, -10, 10))
+        tools.eq_((curve.x[0], curve.x[-1]), (-10, 10))
+
+    def test_pan(self):
+        # Ensure that only the new tile is sampled after panning.
+        cache = tiles.TileCache()
+        function = sampler.Sampler(parabola())
+        cache.sample(function, self.viewport)
+        tools.eq_(cache.level(self.viewport), 2)
+        tools.eq_((cache.hits, cache.misses), (0, 6))
+        evaluations = function.evaluations
+        cache.sample(function, Viewport(-6, 14, -10, 10))
+        tools.eq_(function.evaluations - evaluations, tiles.TILE_SAMPLES + 1)
+        tools.eq_((cache.hits, cache.misses), (5, 7))
+        tools.eq_(cache.hit_rate(), 5.0 / 12)
+
+    def test_zoom(self):
+        # Ensure that half of every tile is reused from the next level.
+        cache = tiles.TileCache()
+        function = sampler.Sampler(parabola())
+        cache.sample(function, Viewport(-8, 8, -10, 10))
+        evaluations = function.evaluations
+        curve = cache.sample(function, Viewport(-4, 4, -10, 10))
+        tools.eq_(cache.level(Viewport(-4, 4, -10, 10)), 1)
+        tools.eq_(function.evaluations - evaluations,
+            4 * tiles.TILE_SAMPLES // 2)
+        tools.eq_(cache.reused, 4)
+        numpy.testing.assert_array_equal(curve.y,
+            sampler.Sampler(parabola()).evaluate(curve.x))
+        # Zooming back out takes every sample from the children.
+        cache.clear()
+        cache.sample(function, Viewport(-4, 4, -10, 10))
+        evaluations = function.evaluations
+        curve = cache.sample(function, Viewport(-8, 8, -10, 10))
+        tools.eq_(function.evaluations - evaluations,
+            2 * (tiles.TILE_SAMPLES + 1))
+        tools.eq_(cache.reused, 6)
+        numpy.testing.assert_array_equal(curve.y,
+            sampler.Sampler(parabola()).evaluate(curve.x))
+
+    def test_equal_trees(self):
+        # Ensure that tiles are found by structure, not identity.
+        cache = tiles.TileCache()
+        cache.sample(sampler.Sampler(parabola()), self.viewport)
+        function = sampler.Sampler(parabola())
+        cache.sample(function, self.viewport)
+        tools.eq_(function.evaluations, 0)
+        cache.sample(sampler.Sampler(DifferenceOp(x, Constant(1))),
+            self.viewport)
+        tools.eq_(len(cache), 12)
+
+    def test_eviction(self):
+        # Ensure that the cache stays within its capacity.
+        tile_bytes = (tiles.TILE_SAMPLES + 1) * 8
+        cache = tiles.TileCache(capacity=6 * tile_bytes)
+        function = sampler.Sampler(parabola())
+        cache.sample(function, self.viewport)
+        cache.sample(function, Viewport(-6, 14, -10, 10))
+        tools.eq_(len(cache), 6)
+        tools.eq_(cache.nbytes(), 6 * tile_bytes)
+        tools.eq_(cache.evictions, 1)
+        # The tile left of the view was the least recently used.
+        evaluations = function.evaluations
+        cache.sample(function, Viewport(-6, 14, -10, 10))
+        tools.eq_(function.evaluations - evaluations, 0)
+        cache.sample(function, self.viewport)
+        tools.ok_(function.evaluations > evaluations)
+        tools.assert_raises(ValueError, tiles.TileCache, 0)
+
+    def test_pole(self):
+        # Ensure that curves put together from tiles break at poles.
+        curve = tiles.TileCache().sample(sampler.Sampler(QuotientOp(
+            Constant(1), DifferenceOp(x, Constant(0.3)))), self.viewport)
+        tools.eq_(len(curve.segments()), 2)
+
+    def test_progressive(self):
+        # Ensure that the preview is cheap and the last curve is complete.
+        tree = QuotientOp(Constant(1), DifferenceOp(x, Constant(0.3)))
+        full = sampler.Sampler(tree)
+        expected = tiles.TileCache().sample(full, self.viewport)
+        cache = tiles.TileCache()
+        function = sampler.Sampler(tree)
+        batches = cache.progressive(function, self.viewport)
+        preview, x_min, x_max = next(batches)
+        tools.eq_((x_min, x_max), (-10, 10))
+        tools.ok_(function.evaluations < full.evaluations / 2)
+        tools.eq_(len(preview.segments()), 2)
+        batches = list(batches)
+        tools.eq_(len(batches), 2 + 4 + 6)
+        # The changed parts cover the view once per level.
+        tools.eq_(sum(x_max - x_min for curve, x_min, x_max in batches),
+            3 * 20)
+        curve = batches[-1][0]
+        numpy.testing.assert_array_equal(curve.x, expected.x)
+        numpy.testing.assert_array_equal(curve.y, expected.y)
+        tools.ok_(function.evaluations < 2 * full.evaluations)
+        # Once cached, the full curve is generated at once.
+        batches = list(cache.progressive(function, self.viewport))
+        tools.eq_(len(batches), 1)
+        numpy.testing.assert_array_equal(batches[0][0].x, expected.x)
+
+    def test_group(self):
+        # Ensure that a group samples its missing tiles in one call each.
+        cache = tiles.TileCache()
+        cache.sample(sampler.Sampler(parabola()), self.viewport)
+        trees = [parabola(), SumOp(x, Constant(1)), QuotientOp(Constant(1),
+            DifferenceOp(x, Constant(0.3)))]
+        functions = group.SamplerGroup.from_trees(trees)
+        curves = cache.sample_group(functions, self.viewport)
+        tools.eq_(functions.evaluations, 6 * (tiles.TILE_SAMPLES + 1))
+        tools.eq_(functions.samplers[0].evaluations, 0)
+        for tree, curve in zip(trees, curves):
+            expected = tiles.TileCache().sample(sampler.Sampler(tree),
+                self.viewport)
+            numpy.testing.assert_array_equal(curve.x, expected.x)
+            numpy.testing.assert_array_equal(curve.y, expected.y)
+        # Streaming a group ends with the same curves.
+        batches = list(tiles.TileCache().progressive_group(functions,
+            self.viewport))
+        for curve, expected in zip(batches[-1][0], curves):
+            numpy.testing.assert_array_equal(curve.x, expected.x)
+            numpy.testing.assert_array_equal(curve.y, expected.y)
+
+if __name__ == '__main__':
+    nose.main()
@@ -0,0 +1,79 @@
+"""Provide a class for the visible part of the plane.
+
+Classes:
+Viewport  The ranges of x and y values that are plotted
+
+"""
+
+class Viewport(object):
+    """The ranges of x and y values that are plotted.
+
+    Methods:
+        __init__(self, x_min, x_max, y_min, y_max)
+            Set the ranges.
+
+        from_options(cls, options)
+            Return the viewport set in a dictionary of options.
+
+        width(self)
+            Return the length of the x range.
+
+        height(self)
+            Return the length of the y range.
+
+    Attributes:
+        x_min  The smallest plotted x value.
+        x_max  The largest plotted x value.
+        y_min  The smallest plotted y value.
+        y_max  The largest plotted y value.
+
+    """
+    def __init__(self, x_min, x_max, y_min, y_max):
+        """Set the ranges, which must not be empty."""
+        self.x_min = float(x_min)
+        self.x_max = float(x_max)
+        self.y_min = float(y_min)
+        self.y_max = float(y_max)
+        if not self.x_min < self.x_max:
+            raise ValueError("x minimum must be less than x maximum.")
+        if not self.y_min < self.y_max:
+            raise ValueError("y minimum must be less than y maximum.")
+
+    @classmethod
+    def from_options(cls, options):
+        """Return the viewport set in options.
+
+        options maps the names x_min, x_max, y_min and y_max to Option
+        objects, as in interface.optionwidget.OptionWidget.  Their values may
+        be numbers or strings.
+
+        """
+        return cls(*[options[name].get() for name in
+            ('x_min', 'x_max', 'y_min', 'y_max')])
+
+    def width(self):
+        """Return x_max - x_min."""
+        return self.x_max - self.x_min
+
+    def height(self):
+        """Return y_max - y_min."""
+        return self.y_max - self.y_min
+
+    def __eq__(self, other):
+        """Return whether other is a viewport with the same ranges."""
+        return (isinstance(other, Viewport) and
+            (self.x_min, self.x_max, self.y_min, self.y_max) ==
+            (other.x_min, other.x_max, other.y_min, other.y_max))
+
+    def __ne__(self, other):
+        """Return whether other is not an equal viewport."""
+        return not self == other
+
+    def __hash__(self):
+        """Return a hash of the ranges."""
+        return hash((self.x_min, self.x_max, self.y_min, self.y_max))
+
+    def __repr__(self):
+        """Return a technical string representing this viewport."""
+        return "Viewport({0!r}, {1!r}, {2!r}, {3!r})".format(self.x_min,
+            self.x_max, self.y_min, self.y_max)
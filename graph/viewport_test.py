@@ -0,0 +1,36 @@
+"""Tests the Viewport class in viewport.py.
+
+Test classes:
+Test_Viewport
+
+"""
+
+import nose
+from nose import tools
+from interface.option import Option
+from viewport import Viewport
+
+class Test_Viewport(object):
+    """Test viewports.
+
+    Ensure the following works as expected:
+        Viewports are read from options
+        Empty ranges are rejected
+
+    """
+    def test_from_options(self):
+        # Ensure that unset and string options are read.
+        options = {'x_min': Option('', -10), 'x_max': Option('', 10),
+            'y_min': Option('', -10), 'y_max': Option('', 10)}
+        options['x_max'].set("2.5")
+        tools.eq_(Viewport.from_options(options), Viewport(-10, 2.5, -10, 10))
+        tools.eq_(Viewport(0, 1, 0, 2).width(), 1)
+        tools.eq_(Viewport(0, 1, 0, 2).height(), 2)
+
+    @tools.raises(ValueError)
+    def test_empty(self):
+        # Ensure that an empty x range is rejected.
+        Viewport(1, 1, 0, 1)
+
+if __name__ == '__main__':
+    nose.main()
@@ -5,5 +5,5 @@ Classes:
 
 """
 
-__all__ = ['window']
+__all__ = ['window', 'optionwidget', 'worker']
 
@@ -8,13 +8,28 @@ from PyQt4 import QtGui
 from PyQt4 import QtCore
 from option import Option
 
+# Milliseconds without typing before edits are applied to the options.
+DEBOUNCE = 300
+
+# Options edited in a box of several lines, one value per line.
+MULTILINE = ('function',)
+
 class OptionWidget(QtGui.QWidget):
     """Display option dialogs and provide an easy way to get options.
 
+    Edits are applied to the options once no key has been pressed for
+    DEBOUNCE milliseconds, so that typing a formula does not start a plot
+    for every keystroke.  The changed signal is emitted after they are.
+
+    The options in MULTILINE, such as the functions to plot, have a box with
+    one value per line instead of a line edit.
+
     """
+    changed = QtCore.pyqtSignal()
+
     def __init__(self, parent=None):
         """Draw the options interface, and set some defaults.
-        
+
         """
         QtGui.QWidget.__init__(self, parent)
         self.grid_l = QtGui.QGridLayout(self)
@@ -26,17 +41,51 @@ class OptionWidget(QtGui.QWidget):
             ('y_min', Option('y minimum: ', -10)),
             ('y_max', Option('y maximum: ', 10))
         ]
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEBOUNCE)
+        self.timer.timeout.connect(self.apply)
+        self.line_edits = {}
         i = 0 # counter for rows
         for k, v in self.options:
             option_label_w = QtGui.QLabel(self)
             option_label_w.setText(v.label())
-            option_line_w = QtGui.QLineEdit(self)
-            option_line_w.setText(str(v.get()))
+            if k in MULTILINE:
+                option_line_w = QtGui.QPlainTextEdit(self)
+                option_line_w.setPlainText(str(v.get()))
+                option_line_w.textChanged.connect(self._edited)
+            else:
+                option_line_w = QtGui.QLineEdit(self)
+                option_line_w.setText(str(v.get()))
+                option_line_w.textEdited.connect(self._edited)
             self.grid_l.addWidget(option_label_w, i, 0)
             self.grid_l.addWidget(option_line_w, i, 1)
+            self.line_edits[k] = option_line_w
             i += 1
         self.options = dict(self.options)
         self.setLayout(self.grid_l)
         self.show()
 
+    def _edited(self, text=None):
+        """Restart the timer, so that edits are applied once typing pauses."""
+        self.timer.start()
+
+    def apply(self):
+        """Set the options to the text of their line edits now.
 
+        Emits changed and returns True if any option changed.
+
+        """
+        self.timer.stop()
+        changed = False
+        for k, line_w in self.line_edits.items():
+            if isinstance(line_w, QtGui.QPlainTextEdit):
+                text = str(line_w.toPlainText())
+            else:
+                text = str(line_w.text())
+            if text != str(self.options[k].get()):
+                self.options[k].set(text)
+                changed = True
+        if changed:
+            self.changed.emit()
+        return changed
@@ -3,20 +3,72 @@
 """
 
 from PyQt4 import QtGui
+from graph import canvas
+from graph.viewport import Viewport
 
 class Window(QtGui.QWidget):
     """Represent the main window of TurtleGraph.
 
+    Functions are plotted by a worker.PlotWorker in the background, when the
+    Plot button is pressed or the options are edited, so the window stays
+    responsive while they are evaluated.  Every line of the function option
+    is a function, and all of them are plotted together.  Coarse curves are
+    shown at once, and refined as the worker streams finer ones.
+
     """
     def __init__(self, parent=None):
         """Create the window."""
         import optionwidget
+        import worker
         QtGui.QWidget.__init__(self, parent)
         self.vertical_l = QtGui.QVBoxLayout(self)
         self.options_w = optionwidget.OptionWidget(self)
         self.button_w = QtGui.QPushButton('Plot', self)
+        self.canvas_w = canvas.Canvas(self)
+        self.status_w = QtGui.QLabel(self)
         self.vertical_l.addWidget(self.options_w)
         self.vertical_l.addWidget(self.button_w)
+        self.vertical_l.addWidget(self.canvas_w)
+        self.vertical_l.addWidget(self.status_w)
         self.setLayout(self.vertical_l)
+        self.worker = worker.PlotWorker(self)
+        self.button_w.clicked.connect(self._plot_clicked)
+        self.options_w.changed.connect(self.plot)
+        self.worker.plotted.connect(self._plotted)
+        self.worker.finished.connect(self._finished)
+        self.worker.failed.connect(self._failed)
         self.show()
 
+    def plot(self):
+        """Start plotting the functions with the current options."""
+        options = self.options_w.options
+        functions = [line.strip() for line in
+            str(options['function'].get()).splitlines() if line.strip()]
+        if not functions:
+            self.worker.cancel()
+            self.canvas_w.clear()
+            return
+        try:
+            viewport = Viewport.from_options(options)
+        except ValueError as exc:
+            self._failed(str(exc))
+            return
+        self.status_w.setText("Plotting...")
+        self.worker.request(functions, viewport, self.canvas_w.width())
+
+    def _plot_clicked(self):
+        """Apply pending edits, and plot even if there were none."""
+        if not self.options_w.apply():
+            self.plot()
+
+    def _plotted(self, curves, viewport, x_min, x_max):
+        """Show curves from the worker, repainting where they changed."""
+        self.canvas_w.set_curves(curves, viewport, (x_min, x_max))
+
+    def _finished(self):
+        """Clear the status once the full curves are shown."""
+        self.status_w.setText("")
+
+    def _failed(self, message):
+        """Show an error from the worker or the options."""
+        self.status_w.setText(message)
@@ -0,0 +1,124 @@
+"""Provide a class that plots functions in a background thread.
+
+Parsing and sampling a heavy function can take long enough to freeze the
+window if it is done in the thread of the user interface.  A PlotWorker
+runs graph.pipeline.Pipeline in a QThreadPool instead, and emits a signal
+for every list of curves it streams: coarse previews first, then ever
+finer curves.  Only the newest request counts: older requests are
+abandoned at the next step of the pipeline, and their results are never
+emitted.
+
+"""
+
+from PyQt4 import QtCore
+from graph import pipeline
+
+class _Signals(QtCore.QObject):
+    """Signals emitted by jobs in the pool, received in the GUI thread.
+
+    A QRunnable is not a QObject, so it cannot emit signals itself.
+
+    """
+    batch = QtCore.pyqtSignal(int, object, object, float, float)
+    finished = QtCore.pyqtSignal(int)
+    failed = QtCore.pyqtSignal(int, str)
+
+class _Job(QtCore.QRunnable):
+    """Run one request through the pipeline in a thread of the pool."""
+    def __init__(self, plot_pipeline, signals, generation, functions,
+            viewport, width):
+        """Store the request."""
+        QtCore.QRunnable.__init__(self)
+        self.pipeline = plot_pipeline
+        self.signals = signals
+        self.generation = generation
+        self.functions = functions
+        self.viewport = viewport
+        self.width = width
+
+    def run(self):
+        """Run the request, and emit its curves or error unless stale."""
+        try:
+            for curves, x_min, x_max in self.pipeline.stream(
+                    self.generation, self.functions, self.viewport,
+                    self.width):
+                self.signals.batch.emit(self.generation, curves,
+                    self.viewport, x_min, x_max)
+        except pipeline.Cancelled:
+            return
+        except Exception as exc:
+            self.signals.failed.emit(self.generation, str(exc))
+            return
+        self.signals.finished.emit(self.generation)
+
+class PlotWorker(QtCore.QObject):
+    """Plot functions in a background thread.
+
+    Requests run one at a time, so a stale request only delays the newest
+    one until its current step is done.
+
+    Methods:
+        __init__(self, parent=None, plot_pipeline=None)
+            Create the worker and its thread pool.
+
+        request(self, functions, viewport, width)
+            Start plotting functions, making older requests stale.
+
+        cancel(self)
+            Make all requests stale.
+
+    Signals:
+        plotted(curves, viewport, x_min, x_max)
+            Curves of the newest request, which changed from the previous
+            ones between x_min and x_max.
+        finished()       The last curves of the newest request were plotted.
+        failed(message)  The error of the newest request.
+
+    Attributes:
+        pipeline  The graph.pipeline.Pipeline requests are run with.
+        pool      The QThreadPool requests are run in.
+
+    """
+    plotted = QtCore.pyqtSignal(object, object, float, float)
+    finished = QtCore.pyqtSignal()
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None, plot_pipeline=None):
+        """Create the worker, with a new pipeline by default."""
+        QtCore.QObject.__init__(self, parent)
+        if plot_pipeline is None:
+            plot_pipeline = pipeline.Pipeline()
+        self.pipeline = plot_pipeline
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        # The signals object lives in this thread, so the jobs' signals are
+        # delivered here through the event loop.
+        self._signals = _Signals(self)
+        self._signals.batch.connect(self._batch)
+        self._signals.finished.connect(self._finished)
+        self._signals.failed.connect(self._failed)
+
+    def request(self, functions, viewport, width):
+        """Start plotting function strings in viewport, width pixels wide."""
+        generation = self.pipeline.request()
+        self.pool.start(_Job(self.pipeline, self._signals, generation,
+            functions, viewport, width))
+
+    def cancel(self):
+        """Make all requests stale, so that nothing more is emitted."""
+        self.pipeline.request()
+
+    def _batch(self, generation, curves, viewport, x_min, x_max):
+        """Emit plotted, unless the request became stale meanwhile."""
+        if not self.pipeline.cancelled(generation):
+            self.plotted.emit(curves, viewport, x_min, x_max)
+
+    def _finished(self, generation):
+        """Emit finished, unless the request became stale meanwhile."""
+        if not self.pipeline.cancelled(generation):
+            self.finished.emit()
+
+    def _failed(self, generation, message):
+        """Emit failed, unless the request became stale meanwhile."""
+        if not self.pipeline.cancelled(generation):
+            self.failed.emit(message)
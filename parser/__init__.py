@@ -4,7 +4,14 @@ Functions:
 str_to_expr_tree   Return an expression tree from a human-readable string.
 repr_to_expr_tree  Return an expression tree from a technical string.
 
+Modules:
+human              Parser for human-readable strings
+pratt              Hand-written parser for human-readable strings
+cache              Cache the results of parsing human-readable strings
+batch              Parse large numbers of human-readable strings
+tables             Build and check the prebuilt lexer and parser tables
+
 """
 
-__all__ = ['parse']
+__all__ = ['parse', 'human', 'pratt', 'cache', 'batch', 'tables']
 
@@ -0,0 +1,115 @@
+"""Parse large numbers of human-readable strings.
+
+Formula catalogues can have hundreds of thousands of lines.  parse_many
+streams the results of parsing them one by one: a parse error is reported
+for its string and parsing goes on with the next one.  Strings are read
+from the iterable only as results are needed, so memory use does not grow
+with the number of strings.
+
+The strings can also be parsed by a pool of worker processes.  Each worker
+builds its own parser once, and the results are still produced in the
+order of the strings.  Workers send trees back as flat.FlatExpression
+encodings, which are rebuilt without recursion however deep the trees are.
+A result that cannot be sent back is reported as the error of its string.
+
+Functions:
+parse_many  Yield the parse result of every string of an iterable.
+
+"""
+
+import collections
+import itertools
+import multiprocessing
+import pickle
+from expression import flat
+
+# The parser of a worker process, built by _start_worker.
+_worker_parser = None
+
+def parse_many(strings, parser=None, processes=0, chunksize=256):
+    """Yield (index, tree, error) for every string in strings, in order.
+
+    index is the position of the string in strings.  If the string parses,
+    tree is its expression tree and error is None; otherwise tree is None and
+    error is the exception raised by the parser.
+
+    All strings are parsed with the same parser.  If none is given, a default
+    human.Parser is used.
+
+    If processes is positive, the strings are parsed by that many worker
+    processes, in chunks of chunksize strings.  The workers use their own
+    parsers, with the backend and simplify settings of parser; any lexer or
+    intern table of parser is not used.  At most two chunks per worker are
+    read ahead of the results that have been yielded.
+
+    """
+    import human
+    if parser is None:
+        parser = human.Parser()
+    if processes <= 0:
+        for index, instring in enumerate(strings):
+            try:
+                tree = parser.parse(instring)
+            except Exception as exc:
+                yield index, None, exc
+            else:
+                yield index, tree, None
+        return
+    options = {'backend': getattr(parser, 'backend', 'ply'),
+        'simplify': getattr(parser, 'simplify', True)}
+    pool = multiprocessing.Pool(processes, _start_worker, (options,))
+    try:
+        chunks = _chunks(strings, chunksize)
+        pending = collections.deque()
+        for chunk in itertools.islice(chunks, 2 * processes):
+            pending.append(pool.apply_async(_parse_chunk, chunk))
+        while pending:
+            results = pending.popleft().get()
+            for chunk in itertools.islice(chunks, 1):
+                pending.append(pool.apply_async(_parse_chunk, chunk))
+            for index, encoded, error in results:
+                if encoded is not None:
+                    yield index, encoded.to_tree(), None
+                else:
+                    yield index, None, error
+    finally:
+        pool.terminate()
+        pool.join()
+
+def _chunks(strings, chunksize):
+    """Yield (index of the first string, list of strings) chunks."""
+    iterator = iter(strings)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+def _start_worker(options):
+    """Build the parser of a worker process."""
+    global _worker_parser
+    import human
+    _worker_parser = human.Parser(**options)
+
+def _parse_chunk(start, strings):
+    """Return the results of parsing a chunk in a worker process.
+
+    Trees are returned as FlatExpressions.  Errors that cannot be pickled
+    are replaced by a RuntimeError with their message.
+
+    """
+    results = []
+    for index, instring in enumerate(strings, start):
+        try:
+            results.append((index,
+                flat.FlatExpression(_worker_parser.parse(instring)), None))
+        except Exception as exc:
+            try:
+                pickle.dumps(exc, pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                exc = RuntimeError("{0}: {1}".format(type(exc).__name__,
+                    exc))
+            results.append((index, None, exc))
+    return results
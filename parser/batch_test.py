@@ -0,0 +1,89 @@
+"""Tests the parse_many function in batch.py.
+
+Test classes:
+Test_ParseMany
+
+"""
+
+import itertools
+import nose
+from nose import tools
+import batch
+import human
+
+class Test_ParseMany(object):
+    """Test parsing many strings.
+
+    Ensure the following works as expected:
+        Every string gets a result, errors included
+        Strings are only read as results are needed
+        Worker processes give the same results in the same order
+        Worker processes send back very deep trees
+
+    """
+    strings = ["x^2 + 1", "5(6+x)", "", "-x/2", "0,5", "(x+1)*(x+1)"] * 20
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = human.Parser()
+
+    def expected(self, index, instring):
+        """Return the result parse_many should give for a string."""
+        try:
+            return (index, repr(self.parser.parse(instring)), None)
+        except Exception as exc:
+            return (index, None, (type(exc), str(exc)))
+
+    def compare(self, results):
+        """Check results against parsing every string on its own."""
+        results = list(results)
+        tools.eq_(len(results), len(self.strings))
+        for (index, tree, error), instring in zip(results, self.strings):
+            if error is not None:
+                error = (type(error), str(error))
+                tree = None
+            else:
+                tree = repr(tree)
+            tools.eq_((index, tree, error), self.expected(index, instring))
+
+    def test_serial(self):
+        # Ensure that errors are reported without stopping the batch.
+        self.compare(batch.parse_many(self.strings, self.parser))
+
+    def test_lazy(self):
+        # Ensure that an endless iterable can be parsed.
+        strings = ("x*{0}".format(i) for i in itertools.count())
+        results = list(itertools.islice(batch.parse_many(strings), 5))
+        tools.eq_([index for index, tree, error in results], range(5))
+        tools.eq_(str(results[4][1]), "(x*4.0)")
+
+    def test_processes(self):
+        # Ensure that worker processes keep the order of the strings.
+        self.compare(batch.parse_many(self.strings, self.parser,
+            processes=2, chunksize=7))
+
+    def test_processes_deep(self):
+        # Ensure that trees deeper than the recursion limit come back.
+        deep = "+".join(["x"] * 1500)
+        strings = [deep, "x^2", deep + "+"]
+        results = list(batch.parse_many(strings, self.parser, processes=2))
+        tools.eq_([index for index, tree, error in results], range(3))
+        tools.eq_(results[0][1], self.parser.parse(deep))
+        depth = 0
+        node = results[0][1]
+        while node.operands():
+            node = node.operands()[0]
+            depth += 1
+        tools.ok_(depth >= 1499)
+        tools.eq_(str(results[1][1]), str(self.parser.parse("x^2")))
+        tools.ok_(results[2][1] is None and results[2][2] is not None)
+
+    def test_processes_backend(self):
+        # Ensure that the workers use the backend of the given parser.
+        parser = human.Parser(backend='pratt', simplify=False)
+        results = list(batch.parse_many(["1+2", "x y"], parser, processes=1))
+        tools.eq_(str(results[0][1]), "(1.0 + 2.0)")
+        tools.eq_(str(results[1][2]), "Syntax error at `y'.")
+
+if __name__ == '__main__':
+    nose.main()
@@ -0,0 +1,111 @@
+"""Cache the results of parsing human-readable strings.
+
+The same function strings are parsed over and over: every plot, every change
+of the plot range and every batch job parses the function again.  A
+ParseCache sits in front of a parser and remembers the results of the most
+recently parsed strings, including parse errors, so that a bad string is not
+parsed again on every retry either.
+
+Classes:
+ParseCache  Bounded, thread-safe LRU cache of parse results
+
+"""
+
+import collections
+import re
+import threading
+
+# Whitespace is ignored by the tokenizer, but does separate tokens, so runs
+# of it are only shortened to a single space.
+_whitespace = re.compile(r"[ \t\n]+")
+
+def normalise(instring):
+    """Return instring with runs of whitespace collapsed to one space."""
+    return _whitespace.sub(" ", instring).strip(" ")
+
+class ParseCache(object):
+    """Bounded, thread-safe LRU cache of parse results.
+
+    Strings are looked up after normalising their whitespace.  If the cache
+    is full, the least recently used result is evicted.  Trees are returned
+    as they are cached, so they are shared between callers and must not be
+    modified.  A cached parse error is raised again as the same exception.
+
+    Methods:
+        __init__(self, parser=None, capacity=256)
+            Create an empty cache.
+
+        parse(self, instring)
+            Return the expression tree for instring.
+
+        clear(self)
+            Forget all cached results; the counters are kept.
+
+        __len__(self)
+            Return the number of cached results.
+
+    Attributes:
+        parser     The parser used for strings that are not cached.
+        capacity   The maximum number of cached results.
+        hits       Number of parses answered from the cache.
+        misses     Number of parses that had to use the parser.
+        evictions  Number of results evicted to make space.
+
+    """
+    def __init__(self, parser=None, capacity=256):
+        """Create an empty cache in front of parser.
+
+        If no parser is given, a default human.Parser is used.
+
+        """
+        if parser is None:
+            import human
+            parser = human.Parser()
+        if capacity < 1:
+            raise ValueError("Cache capacity must be positive.")
+        self.parser = parser
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._results = collections.OrderedDict()
+        self._lock = threading.Lock()
+        # The parser keeps state while parsing, so only one thread may use it.
+        self._parser_lock = threading.Lock()
+
+    def parse(self, instring):
+        """Return the expression tree for instring, or raise its error."""
+        key = normalise(instring)
+        with self._lock:
+            result = self._results.pop(key, None)
+            if result is not None:
+                self._results[key] = result
+                self.hits += 1
+            else:
+                self.misses += 1
+        if result is None:
+            with self._parser_lock:
+                try:
+                    result = (self.parser.parse(key), None)
+                except Exception as exc:
+                    result = (None, exc)
+            with self._lock:
+                self._results.pop(key, None)
+                self._results[key] = result
+                while len(self._results) > self.capacity:
+                    self._results.popitem(last=False)
+                    self.evictions += 1
+        tree, error = result
+        if error is not None:
+            raise error
+        return tree
+
+    def clear(self):
+        """Forget all cached results; the counters are kept."""
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self):
+        """Return the number of cached results."""
+        with self._lock:
+            return len(self._results)
@@ -0,0 +1,80 @@
+"""Tests the ParseCache class in cache.py.
+
+Test classes:
+Test_ParseCache
+
+"""
+
+import threading
+import nose
+from nose import tools
+import cache
+import human
+
+class Test_ParseCache(object):
+    """Test caching parse results.
+
+    Ensure the following works as expected:
+        Equal strings, up to whitespace, are parsed once
+        Parse errors are cached and raised again
+        The least recently used result is evicted
+        Concurrent use gives consistent counters
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = human.Parser()
+
+    def test_hits(self):
+        # Ensure that whitespace differences still hit the cache.
+        parse_cache = cache.ParseCache(self.parser)
+        tree = parse_cache.parse("x^2 + 1")
+        tools.ok_(parse_cache.parse("x^2  +\t1 ") is tree)
+        tools.ok_(parse_cache.parse("x^2+1") is not tree)
+        tools.eq_((parse_cache.hits, parse_cache.misses), (1, 2))
+
+    def test_errors(self):
+        # Ensure that errors are raised again without parsing again.
+        parse_cache = cache.ParseCache(self.parser)
+        for i in range(3):
+            try:
+                parse_cache.parse("5(6+x)")
+            except Exception as exc:
+                tools.eq_(str(exc), "Implicit multiplication is currently "
+                    "not supported.  Offending piece: ``5.0((6.0 + x))''.")
+            else:
+                assert False, "No exception raised."
+        tools.eq_((parse_cache.hits, parse_cache.misses), (2, 1))
+        # Only whitespace the tokenizer ignores is normalised away.
+        tools.assert_raises(Exception, self.parser.parse, "x\r")
+        tools.assert_raises(Exception, parse_cache.parse, "x\r")
+
+    def test_eviction(self):
+        # Ensure that the least recently used result is evicted.
+        parse_cache = cache.ParseCache(self.parser, capacity=2)
+        parse_cache.parse("1")
+        parse_cache.parse("2")
+        parse_cache.parse("1")
+        parse_cache.parse("3")
+        tools.eq_((len(parse_cache), parse_cache.evictions), (2, 1))
+        parse_cache.parse("1")
+        tools.eq_(parse_cache.misses, 3)
+        parse_cache.parse("2")
+        tools.eq_(parse_cache.misses, 4)
+
+    def test_threads(self):
+        # Ensure that the cache can be used from several threads.
+        parse_cache = cache.ParseCache(self.parser, capacity=8)
+        def work():
+            for i in range(200):
+                parse_cache.parse("x*{0}".format(i % 10))
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        tools.eq_(parse_cache.hits + parse_cache.misses, 800)
+        tools.ok_(len(parse_cache) <= 8)
+
+if __name__ == '__main__':
+    nose.main()
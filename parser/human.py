@@ -77,14 +77,31 @@ class Tokenizer(object):
     def __init__(self, **kwargs):
         """Build the lexer.
 
-        This constructs this into an instance of the lexer.
+        This constructs this into an instance of the lexer.  Without
+        arguments, the prebuilt table in lextab is loaded, which is much
+        faster than building the lexer and never writes any files.
 
         """
         self.tokens = tokens
-        self.lexer = lex.lex(module=self, **kwargs)
+        self.lexer = None
+        if not kwargs:
+            self.lexer = self._load()
+        if self.lexer is None:
+            self.lexer = lex.lex(module=self, **kwargs)
         self.token = self.lexer.token
         self.input = self.lexer.input
 
+    def _load(self):
+        """Return a lexer from the prebuilt table, or None if unusable."""
+        try:
+            import lextab
+            lexer = lex.Lexer()
+            lexer.readtab(lextab, dict((name, getattr(self, name))
+                for name in dir(self) if name.startswith("t_")))
+        except (ImportError, KeyError):
+            return None
+        return lexer
+
     ######################################################
     ## Functions past this point are only needed by lex ##
     ######################################################
@@ -145,6 +162,8 @@ class Tokenizer(object):
 
 from ply import yacc
 import expression.binaryop
+import expression.optimizer
+import expression.interning
 
 class Parser(object):
     """Parser of mathematical expressions.
@@ -153,29 +172,97 @@ class Parser(object):
     by yacc.yacc().  __init__ accepts the same parameters as yacc.yacc(), plus a
     lexer parameter.  See the docstring of __init__ for details.
 
+    With backend='pratt', the hand-written scanner and parser of the pratt
+    module are used instead of PLY.  They accept the same language and raise
+    the same errors, but parse about three times as fast.
+
     Methods starting with p_ are internal, do not use them separately.
+
+    Unless disabled, every parsed tree is simplified with
+    expression.optimizer.simplify.  The number of nodes this removed is kept
+    in the attributes last_removed (for the last parse) and removed (for all
+    parses so far).
+
+    Repeated subtrees of a parsed tree are always merged into shared nodes
+    with an expression.interning.InternTable.  By default every parse uses
+    a new table; pass one to share subtrees between all parsed trees.
     
     """
-    def __init__(self, lexer=None, **kwargs):
+    def __init__(self, lexer=None, simplify=True, intern_table=None,
+            backend='ply', **kwargs):
         """Initialise the parser.
 
         lexer - lexer to use
+        simplify - whether to simplify parsed trees
+        intern_table - InternTable to use for all parsed trees
+        backend - 'ply' or 'pratt'
         kwargs - args to pass to yacc.yacc
 
-        If no lexer is passed, a default one is used.
+        If no lexer is passed, a default one is used.  Without kwargs, the
+        prebuilt table in parsetab is loaded, which is much faster than
+        building the parser and never writes any files.  The pratt backend
+        accepts no kwargs.
 
         """
+        if backend not in ('ply', 'pratt'):
+            raise ValueError("Unknown parser backend `{0}'.".format(backend))
+        if backend == 'pratt' and kwargs:
+            raise TypeError("The pratt backend takes no yacc arguments.")
+        self.backend = backend
+        self.simplify = simplify
+        self.intern_table = intern_table
+        self.last_removed = 0
+        self.removed = 0
+        if backend == 'pratt':
+            import pratt
+            self.lexer = pratt.Tokenizer() if lexer is None else lexer
+            self.parser = pratt.Parser()
+            return
         if lexer is None:
             self.lexer = Tokenizer()
         else:
             self.lexer = lexer
-        self.parser = yacc.yacc(**kwargs)
+        self.parser = None
+        if not kwargs:
+            self.parser = self._load()
+            # Without the prebuilt table, still do not write any files.
+            kwargs = {'debug': False, 'write_tables': False}
+        if self.parser is None:
+            self.parser = yacc.yacc(**kwargs)
+
+    def _load(self):
+        """Return a parser from the prebuilt table, or None if unusable.
+
+        The grammar rules are not checked against the table; the tables
+        module does that, and should be used to rebuild the table whenever
+        the rules change.
+
+        """
+        try:
+            import parsetab
+            table = yacc.LRTable()
+            table.read_table(parsetab)
+            table.bind_callables(globals())
+        except (ImportError, yacc.VersionError):
+            return None
+        return yacc.LRParser(table, p_error)
         
     def parse(self, instring, lexer=None):
+        """Return the expression tree for instring.
+
+        The tree is simplified if enabled, and its repeated subtrees shared.
+
+        """
         if lexer is None:
-            return self.parser.parse(instring, lexer=self.lexer)
+            tree = self.parser.parse(instring, lexer=self.lexer)
         else:
-            return self.parser.parse(instring, lexer=lexer)
+            tree = self.parser.parse(instring, lexer=lexer)
+        if self.simplify:
+            tree, self.last_removed = expression.optimizer.simplify(tree)
+            self.removed += self.last_removed
+        if self.intern_table is None:
+            return expression.interning.InternTable().intern(tree)
+        return self.intern_table.intern(tree)
 
 
 precedence = (
@@ -255,6 +342,8 @@ def p_value(p):
 
 #  It'd be nice if this error message was more informative.
 def p_error(p):
+    if p is None:
+        raise Exception("Syntax error at end of input.")
     raise Exception("Syntax error at `{0}'.".format(p.value))
 
 ###############################################################################
@@ -190,12 +190,13 @@ class Test_HumanParse(object):
         Reporting common syntax errors in detail
         Reporting of miscellaneous syntax errors
 
-    These tests assume that the lexer is functioning correctly.
+    These tests assume that the lexer is functioning correctly.  Trees are
+    checked as built, so simplification is disabled; see Test_HumanSimplify.
 
     """
     @classmethod
     def setUpClass(cls):
-        cls.parser = human.Parser()
+        cls.parser = human.Parser(simplify=False)
 
     def test_operator_precedence(self):
         # Ensure that correct operator precedence is used.
@@ -344,4 +345,34 @@ class Test_HumanParse(object):
         for i, o in values:
             yield run_logic, i, o
 
+class Test_HumanSimplify(object):
+    """Test that the parser simplifies trees by default.
+
+    Ensure the following works as expected:
+        Parsed trees are simplified
+        The number of removed nodes is reported
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = human.Parser()
+
+    def test_simplified(self):
+        # Ensure that the parser output is simplified.
+
+        # Tuple of tuples.  Each tuple has an input string, the expected
+        # output as from str(), and the number of nodes removed.
+        values = (
+            ("x", "x", 0),
+            ("2*3^2", "18.0", 4),
+            ("-3", "-3.0", 2),
+            ("x*1+0", "x", 4),
+            ("x^2+-x", "((x^2.0) - x)", 2),
+        )
+        def run_logic(inval, outval, removed):
+            """Parse inval, and check the output and the removed count."""
+            tools.eq_(str(self.parser.parse(inval)), outval)
+            tools.eq_(self.parser.last_removed, removed)
 
+        for i, o, r in values:
+            yield run_logic, i, o, r
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('BADCOMMA', 'BADPOWOP', 'CLPAR', 'CONSTANT', 'DIFFOP', 'NOTIMPLEMENTED', 'OPPAR', 'POWOP', 'PRODOP', 'QUOTOP', 'SUMOP', 'UMINUS', 'UPLUS', 'VARIABLE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NOTIMPLEMENTED>[<>=]=?)|(?P<t_BADCOMMA>[0-9]+,[0-9]+)|(?P<t_BADPOWOP>\\*\\*)|(?P<t_VARIABLE>[a-zA-Z]+)|(?P<t_CONSTANT>[0-9]+(\\.[0-9]+)?)|(?P<t_SUMOP>\\+)|(?P<t_OPPAR>\\()|(?P<t_CLPAR>\\))|(?P<t_POWOP>\\^)|(?P<t_PRODOP>\\*)|(?P<t_QUOTOP>/)|(?P<t_DIFFOP>-)', [None, ('t_NOTIMPLEMENTED', 'NOTIMPLEMENTED'), ('t_BADCOMMA', 'BADCOMMA'), ('t_BADPOWOP', 'BADPOWOP'), ('t_VARIABLE', 'VARIABLE'), ('t_CONSTANT', 'CONSTANT'), None, (None, 'SUMOP'), (None, 'OPPAR'), (None, 'CLPAR'), (None, 'POWOP'), (None, 'PRODOP'), (None, 'QUOTOP'), (None, 'DIFFOP')])]}
+_lexstateignore = {'INITIAL': ' \t\n'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,46 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftSUMOPDIFFOPleftPRODOPQUOTOPrightUPLUSUMINUSrightPOWOPleftCLPARBADCOMMA BADPOWOP CLPAR CONSTANT DIFFOP NOTIMPLEMENTED OPPAR POWOP PRODOP QUOTOP SUMOP UMINUS UPLUS VARIABLEexpr : expr : VARIABLE OPPAR expr CLPARexpr : CONSTANT OPPAR expr CLPARexpr : OPPAR expr CLPAR OPPAR expr CLPARexpr : PRODOP PRODOPexpr : expr SUMOP exprexpr : expr DIFFOP exprexpr : expr PRODOP exprexpr : expr QUOTOP exprexpr : expr POWOP exprexpr :  OPPAR expr CLPARexpr : SUMOP expr %prec UPLUSexpr : DIFFOP expr %prec UMINUSexpr : value\n    value :  VARIABLE\n          |  CONSTANT\n    '
+    
+_lr_action_items = {'PRODOP':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,],[1,9,-16,11,1,-14,1,-15,1,-5,1,1,1,1,1,1,11,-12,1,-13,11,-8,-9,-10,11,11,-11,11,-3,1,-2,11,-4,]),'CLPAR':([2,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,],[-16,-1,-14,-1,-15,-1,-5,-1,-1,-1,-1,-1,-1,26,-12,-1,-13,28,-8,-9,-10,-6,-7,-11,30,-3,-1,-2,32,-4,]),'QUOTOP':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,],[-1,-16,12,-1,-14,-1,-15,-1,-5,-1,-1,-1,-1,-1,-1,12,-12,-1,-13,12,-8,-9,-10,12,12,-11,12,-3,-1,-2,12,-4,]),'POWOP':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,],[-1,-16,13,-1,-14,-1,-15,-1,-5,-1,-1,-1,-1,-1,-1,13,13,-1,13,13,13,13,13,13,13,-11,13,-3,-1,-2,13,-4,]),'SUMOP':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,],[6,-16,14,6,-14,6,-15,6,-5,6,6,6,6,6,6,14,-12,6,-13,14,-8,-9,-10,-6,-7,-11,14,-3,6,-2,14,-4,]),'OPPAR':([0,2,4,6,7,8,10,11,12,13,14,15,18,26,29,],[4,10,4,4,18,4,4,4,4,4,4,4,4,29,4,]),'VARIABLE':([0,4,6,8,10,11,12,13,14,15,18,29,],[7,7,7,7,7,7,7,7,7,7,7,7,]),'CONSTANT':([0,4,6,8,10,11,12,13,14,15,18,29,],[2,2,2,2,2,2,2,2,2,2,2,2,]),'DIFFOP':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,],[8,-16,15,8,-14,8,-15,8,-5,8,8,8,8,8,8,15,-12,8,-13,15,-8,-9,-10,-6,-7,-11,15,-3,8,-2,15,-4,]),'$end':([0,2,3,5,6,7,8,9,11,12,13,14,15,17,19,21,22,23,24,25,26,28,30,32,],[-1,-16,0,-14,-1,-15,-1,-5,-1,-1,-1,-1,-1,-12,-13,-8,-9,-10,-6,-7,-11,-3,-2,-4,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'expr':([0,4,6,8,10,11,12,13,14,15,18,29,],[3,16,17,19,20,21,22,23,24,25,27,31,]),'value':([0,4,6,8,10,11,12,13,14,15,18,29,],[5,5,5,5,5,5,5,5,5,5,5,5,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> expr","S'",1,None,None,None),
+  ('expr -> <empty>','expr',0,'p_error_empty','human.py',259),
+  ('expr -> VARIABLE OPPAR expr CLPAR','expr',4,'p_error_function','human.py',263),
+  ('expr -> CONSTANT OPPAR expr CLPAR','expr',4,'p_error_implicit_multiplication','human.py',268),
+  ('expr -> OPPAR expr CLPAR OPPAR expr CLPAR','expr',6,'p_error_implicit_bracket_multiplication','human.py',273),
+  ('expr -> PRODOP PRODOP','expr',2,'p_error_wrong_power_op','human.py',278),
+  ('expr -> expr SUMOP expr','expr',3,'p_expr_sum','human.py',282),
+  ('expr -> expr DIFFOP expr','expr',3,'p_expr_difference','human.py',286),
+  ('expr -> expr PRODOP expr','expr',3,'p_expr_product','human.py',290),
+  ('expr -> expr QUOTOP expr','expr',3,'p_expr_quotient','human.py',294),
+  ('expr -> expr POWOP expr','expr',3,'p_expr_power','human.py',298),
+  ('expr -> OPPAR expr CLPAR','expr',3,'p_expr_parens','human.py',302),
+  ('expr -> SUMOP expr','expr',2,'p_expr_uplus','human.py',306),
+  ('expr -> DIFFOP expr','expr',2,'p_expr_uminus','human.py',310),
+  ('expr -> value','expr',1,'p_expr_value','human.py',315),
+  ('value -> VARIABLE','value',1,'p_value','human.py',320),
+  ('value -> CONSTANT','value',1,'p_value','human.py',321),
+]
@@ -0,0 +1,317 @@
+"""Hand-written parser for human-readable strings.
+
+The human module parses with PLY, which passes every token through generic LR
+machinery as a LexToken object.  This module accepts exactly the same
+language without PLY: a single regular expression scans the input into
+lists of token types and values, and a precedence-climbing parser builds the
+tree from them.  Results and error messages are those of the human module,
+including which error is reported first for input with several of them.
+
+Use it through human.Parser(backend='pratt').
+
+The parser recurses once per level of nesting (parentheses, unary operators
+and chains of `^'), so input nested a few hundred levels deep raises a
+RuntimeError.  The PLY backend has no such limit.
+
+Classes:
+Token      A token, printed like a PLY LexToken
+Tokenizer  Scanner producing the tokens of human.Tokenizer
+Parser     Precedence-climbing parser of those tokens
+
+"""
+
+import re
+import expression.binaryop
+import expression.constant
+import expression.variable
+
+# Types of the entries marking the end of the input and a scanning error.
+END = "END"
+ERROR = "ERROR"
+
+_TOKEN = re.compile(r"""[ \t\n]*(?:
+    (?P<NOTIMPLEMENTED>[<>=]=?)|
+    (?P<BADCOMMA>[0-9]+,[0-9]+)|
+    (?P<BADPOWOP>\*\*)|
+    (?P<VARIABLE>[a-zA-Z]+)|
+    (?P<CONSTANT>[0-9]+(?:\.[0-9]+)?)|
+    (?P<OPPAR>\()|
+    (?P<CLPAR>\))|
+    (?P<SUMOP>\+)|
+    (?P<DIFFOP>-)|
+    (?P<PRODOP>\*)|
+    (?P<QUOTOP>/)|
+    (?P<POWOP>\^)|
+    (?P<END>\Z)|
+    (?P<UNKNOWN>[^ \t\n]+))""", re.VERBOSE)
+
+_OPERATORS = frozenset(['OPPAR', 'CLPAR', 'SUMOP', 'DIFFOP', 'PRODOP',
+    'QUOTOP', 'POWOP'])
+
+# The exceptions raised for the tokens that are errors, given their text.
+_errors = {
+    'NOTIMPLEMENTED': lambda text: NotImplementedError(
+        "Sorry, operator `{0}' is not yet implemented.".format(text)),
+    'BADCOMMA': lambda text: Exception(
+        "Unknown symbol `,'.  The decimal point is a `.'."),
+    'BADPOWOP': lambda text: Exception("Power operator is `^', not `**'."),
+    'UNKNOWN': lambda text: Exception("Unknown symbol `{0}'.".format(text)),
+}
+
+class Token(object):
+    """A token, printed like a PLY LexToken.
+
+    Attributes:
+        type    the token name, as in human.tokens
+        value   the matched text, or the Constant or Variable for operands
+        lineno  always 1, as newlines are ignored
+        lexpos  the index of the token in the input
+
+    """
+    __slots__ = ('type', 'value', 'lineno', 'lexpos')
+
+    def __init__(self, type, value, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = 1
+        self.lexpos = lexpos
+
+    def __str__(self):
+        return "LexToken({0},{1!r},{2:d},{3:d})".format(self.type,
+            self.value, self.lineno, self.lexpos)
+
+    __repr__ = __str__
+
+class Tokenizer(object):
+    """Scanner producing the tokens of human.Tokenizer.
+
+    The whole input is scanned by input().  A scanning error is not raised
+    there, but by token() once the tokens before it have been returned, so
+    that it is reported at the same point as by human.Tokenizer.
+
+    Methods:
+        input(self, instring)
+            Scan instring.
+
+        token(self)
+            Return the next Token, or None at the end of the input.
+
+    Attributes:
+        types   list of the token types, ending with END or ERROR
+        values  list of the token values; the exception for ERROR
+
+    """
+    def __init__(self):
+        """Create a tokenizer with empty input."""
+        self.input("")
+
+    def input(self, instring):
+        """Scan instring into types, values and positions."""
+        self.types = types = []
+        self.values = values = []
+        self._positions = positions = []
+        self._index = 0
+        for found in _TOKEN.finditer(instring):
+            kind = found.lastgroup
+            text = found.group(kind)
+            positions.append(found.start(kind))
+            if kind in _OPERATORS:
+                value = text
+            elif kind == 'VARIABLE':
+                value = expression.variable.Variable(text)
+            elif kind == 'CONSTANT':
+                value = expression.constant.Constant(text)
+            elif kind == END:
+                value = None
+                break
+            else:
+                kind, value = ERROR, _errors[kind](text)
+                break
+            types.append(kind)
+            values.append(value)
+        types.append(kind)
+        values.append(value)
+
+    def token(self):
+        """Return the next Token, or None if there are no more."""
+        index = self._index
+        kind = self.types[index]
+        if kind == ERROR:
+            raise self.values[index]
+        if kind == END:
+            return None
+        self._index = index + 1
+        return Token(kind, self.values[index], self._positions[index])
+
+# Binary operators: precedence, the lowest precedence of an operator that may
+# be part of the right operand, and the class of the node.  Left associative
+# operators only allow operators of higher precedence in their right operand.
+_BINARY = {
+    'SUMOP': (1, 2, expression.binaryop.SumOp),
+    'DIFFOP': (1, 2, expression.binaryop.DifferenceOp),
+    'PRODOP': (2, 3, expression.binaryop.ProductOp),
+    'QUOTOP': (2, 3, expression.binaryop.QuotientOp),
+    'POWOP': (4, 4, expression.binaryop.PowerOp),
+}
+
+# The operand of unary + and - (precedence 3) only contains powers.
+_UNARY_OPERAND = 4
+
+# Tokens that may follow the offending part of an unsupported construct for
+# its error to be reported; before any other token, that token is a syntax
+# error instead.
+_FOLLOW = frozenset(list(_BINARY) + ['CLPAR', END])
+
+# The tokens that report an empty expression where an operand is expected,
+# at the start of the input, after an opening parenthesis and after an
+# operator.  Other tokens that cannot start an operand are syntax errors.
+# These are the lookahead sets of the empty rule in the LALR tables.
+_START, _OPENED, _OPERATOR = range(3)
+_EMPTY = {
+    _START: frozenset(['QUOTOP', 'POWOP', END]),
+    _OPENED: frozenset(['QUOTOP', 'POWOP', 'CLPAR']),
+    _OPERATOR: frozenset(['QUOTOP', 'POWOP', 'CLPAR', END]),
+}
+
+class Parser(object):
+    """Precedence-climbing parser of mathematical expressions.
+
+    Behaves like the object returned by yacc.yacc() in the human module.
+
+    Methods:
+        parse(self, instring, lexer=None)
+            Return the expression tree for instring.
+
+    """
+    def parse(self, instring, lexer=None):
+        """Return the expression tree for instring.
+
+        The lexer defaults to a new Tokenizer.  Any other lexer with the
+        interface of a PLY lexer may be passed instead.
+
+        """
+        if lexer is None:
+            lexer = Tokenizer()
+        if isinstance(lexer, Tokenizer):
+            lexer.input(instring)
+            self._types = lexer.types
+            self._values = lexer.values
+        else:
+            self._read(instring, lexer)
+        self._index = 0
+        try:
+            tree = self._expression(0, _START)
+            if self._types[self._index] != END:
+                self._error()
+        finally:
+            self._types = self._values = None
+        return tree
+
+    def _read(self, instring, lexer):
+        """Read all tokens from a PLY-style lexer into types and values."""
+        self._types = []
+        self._values = []
+        lexer.input(instring)
+        while True:
+            try:
+                token = lexer.token()
+            except Exception as exc:
+                self._types.append(ERROR)
+                self._values.append(exc)
+                return
+            if token is None:
+                self._types.append(END)
+                self._values.append(None)
+                return
+            self._types.append(token.type)
+            self._values.append(token.value)
+
+    def _expression(self, lowest, context):
+        """Parse an expression of operators of at least lowest precedence.
+
+        context tells where the expression starts, which decides the error
+        raised when it is missing.
+
+        """
+        tree = self._operand(context)
+        types = self._types
+        while True:
+            operator = _BINARY.get(types[self._index])
+            if operator is None or operator[0] < lowest:
+                return tree
+            self._index += 1
+            tree = operator[2](tree, self._expression(operator[1], _OPERATOR))
+
+    def _operand(self, context):
+        """Parse an operand: a value, a parenthesised or unary expression."""
+        kind = self._types[self._index]
+        value = self._values[self._index]
+        if kind == 'VARIABLE' or kind == 'CONSTANT':
+            self._index += 1
+            if self._types[self._index] == 'OPPAR':
+                self._index += 1
+                inner = self._parenthesised()
+                if kind == 'VARIABLE':
+                    self._unsupported("Functions are currently not "
+                        "supported.  Offending piece: ``{0}({1})''.".format(
+                        value, inner))
+                self._unsupported("Implicit multiplication is currently not "
+                    "supported.  Offending piece: ``{0}({1})''.".format(
+                    value, inner))
+            return value
+        if kind == 'OPPAR':
+            self._index += 1
+            inner = self._parenthesised()
+            if self._types[self._index] == 'OPPAR':
+                self._index += 1
+                second = self._parenthesised()
+                self._unsupported("Implicit multiplication is currently not "
+                    "supported.  Offending piece: ``({0})({1})''.".format(
+                    inner, second))
+            return inner
+        if kind == 'SUMOP':
+            self._index += 1
+            return self._expression(_UNARY_OPERAND, _OPERATOR)
+        if kind == 'DIFFOP':
+            self._index += 1
+            return expression.binaryop.DifferenceOp(
+                expression.constant.Constant(0),
+                self._expression(_UNARY_OPERAND, _OPERATOR))
+        if kind == 'PRODOP':
+            self._index += 1
+            if self._types[self._index] != 'PRODOP':
+                self._error()
+            self._index += 1
+            self._unsupported("Power operator is `^', not `**'.")
+        if kind in _EMPTY[context]:
+            raise Exception("Nothing to parse.")
+        self._error()
+
+    def _parenthesised(self):
+        """Parse an expression and the closing parenthesis after it."""
+        inner = self._expression(0, _OPENED)
+        if self._types[self._index] != 'CLPAR':
+            self._error()
+        self._index += 1
+        return inner
+
+    def _unsupported(self, message):
+        """Raise message for an unsupported construct that just ended.
+
+        If the next token cannot follow an expression, it is reported
+        instead.
+
+        """
+        if self._types[self._index] in _FOLLOW:
+            raise Exception(message)
+        self._error()
+
+    def _error(self):
+        """Raise the error for the unexpected next token."""
+        kind = self._types[self._index]
+        if kind == ERROR:
+            raise self._values[self._index]
+        if kind == END:
+            raise Exception("Syntax error at end of input.")
+        raise Exception("Syntax error at `{0}'.".format(
+            self._values[self._index]))
@@ -0,0 +1,93 @@
+"""Tests the hand-written parser backend.
+
+The whole human module test suite is run again against the pratt backend,
+and its results are compared with those of PLY for many generated strings.
+
+Test classes:
+Test_PrattLex
+Test_PrattParse
+Test_PrattSimplify
+Test_PrattAgainstPLY
+
+"""
+
+import itertools
+import random
+import nose
+from nose import tools
+import human
+import human_test
+import pratt
+
+class Test_PrattLex(human_test.Test_HumanLex):
+    """Run the lexer tests of the human module against pratt.Tokenizer."""
+    @classmethod
+    def setUpClass(cls):
+        cls.lexer = pratt.Tokenizer()
+
+class Test_PrattParse(human_test.Test_HumanParse):
+    """Run the parser tests of the human module against the pratt backend."""
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = human.Parser(simplify=False, backend='pratt')
+
+class Test_PrattSimplify(human_test.Test_HumanSimplify):
+    """Run the simplification tests against the pratt backend."""
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = human.Parser(backend='pratt')
+
+class Test_PrattAgainstPLY(object):
+    """Compare the pratt backend with the PLY backend.
+
+    Ensure the following works as expected:
+        All short strings give the same tree or the same error
+        Longer random strings give the same tree or the same error
+        Unknown backends are rejected
+
+    """
+    # Pieces the strings are made of, including ones that fail to scan.
+    pieces = ("x", "5", "+", "-", "*", "/", "^", "(", ")", " ", "$", "=",
+        "0,1")
+
+    @classmethod
+    def setUpClass(cls):
+        cls.ply = human.Parser(simplify=False)
+        cls.pratt = human.Parser(simplify=False, backend='pratt')
+
+    def result(self, parser, instring):
+        """Return the tree for instring, or the type and text of its error."""
+        try:
+            return repr(parser.parse(instring))
+        except Exception as exc:
+            return (type(exc), str(exc))
+
+    def test_short(self):
+        # Ensure that all strings of up to three pieces agree.
+        for length in range(4):
+            for pieces in itertools.product(self.pieces, repeat=length):
+                instring = "".join(pieces)
+                tools.eq_(self.result(self.pratt, instring),
+                    self.result(self.ply, instring), repr(instring))
+
+    def test_random(self):
+        # Ensure that longer strings agree.
+        rng = random.Random(0)
+        for i in range(2000):
+            instring = "".join(rng.choice(self.pieces)
+                for j in range(rng.randint(4, 20)))
+            tools.eq_(self.result(self.pratt, instring),
+                self.result(self.ply, instring), repr(instring))
+
+    def test_other_lexer(self):
+        # Ensure that a PLY lexer can be used with the pratt parser.
+        parser = human.Parser(simplify=False, lexer=human.Tokenizer(),
+            backend='pratt')
+        for instring in ("x * (2 + y)", "5 + $", "sin(x)", "x y", "(x"):
+            tools.eq_(self.result(parser, instring),
+                self.result(self.ply, instring), repr(instring))
+
+    @tools.raises(ValueError)
+    def test_unknown_backend(self):
+        # Ensure that misspelt backends are not silently replaced by PLY.
+        human.Parser(backend='yacc')
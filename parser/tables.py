@@ -0,0 +1,57 @@
+"""Build and check the prebuilt lexer and parser tables.
+
+The human module loads its PLY tables from the lextab and parsetab modules
+in this package, without inspecting the grammar and without writing any
+files.  Those tables must be rebuilt whenever the tokens or grammar rules in
+human.py change.  Run this module to do so:
+
+    python -m parser.tables
+
+Functions:
+build    Regenerate lextab.py and parsetab.py.
+current  Return whether the packaged tables match human.py.
+
+"""
+
+import os
+from ply import yacc
+
+# The directory the tables are written to and loaded from.
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+def build(outputdir=DIRECTORY):
+    """Regenerate lextab.py and parsetab.py in outputdir.
+
+    Existing tables are removed first, so that PLY cannot reuse them.
+
+    """
+    from parser import human
+    for name in ('lextab', 'parsetab'):
+        for extension in ('.py', '.pyc'):
+            path = os.path.join(outputdir, name + extension)
+            if os.path.exists(path):
+                os.remove(path)
+    human.Tokenizer(optimize=1, lextab='lextab', outputdir=outputdir)
+    yacc.yacc(module=human, tabmodule='parsetab', outputdir=outputdir,
+        debug=False, write_tables=True)
+
+def current():
+    """Return whether the packaged tables were built from human.py.
+
+    The grammar signature stored in parsetab is compared with that of the
+    rules in human.py, and the token patterns in lextab with those of the
+    Tokenizer.
+
+    """
+    from parser import human, lextab, parsetab
+    grammar = yacc.ParserReflect(vars(human))
+    grammar.get_all()
+    if parsetab._lr_signature != grammar.signature():
+        return False
+    built = human.Tokenizer(optimize=0).lexer
+    patterns = [pattern for pattern, names in lextab._lexstatere['INITIAL']]
+    return (patterns == built.lexstateretext['INITIAL'] and
+        lextab._lextokens == built.lextokens)
+
+if __name__ == '__main__':
+    build()
@@ -0,0 +1,36 @@
+"""Tests the prebuilt lexer and parser tables.
+
+Test classes:
+Test_Tables
+
+"""
+
+import os
+import nose
+from nose import tools
+import human
+import tables
+
+class Test_Tables(object):
+    """Test the prebuilt tables.
+
+    Ensure the following works as expected:
+        The packaged tables match the grammar in human.py
+        Building the default lexer and parser writes no files
+
+    """
+    def test_current(self):
+        # Ensure that the tables have been rebuilt after grammar changes.
+        tools.ok_(tables.current(), "Tables are out of date; run "
+            "`python -m parser.tables' to rebuild them.")
+
+    def test_no_writes(self):
+        # Ensure that the tables are loaded, not generated.
+        directories = (os.getcwd(), tables.DIRECTORY)
+        before = [sorted(os.listdir(d)) for d in directories]
+        parser = human.Parser()
+        tools.eq_(str(parser.parse("2*x")), "(2.0*x)")
+        tools.eq_([sorted(os.listdir(d)) for d in directories], before)
+
+if __name__ == '__main__':
+    nose.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/python
+"""Render the plots of a manifest to PNG or SVG files, without a display.
+
+turtlegraph.py opens a window; this renders plots in batch instead, with no
+Qt at all.  The manifest is a JSON list of jobs, such as:
+
+    [{"functions": ["x^2", "1/x"], "output": "plots/first.png"},
+     {"functions": ["x^3 - x"], "output": "plots/second.svg",
+      "x_min": -2, "x_max": 2, "y_min": -1, "y_max": 1,
+      "width": 320, "height": 240}]
+
+The ranges default to those of the window, and the size to the --width
+and --height options.  The format of each plot is chosen by the extension
+of its output file.  Output paths are relative to the manifest, and
+missing directories are created.
+
+Jobs are spread over a pool of processes.  Every process keeps one
+graph.pipeline.Pipeline, and so one parser cache, compiled sampler and tile
+cache, for all the jobs it renders.  Jobs that fail are reported, and the
+exit status is 1 if any did.
+
+Usage: render.py [--workers N] [--width W] [--height H] manifest
+
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from graph import export
+from graph import pipeline
+from graph.viewport import Viewport
+
+# Defaults of the jobs, as in interface.optionwidget.
+DEFAULTS = {'x_min': -10, 'x_max': 10, 'y_min': -10, 'y_max': 10}
+
+# Default size of the plots in pixels.
+WIDTH = 640
+HEIGHT = 480
+
+# Jobs handed to a process at a time.
+CHUNK = 16
+
+# The pipeline of this process, created by _start.
+_pipeline = None
+
+def read_manifest(filename, width=WIDTH, height=HEIGHT):
+    """Return the jobs of the manifest in filename, with defaults filled in.
+
+    Every job is a dictionary with the keys functions (a list of strings),
+    output, width, height and those of DEFAULTS.  ValueError is raised if
+    the manifest is not a list of jobs with functions and an output.
+
+    """
+    with open(filename) as stream:
+        jobs = json.load(stream)
+    if not isinstance(jobs, list):
+        raise ValueError("The manifest must be a list of jobs.")
+    directory = os.path.dirname(os.path.abspath(filename))
+    result = []
+    for number, job in enumerate(jobs):
+        if not isinstance(job, dict) or 'functions' not in job or \
+                'output' not in job:
+            raise ValueError("Job {0} needs functions and an output.".format(
+                number))
+        full = dict(DEFAULTS, width=width, height=height)
+        full.update(job)
+        if not isinstance(full['functions'], list):
+            full['functions'] = [full['functions']]
+        full['output'] = os.path.join(directory, full['output'])
+        result.append(full)
+    return result
+
+def _start():
+    """Create the pipeline of a new process."""
+    global _pipeline
+    _pipeline = pipeline.Pipeline()
+
+def render(job):
+    """Render one job of a manifest with the pipeline of this process.
+
+    Returns the output file and None, or the error message if it failed.
+
+    """
+    try:
+        viewport = Viewport(*[job[name] for name in
+            ('x_min', 'x_max', 'y_min', 'y_max')])
+        curves = _pipeline.run(_pipeline.request(),
+            [str(function) for function in job['functions']], viewport,
+            job['width'])
+        directory = os.path.dirname(job['output'])
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Another process may have created it meanwhile.
+                if not os.path.isdir(directory):
+                    raise
+        export.save(curves, viewport, job['output'], job['width'],
+            job['height'])
+    except Exception as exc:
+        return job['output'], str(exc) or exc.__class__.__name__
+    return job['output'], None
+
+def main(arguments):
+    """Render the manifest named in arguments, and return the exit status."""
+    options = argparse.ArgumentParser(description="Render the plots of a "
+        "manifest to PNG or SVG files.")
+    options.add_argument('manifest', help="JSON list of jobs")
+    options.add_argument('--workers', type=int,
+        default=multiprocessing.cpu_count(),
+        help="number of processes (default: one per CPU)")
+    options.add_argument('--width', type=int, default=WIDTH,
+        help="default width of the plots in pixels")
+    options.add_argument('--height', type=int, default=HEIGHT,
+        help="default height of the plots in pixels")
+    options = options.parse_args(arguments)
+    try:
+        jobs = read_manifest(options.manifest, options.width,
+            options.height)
+    except (IOError, ValueError) as exc:
+        sys.stderr.write("{0}\n".format(exc))
+        return 2
+    start = time.time()
+    failed = 0
+    if options.workers > 1:
+        pool = multiprocessing.Pool(options.workers, _start)
+        results = pool.imap_unordered(render, jobs, CHUNK)
+    else:
+        _start()
+        results = (render(job) for job in jobs)
+    for output, error in results:
+        if error is not None:
+            failed += 1
+            sys.stderr.write("{0}: {1}\n".format(output, error))
+    if options.workers > 1:
+        pool.close()
+        pool.join()
+    elapsed = time.time() - start
+    sys.stderr.write("Rendered {0} of {1} plots in {2:.1f} s.\n".format(
+        len(jobs) - failed, len(jobs), elapsed))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
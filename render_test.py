@@ -0,0 +1,89 @@
+"""Tests the render module.
+
+Test classes:
+Test_Render
+
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from StringIO import StringIO
+import nose
+from nose import tools
+import render
+
+class Test_Render(object):
+    """Test rendering the plots of a manifest.
+
+    Ensure the following works as expected:
+        Jobs are filled in with the defaults
+        A single function need not be given as a list
+        Output paths are relative to the manifest
+        Missing output directories are created
+        Failed jobs give the exit status 1, bad manifests 2
+
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stderr = sys.stderr
+        sys.stderr = StringIO()
+
+    def tearDown(self):
+        sys.stderr = self.stderr
+        shutil.rmtree(self.directory)
+
+    def manifest(self, jobs):
+        """Write jobs to a manifest in the directory and return its name."""
+        filename = os.path.join(self.directory, 'manifest.json')
+        with open(filename, 'w') as stream:
+            json.dump(jobs, stream)
+        return filename
+
+    def test_defaults(self):
+        # Ensure that the ranges and the size are filled in.
+        jobs = render.read_manifest(self.manifest([{'functions': ['x^2'],
+            'output': 'a.png', 'x_min': -2}]), 320, 240)
+        tools.eq_(jobs, [{'functions': ['x^2'],
+            'output': os.path.join(self.directory, 'a.png'), 'x_min': -2,
+            'x_max': 10, 'y_min': -10, 'y_max': 10, 'width': 320,
+            'height': 240}])
+
+    def test_scalar(self):
+        # Ensure that a single function is made into a list.
+        jobs = render.read_manifest(self.manifest([{'functions': 'x^2',
+            'output': 'a.svg'}]))
+        tools.eq_(jobs[0]['functions'], ['x^2'])
+        tools.eq_((jobs[0]['width'], jobs[0]['height']),
+            (render.WIDTH, render.HEIGHT))
+
+    def test_relative(self):
+        # Ensure that outputs are written next to the manifest, in
+        # directories that are created if missing.
+        filename = self.manifest([{'functions': ['x^2', '1/x'],
+            'output': 'plots/first.png'}, {'functions': 'x^3 - x',
+            'output': 'plots/more/second.svg', 'width': 32, 'height': 24}])
+        tools.eq_(render.main(['--workers', '1', filename]), 0)
+        for name in ('plots/first.png', 'plots/more/second.svg'):
+            tools.ok_(os.path.getsize(os.path.join(self.directory, name)))
+
+    def test_failed(self):
+        # Ensure that a failed job is reported, and the others rendered.
+        filename = self.manifest([{'functions': '5(6+x)',
+            'output': 'bad.svg'}, {'functions': 'x', 'output': 'good.svg'}])
+        tools.eq_(render.main(['--workers', '1', filename]), 1)
+        tools.ok_(os.path.exists(os.path.join(self.directory, 'good.svg')))
+        tools.ok_("bad.svg: Implicit multiplication" in
+            sys.stderr.getvalue())
+
+    def test_bad_manifest(self):
+        # Ensure that manifests that are not lists of jobs are rejected.
+        for jobs in ({'functions': 'x'}, [{'functions': 'x'}]):
+            tools.eq_(render.main([self.manifest(jobs)]), 2)
+        tools.eq_(render.main([os.path.join(self.directory, 'none.json')]),
+            2)
+
+if __name__ == '__main__':
+    nose.main()